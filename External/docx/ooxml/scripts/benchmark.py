@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for the OOXML validation and packaging scripts.
+
+Usage:
+    python benchmark.py xsd <unpacked_dir> --original <office_file>
+    python benchmark.py format [--xml <part.xml>] [--size-mb 20]
+    python benchmark.py redlining [--changes 10000] [--per-paragraph 10]
+"""
+
+import argparse
+import copy
+import multiprocessing
+import resource
+import statistics
+import sys
+import tempfile
+import time
+import xml.etree.ElementTree as ET
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from formatting import FORMATTERS, get_formatter
+from validation import DOCXSchemaValidator, PPTXSchemaValidator, RedliningValidator
+from validation import base as validation_base
+
+VALIDATORS = {
+    ".docx": DOCXSchemaValidator,
+    ".pptx": PPTXSchemaValidator,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark OOXML scripts")
+    subparsers = parser.add_subparsers(dest="benchmark", required=True)
+
+    xsd_parser = subparsers.add_parser(
+        "xsd", help="Per-file XSD validation time with and without the schema cache"
+    )
+    xsd_parser.add_argument("unpacked_dir", help="Unpacked Office document directory")
+    xsd_parser.add_argument(
+        "--original", required=True, help="Original file (.docx/.pptx)"
+    )
+
+    format_parser = subparsers.add_parser(
+        "format", help="Throughput and peak memory of each XML formatting backend"
+    )
+    format_parser.add_argument(
+        "--xml", help="XML part to format (default: a synthetic document.xml)"
+    )
+    format_parser.add_argument(
+        "--size-mb",
+        type=float,
+        default=20,
+        help="Size of the synthetic document.xml in MB (default: 20)",
+    )
+
+    redlining_parser = subparsers.add_parser(
+        "redlining", help="Tracked change removal and redlining validation time"
+    )
+    redlining_parser.add_argument(
+        "--changes",
+        type=int,
+        default=10000,
+        help="Number of tracked changes in the synthetic document (default: 10000)",
+    )
+    redlining_parser.add_argument(
+        "--per-paragraph",
+        type=int,
+        default=10,
+        help="Tracked changes per paragraph (default: 10)",
+    )
+
+    args = parser.parse_args()
+
+    match args.benchmark:
+        case "xsd":
+            benchmark_xsd(Path(args.unpacked_dir), Path(args.original))
+        case "format":
+            benchmark_format(args.xml and Path(args.xml), args.size_mb)
+        case "redlining":
+            benchmark_redlining(args.changes, args.per_paragraph)
+
+
+def benchmark_xsd(unpacked_dir, original_file):
+    """Compare per-file XSD validation with a cold and a shared schema cache.
+
+    "before" clears the compiled schema registry ahead of every file, which
+    reproduces compiling the schema once per validated part. "after" shares
+    the registry across files, as validate_against_xsd now does.
+    """
+    validator_class = VALIDATORS.get(original_file.suffix.lower())
+    if validator_class is None:
+        sys.exit(f"Error: {original_file} must be a .docx or .pptx file")
+
+    validator = validator_class(unpacked_dir, original_file)
+    xml_files = [f for f in validator.xml_files if validator._get_schema_path(f)]
+    if not xml_files:
+        sys.exit(f"Error: No files with a known schema in {unpacked_dir}")
+
+    def run(clear_cache):
+        validation_base._SCHEMA_CACHE.clear()
+        timings = []
+        for xml_file in xml_files:
+            if clear_cache:
+                validation_base._SCHEMA_CACHE.clear()
+            # Parse every part afresh so only the schema cache differs
+            validator._parsed_trees.clear()
+            start = time.perf_counter()
+            validator._validate_single_file_xsd(xml_file, validator.unpacked_dir)
+            timings.append(time.perf_counter() - start)
+        return timings
+
+    before = run(clear_cache=True)
+    after = run(clear_cache=False)
+
+    print(f"Validated {len(xml_files)} files with a schema in {unpacked_dir}")
+    print(f"{'':8} {'total (s)':>10} {'mean (ms)':>10} {'median (ms)':>12}")
+    for label, timings in (("before", before), ("after", after)):
+        print(
+            f"{label:8} {sum(timings):10.3f} "
+            f"{statistics.mean(timings) * 1000:10.2f} "
+            f"{statistics.median(timings) * 1000:12.2f}"
+        )
+    print(f"Speedup: {sum(before) / sum(after):.1f}x")
+
+
+def benchmark_format(xml_file, size_mb):
+    """Compare pretty-printing and condensing across formatting backends.
+
+    Each backend runs in a fresh process so that its peak RSS is not hidden
+    by memory already held by an earlier run.
+    """
+    with tempfile.TemporaryDirectory() as temp_dir:
+        if xml_file is None:
+            xml_file = Path(temp_dir) / "document.xml"
+            _write_synthetic_document(xml_file, int(size_mb * 1024 * 1024))
+
+        size = xml_file.stat().st_size
+        print(f"Formatting {xml_file.name} ({size / 1024 / 1024:.1f} MB)")
+        print(
+            f"{'backend':8} {'pretty (s)':>10} {'condense (s)':>12} "
+            f"{'MB/s':>8} {'peak RSS (MB)':>14}"
+        )
+
+        context = multiprocessing.get_context("spawn")
+        for name in sorted(FORMATTERS):
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+                pretty_time, condense_time, peak_rss = pool.submit(
+                    _time_formatter, name, str(xml_file)
+                ).result()
+            throughput = 2 * size / 1024 / 1024 / (pretty_time + condense_time)
+            print(
+                f"{name:8} {pretty_time:10.2f} {condense_time:12.2f} "
+                f"{throughput:8.1f} {peak_rss / 1024:14.0f}"
+            )
+
+
+def _time_formatter(name, xml_file):
+    """Pretty-print then condense one file; return both times and peak RSS (KB)."""
+    formatter = get_formatter(name)
+    content = Path(xml_file).read_bytes()
+
+    start = time.perf_counter()
+    pretty = formatter.pretty(content)
+    pretty_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    formatter.condense(pretty)
+    condense_time = time.perf_counter() - start
+
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return pretty_time, condense_time, peak_rss
+
+
+def _write_synthetic_document(path, target_size):
+    """Write a condensed WordprocessingML document.xml of about target_size bytes."""
+    paragraph = (
+        '<w:p w:rsidR="00A1B2C3"><w:pPr><w:pStyle w:val="Normal"/></w:pPr>'
+        '<w:r><w:rPr><w:b/></w:rPr><w:t>Paragraph {0} </w:t></w:r>'
+        '<w:r><w:t xml:space="preserve"> with some body text and '
+        "trailing space </w:t></w:r></w:p>"
+    )
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            '<w:document xmlns:w="http://schemas.openxmlformats.org/'
+            'wordprocessingml/2006/main"><w:body>'
+        )
+        index = 0
+        while f.tell() < target_size:
+            f.write(paragraph.format(index))
+            index += 1
+        f.write("</w:body></w:document>")
+
+
+def benchmark_redlining(changes, per_paragraph):
+    """Time removing tracked changes and a full RedliningValidator run.
+
+    "before" is the previous removal, which looked up each w:del's index
+    among its siblings and so grew quadratically; "after" is the one-pass
+    transform in RedliningValidator.
+    """
+    with tempfile.TemporaryDirectory() as temp_dir:
+        temp_path = Path(temp_dir)
+        original, modified = _write_redlined_documents(
+            temp_path, changes, per_paragraph
+        )
+
+        validator = RedliningValidator(modified, original)
+        root = ET.parse(modified / "word" / "document.xml").getroot()
+
+        tree = copy.deepcopy(root)
+        start = time.perf_counter()
+        _remove_tracked_changes_quadratic(tree, validator.author)
+        before = time.perf_counter() - start
+
+        tree = copy.deepcopy(root)
+        start = time.perf_counter()
+        validator._remove_tracked_changes(tree)
+        after = time.perf_counter() - start
+
+        start = time.perf_counter()
+        assert validator.validate()
+        cold = time.perf_counter() - start
+        start = time.perf_counter()
+        validator.validate()
+        warm = time.perf_counter() - start
+
+    print(f"Document with {changes} tracked changes, {per_paragraph} per paragraph")
+    print(f"{'removal before':24} {before:8.3f} s")
+    print(f"{'removal after':24} {after:8.3f} s")
+    print(f"{'validate (cold)':24} {cold:8.3f} s")
+    print(f"{'validate (cached)':24} {warm:8.3f} s")
+    print(f"Removal speedup: {before / after:.1f}x")
+
+
+def _write_redlined_documents(directory, changes, per_paragraph):
+    """Write an original .docx and an unpacked copy with tracked changes.
+
+    Every paragraph of the copy gets per_paragraph changes by Claude,
+    alternating deletions of original runs and insertions of new ones.
+
+    Returns:
+        tuple: (original .docx path, unpacked directory path)
+    """
+    namespace = 'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"'
+    original_paragraphs, modified_paragraphs = [], []
+    for p in range(-(-changes // per_paragraph)):
+        original_runs, modified_runs = [], []
+        for c in range(min(per_paragraph, changes - p * per_paragraph)):
+            run = f"<w:r><w:t xml:space=\"preserve\">run {p}.{c} </w:t></w:r>"
+            original_runs.append(run)
+            if c % 2:
+                modified_runs.append(
+                    run
+                    + f'<w:ins w:id="{p}{c}" w:author="Claude">'
+                    + f"<w:r><w:t>new {p}.{c}</w:t></w:r></w:ins>"
+                )
+            else:
+                modified_runs.append(
+                    f'<w:del w:id="{p}{c}" w:author="Claude">'
+                    + run.replace("w:t", "w:delText")
+                    + "</w:del>"
+                )
+        original_paragraphs.append(f"<w:p>{''.join(original_runs)}</w:p>")
+        modified_paragraphs.append(f"<w:p>{''.join(modified_runs)}</w:p>")
+
+    def document(paragraphs):
+        return (
+            f'<?xml version="1.0" encoding="UTF-8"?><w:document {namespace}>'
+            f"<w:body>{''.join(paragraphs)}</w:body></w:document>"
+        )
+
+    original = directory / "original.docx"
+    with zipfile.ZipFile(original, "w") as zf:
+        zf.writestr("word/document.xml", document(original_paragraphs))
+    modified = directory / "unpacked"
+    (modified / "word").mkdir(parents=True)
+    (modified / "word" / "document.xml").write_text(
+        document(modified_paragraphs), encoding="utf-8"
+    )
+    return original, modified
+
+
+def _remove_tracked_changes_quadratic(root, author):
+    """The removal RedliningValidator used before, kept for comparison."""
+    w = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+    for parent in root.iter():
+        to_remove = [
+            child
+            for child in parent
+            if child.tag == f"{{{w}}}ins" and child.get(f"{{{w}}}author") == author
+        ]
+        for elem in to_remove:
+            parent.remove(elem)
+
+    for parent in root.iter():
+        to_process = [
+            (child, list(parent).index(child))
+            for child in parent
+            if child.tag == f"{{{w}}}del" and child.get(f"{{{w}}}author") == author
+        ]
+        for del_elem, del_index in reversed(to_process):
+            for elem in del_elem.iter(f"{{{w}}}delText"):
+                elem.tag = f"{{{w}}}t"
+            for child in reversed(list(del_elem)):
+                parent.insert(del_index, child)
+            parent.remove(del_elem)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,29 +3,66 @@
 Tool to pack a directory into a .docx, .pptx, or .xlsx file with XML formatting undone.
 
 Example usage:
-    python pack.py <input_directory> <office_file> [--force]
+    python pack.py <input_directory> <office_file> [--force] [--store-media]
 """
 
 import argparse
-import shutil
-import subprocess
 import sys
 import tempfile
-import defusedxml.minidom
 import zipfile
 from pathlib import Path
 
+try:
+    from .formatting import FORMATTERS, get_formatter
+    from .office_service import convert_document
+    from .workspace import MANIFEST_NAME, LazyPackage
+except ImportError:  # Run as a script from this directory
+    from formatting import FORMATTERS, get_formatter
+    from office_service import convert_document
+    from workspace import MANIFEST_NAME, LazyPackage
+
+# Media formats that are already compressed; deflating them again costs CPU
+# for little or no size reduction
+PRECOMPRESSED_EXTENSIONS = {
+    ".jpg",
+    ".jpeg",
+    ".png",
+    ".gif",
+    ".mp3",
+    ".m4a",
+    ".mp4",
+    ".m4v",
+    ".mov",
+    ".wma",
+    ".wmv",
+    ".zip",
+}
+
 
 def main():
     parser = argparse.ArgumentParser(description="Pack a directory into an Office file")
     parser.add_argument("input_directory", help="Unpacked Office document directory")
     parser.add_argument("output_file", help="Output Office file (.docx/.pptx/.xlsx)")
     parser.add_argument("--force", action="store_true", help="Skip validation")
+    parser.add_argument(
+        "--store-media",
+        action="store_true",
+        help="Store already-compressed media (png/jpg/mp4/...) without recompressing",
+    )
+    parser.add_argument(
+        "--formatter",
+        choices=sorted(FORMATTERS),
+        help="XML formatting backend (default: lxml)",
+    )
     args = parser.parse_args()
 
     try:
         success = pack_document(
-            args.input_directory, args.output_file, validate=not args.force
+            args.input_directory,
+            args.output_file,
+            validate=not args.force,
+            store_media=args.store_media,
+            formatter=args.formatter,
         )
 
         # Show warning if validation was skipped
@@ -42,13 +79,24 @@ def main():
         sys.exit(f"Error: {e}")
 
 
-def pack_document(input_dir, output_file, validate=False):
+def pack_document(
+    input_dir, output_file, validate=False, store_media=False, formatter=None
+):
     """Pack a directory into an Office file (.docx/.pptx/.xlsx).
 
+    XML parts are condensed in memory and written straight into the output
+    archive; all other files are streamed in unchanged. The input directory
+    is never copied or modified. In a lazy workspace (see workspace.py),
+    parts that were never extracted are copied from the source file as-is.
+
     Args:
         input_dir: Path to unpacked Office document directory
         output_file: Path to output Office file
         validate: If True, validates with soffice (default: False)
+        store_media: If True, stores already-compressed media (see
+            PRECOMPRESSED_EXTENSIONS) with ZIP_STORED instead of deflating
+            it again (default: False)
+        formatter: Name of the XML formatting backend (default: lxml)
 
     Returns:
         bool: True if successful, False if validation failed
@@ -61,34 +109,54 @@ def pack_document(input_dir, output_file, validate=False):
     if output_file.suffix.lower() not in {".docx", ".pptx", ".xlsx"}:
         raise ValueError(f"{output_file} must be a .docx, .pptx, or .xlsx file")
 
-    # Work in temporary directory to avoid modifying original
-    with tempfile.TemporaryDirectory() as temp_dir:
-        temp_content_dir = Path(temp_dir) / "content"
-        shutil.copytree(input_dir, temp_content_dir)
-
-        # Process XML files to remove pretty-printing whitespace
-        for pattern in ["*.xml", "*.rels"]:
-            for xml_file in temp_content_dir.rglob(pattern):
-                condense_xml(xml_file)
-
-        # Create final Office file as zip archive
-        output_file.parent.mkdir(parents=True, exist_ok=True)
-        with zipfile.ZipFile(output_file, "w", zipfile.ZIP_DEFLATED) as zf:
-            for f in temp_content_dir.rglob("*"):
-                if f.is_file():
-                    zf.write(f, f.relative_to(temp_content_dir))
-
-        # Validate if requested
-        if validate:
-            if not validate_document(output_file):
-                output_file.unlink()  # Delete the corrupt file
-                return False
+    xml_formatter = get_formatter(formatter)
+    package = LazyPackage.load(input_dir)
+
+    # Create final Office file as zip archive
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    with zipfile.ZipFile(output_file, "w", zipfile.ZIP_DEFLATED) as zf:
+        if package is not None:
+            # Parts never extracted from a lazy workspace are unchanged
+            for name in package.pending_parts():
+                info = package.zip_info(name)
+                zinfo = zipfile.ZipInfo(name, info.date_time)
+                zinfo.compress_type = info.compress_type
+                zinfo.external_attr = info.external_attr
+                zf.writestr(zinfo, package.read(name))
+            package.close()
+
+        for f in input_dir.rglob("*"):
+            if not f.is_file():
+                continue
+            arcname = f.relative_to(input_dir).as_posix()
+            if package is not None and arcname == MANIFEST_NAME:
+                continue
+
+            if f.name.endswith((".xml", ".rels")):
+                # Remove pretty-printing whitespace without touching the file
+                zinfo = zipfile.ZipInfo.from_file(f, arcname)
+                zinfo.compress_type = zipfile.ZIP_DEFLATED
+                zf.writestr(zinfo, xml_formatter.condense(f.read_bytes()))
+            elif store_media and f.suffix.lower() in PRECOMPRESSED_EXTENSIONS:
+                zf.write(f, arcname, compress_type=zipfile.ZIP_STORED)
+            else:
+                zf.write(f, arcname)
+
+    # Validate if requested
+    if validate:
+        if not validate_document(output_file):
+            output_file.unlink()  # Delete the corrupt file
+            return False
 
     return True
 
 
 def validate_document(doc_path):
-    """Validate document by converting to HTML with soffice."""
+    """Validate document by converting to HTML with LibreOffice.
+
+    Conversions run on the shared LibreOffice instance when available (see
+    office_service.py), so only the first pack pays LibreOffice's startup.
+    """
     # Determine the correct filter based on file extension
     match doc_path.suffix.lower():
         case ".docx":
@@ -100,29 +168,12 @@ def validate_document(doc_path):
 
     with tempfile.TemporaryDirectory() as temp_dir:
         try:
-            result = subprocess.run(
-                [
-                    "soffice",
-                    "--headless",
-                    "--convert-to",
-                    filter_name,
-                    "--outdir",
-                    temp_dir,
-                    str(doc_path),
-                ],
-                capture_output=True,
-                timeout=10,
-                text=True,
-            )
-            if not (Path(temp_dir) / f"{doc_path.stem}.html").exists():
-                error_msg = result.stderr.strip() or "Document validation failed"
-                print(f"Validation error: {error_msg}", file=sys.stderr)
-                return False
+            convert_document(doc_path, temp_dir, filter_name, timeout=10)
             return True
         except FileNotFoundError:
             print("Warning: soffice not found. Skipping validation.", file=sys.stderr)
             return True
-        except subprocess.TimeoutExpired:
+        except TimeoutError:
             print("Validation error: Timeout during conversion", file=sys.stderr)
             return False
         except Exception as e:
@@ -130,30 +181,5 @@ def validate_document(doc_path):
             return False
 
 
-def condense_xml(xml_file):
-    """Strip unnecessary whitespace and remove comments."""
-    with open(xml_file, "r", encoding="utf-8") as f:
-        dom = defusedxml.minidom.parse(f)
-
-    # Process each element to remove whitespace and comments
-    for element in dom.getElementsByTagName("*"):
-        # Skip w:t elements and their processing
-        if element.tagName.endswith(":t"):
-            continue
-
-        # Remove whitespace-only text nodes and comment nodes
-        for child in list(element.childNodes):
-            if (
-                child.nodeType == child.TEXT_NODE
-                and child.nodeValue
-                and child.nodeValue.strip() == ""
-            ) or child.nodeType == child.COMMENT_NODE:
-                element.removeChild(child)
-
-    # Write back the condensed XML
-    with open(xml_file, "wb") as f:
-        f.write(dom.toxml(encoding="UTF-8"))
-
-
 if __name__ == "__main__":
     main()
@@ -3,14 +3,20 @@
 Command line tool to validate Office document XML files against XSD schemas and tracked changes.
 
 Usage:
-    python validate.py <dir> --original <original_file>
+    python validate.py <dir> --original <original_file> [--cache-dir <dir>] [--jobs N] [--incremental] [--sheet-xsd] [--author NAME]
 """
 
 import argparse
 import sys
 from pathlib import Path
 
-from validation import DOCXSchemaValidator, PPTXSchemaValidator, RedliningValidator
+from validation import (
+    BaseSchemaValidator,
+    DOCXSchemaValidator,
+    PPTXSchemaValidator,
+    RedliningValidator,
+    XLSXSchemaValidator,
+)
 
 
 def main():
@@ -30,6 +36,32 @@ def main():
         action="store_true",
         help="Enable verbose output",
     )
+    parser.add_argument(
+        "--cache-dir",
+        help="Directory for cached XSD results, reused across runs (optional)",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of worker processes for XSD validation (default: 1)",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only re-check parts that changed since the original",
+    )
+    parser.add_argument(
+        "--sheet-xsd",
+        action="store_true",
+        help="Also validate .xlsx worksheets against XSD (loads each sheet whole)",
+    )
+    parser.add_argument(
+        "--author",
+        default="Claude",
+        help="Author whose tracked changes are checked in .docx (default: Claude)",
+    )
     args = parser.parse_args()
 
     # Validate paths
@@ -48,6 +80,8 @@ def main():
             validators = [DOCXSchemaValidator, RedliningValidator]
         case ".pptx":
             validators = [PPTXSchemaValidator]
+        case ".xlsx":
+            validators = [XLSXSchemaValidator]
         case _:
             print(f"Error: Validation not supported for file type {file_extension}")
             sys.exit(1)
@@ -55,7 +89,29 @@ def main():
     # Run validators
     success = True
     for V in validators:
-        validator = V(unpacked_dir, original_file, verbose=args.verbose)
+        if issubclass(V, XLSXSchemaValidator):
+            validator = V(
+                unpacked_dir,
+                original_file,
+                sheet_xsd=args.sheet_xsd,
+                verbose=args.verbose,
+                cache_dir=args.cache_dir,
+                jobs=args.jobs,
+                incremental=args.incremental,
+            )
+        elif issubclass(V, BaseSchemaValidator):
+            validator = V(
+                unpacked_dir,
+                original_file,
+                verbose=args.verbose,
+                cache_dir=args.cache_dir,
+                jobs=args.jobs,
+                incremental=args.incremental,
+            )
+        else:
+            validator = V(
+                unpacked_dir, original_file, verbose=args.verbose, author=args.author
+            )
         if not validator.validate():
             success = False
 
@@ -2,11 +2,172 @@
 Base validator with common validation logic for document files.
 """
 
+import copy
+import fnmatch
+import hashlib
+import io
+import json
+import os
+import posixpath
 import re
+import tempfile
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 import lxml.etree
 
+try:
+    from ..workspace import MANIFEST_NAME, LazyPackage
+except ImportError:  # validation imported as a top-level package by validate.py
+    from workspace import MANIFEST_NAME, LazyPackage
+
+from .lint import lint
+from .package_graph import CONTENT_TYPES_PART, PackageGraph, is_external_target
+
+# Compiled XSD schemas keyed by schema path. Compiling the OOXML schema graph
+# dominates per-file validation time, so each schema is compiled at most once
+# per process and shared by every validator instance.
+_SCHEMA_CACHE = {}
+
+
+def _load_schema(schema_path):
+    """Return the compiled XMLSchema for schema_path, compiling it on first use."""
+    key = str(schema_path)
+    schema = _SCHEMA_CACHE.get(key)
+    if schema is None:
+        with open(schema_path, "rb") as xsd_file:
+            parser = lxml.etree.XMLParser()
+            xsd_doc = lxml.etree.parse(xsd_file, parser=parser, base_url=key)
+        schema = lxml.etree.XMLSchema(xsd_doc)
+        _SCHEMA_CACHE[key] = schema
+    return schema
+
+
+# Schema files (the schema and everything it imports or includes) keyed by
+# the main schema's path, for XSDResultCache keys
+_SCHEMA_FILES = {}
+
+XSD_NAMESPACE = "http://www.w3.org/2001/XMLSchema"
+
+
+def _schema_files(schema_path):
+    """Return the schema file and every XSD it references, transitively.
+
+    xsd:import, xsd:include and xsd:redefine schemaLocations are followed;
+    imports without a schemaLocation are resolved by lxml and skipped here.
+    """
+    key = str(schema_path)
+    if key not in _SCHEMA_FILES:
+        files = []
+        pending = [Path(schema_path).resolve()]
+        while pending:
+            path = pending.pop()
+            if path in files:
+                continue
+            files.append(path)
+            try:
+                root = lxml.etree.parse(str(path)).getroot()
+            except (OSError, lxml.etree.XMLSyntaxError):
+                continue
+            for tag in ("import", "include", "redefine"):
+                for elem in root.iterfind(f"{{{XSD_NAMESPACE}}}{tag}"):
+                    location = elem.get("schemaLocation")
+                    if location and "://" not in location:
+                        pending.append((path.parent / location).resolve())
+        _SCHEMA_FILES[key] = sorted(files)
+    return _SCHEMA_FILES[key]
+
+
+def _canonical_digest(content):
+    """Hash an XML part independent of its formatting.
+
+    Whitespace-only text between elements (pretty-printing) and comments are
+    dropped and the result is canonicalized (C14N), so a part re-indented by
+    unpack.py hashes the same as its condensed original. Whitespace that is an
+    element's only content, as in <w:t> </w:t>, is kept.
+
+    Returns:
+        str: Hex digest, or None if the content cannot be canonicalized
+    """
+    try:
+        parser = lxml.etree.XMLParser(remove_blank_text=True, resolve_entities=False)
+        root = lxml.etree.fromstring(content, parser=parser)
+        return hashlib.sha256(
+            lxml.etree.tostring(root, method="c14n", with_comments=False)
+        ).hexdigest()
+    except Exception:
+        return None
+
+
+# Validator instance owned by each process pool worker (see _init_xsd_worker)
+_WORKER_VALIDATOR = None
+
+
+def _init_xsd_worker(validator_class, unpacked_dir, original_file, cache_dir):
+    """Create the worker's validator; its compiled schemas stay cached per worker."""
+    global _WORKER_VALIDATOR
+    _WORKER_VALIDATOR = validator_class(
+        unpacked_dir, original_file, verbose=False, cache_dir=cache_dir
+    )
+
+
+def _validate_file_in_worker(xml_file):
+    """Validate one part against its XSD in a process pool worker."""
+    return _WORKER_VALIDATOR.validate_file_against_xsd(xml_file, verbose=False)
+
+
+class XSDResultCache:
+    """On-disk cache of XSD validation results shared across processes.
+
+    Compiled lxml schemas cannot be serialized, so instead of the schemas this
+    caches their output: the error set for a given schema and part content.
+    Schemas are compiled lazily, so a warm run over unchanged parts (e.g. the
+    original package, or repeated validate.py calls in a batch pipeline) does
+    not compile any schema at all.
+    """
+
+    def __init__(self, cache_dir):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def key(self, schema_path, content, clean_namespaces):
+        """Build a cache key from the schemas, the part bytes and preprocessing.
+
+        The schema and every XSD it imports contribute their path, mtime and
+        size, so editing any of them invalidates the cached results.
+        """
+        digest = hashlib.sha256()
+        for path in _schema_files(schema_path):
+            try:
+                stat = path.stat()
+            except OSError:
+                digest.update(f"{path}|missing|".encode())
+                continue
+            digest.update(f"{path}|{stat.st_mtime_ns}|{stat.st_size}|".encode())
+        digest.update(b"clean|" if clean_namespaces else b"raw|")
+        digest.update(content)
+        return digest.hexdigest()
+
+    def get(self, key):
+        """Return the cached (is_valid, errors_set) for key, or None on a miss."""
+        try:
+            data = json.loads((self.cache_dir / f"{key}.json").read_text())
+        except (OSError, ValueError):
+            return None
+        return data["valid"], set(data["errors"])
+
+    def put(self, key, is_valid, errors):
+        """Store a result atomically so concurrent processes never see partial files."""
+        data = json.dumps({"valid": is_valid, "errors": sorted(errors)})
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                f.write(data)
+            os.replace(tmp_path, self.cache_dir / f"{key}.json")
+        except OSError:
+            Path(tmp_path).unlink(missing_ok=True)
+
 
 class BaseSchemaValidator:
     """Base validator with common validation logic for document files."""
@@ -37,6 +198,18 @@ class BaseSchemaValidator:
         "grpsp": ("id", "file"),  # Group shape IDs
     }
 
+    # Root elements of parts that need an <Override> in [Content_Types].xml
+    DECLARABLE_ROOTS = {
+        "sld",
+        "sldLayout",
+        "sldMaster",
+        "presentation",  # PowerPoint
+        "document",  # Word
+        "workbook",
+        "worksheet",  # Excel
+        "theme",  # Common
+    }
+
     # Mapping of element names to expected relationship types
     # Subclasses should override this with format-specific mappings
     ELEMENT_RELATIONSHIP_TYPES = {}
@@ -103,35 +276,215 @@ class BaseSchemaValidator:
         "http://www.w3.org/XML/1998/namespace",
     }
 
-    def __init__(self, unpacked_dir, original_file, verbose=False):
+    def __init__(
+        self,
+        unpacked_dir,
+        original_file,
+        verbose=False,
+        cache_dir=None,
+        jobs=1,
+        incremental=False,
+    ):
         self.unpacked_dir = Path(unpacked_dir).resolve()
         self.original_file = Path(original_file)
         self.verbose = verbose
 
+        # Optional on-disk cache of XSD results shared across runs
+        self.cache_dir = cache_dir
+        self.xsd_cache = XSDResultCache(cache_dir) if cache_dir else None
+
+        # Number of worker processes for XSD validation (1 = serial)
+        self.jobs = jobs
+
+        # Only re-check parts that changed since the original (see _parts_to_check)
+        self.incremental = incremental
+        self._original_manifest = {}
+        self._incremental_parts = None
+
         # Set schemas directory
         self.schemas_dir = Path(__file__).parent.parent.parent / "schemas"
 
+        # Lazy workspace (see workspace.py): parts that were never extracted
+        # are read straight from the source file and count as unchanged
+        self.package = LazyPackage.load(self.unpacked_dir)
+
         # Get all XML and .rels files
         patterns = ["*.xml", "*.rels"]
         self.xml_files = [
             f for pattern in patterns for f in self.unpacked_dir.rglob(pattern)
         ]
+        if self.package is not None:
+            self.xml_files += [
+                self.unpacked_dir / name
+                for name in self.package.pending_parts()
+                if name.endswith((".xml", ".rels"))
+            ]
 
         if not self.xml_files:
             print(f"Warning: No XML files found in {self.unpacked_dir}")
 
+        # Parsed trees of unpacked parts, shared by all checks (see _parse)
+        self._parsed_trees = {}
+
+        # Relationship and content type index (see _get_package_graph)
+        self._package_graph = None
+
+        # Streaming lint results per file (see _lint)
+        self._lint_results = {}
+
+        # Snapshot of the original package's XML parts, read on first use
+        self._original_parts = None
+        # XSD errors of original parts, keyed by relative path
+        self._original_errors = {}
+
     def validate(self):
         """Run all validation checks and return True if all pass."""
         raise NotImplementedError("Subclasses must implement the validate method")
 
+    def _parse(self, xml_file):
+        """Parse an XML file once per validator run and return the shared tree.
+
+        Every check receives the same tree, so callers must treat it as
+        read-only; checks that modify the tree should use _parse_copy.
+        Parse errors are cached too and re-raised on every call.
+
+        Args:
+            xml_file: Path to an XML file in unpacked_dir
+
+        Returns:
+            lxml.etree._ElementTree: The parsed document
+        """
+        xml_file = Path(xml_file)
+        if xml_file not in self._parsed_trees:
+            try:
+                if self._is_pending(xml_file):
+                    self._parsed_trees[xml_file] = lxml.etree.parse(
+                        io.BytesIO(self._read_part(xml_file))
+                    )
+                else:
+                    self._parsed_trees[xml_file] = lxml.etree.parse(str(xml_file))
+            except Exception as e:
+                self._parsed_trees[xml_file] = e
+
+        tree = self._parsed_trees[xml_file]
+        if isinstance(tree, Exception):
+            raise tree
+        return tree
+
+    def _parse_copy(self, xml_file):
+        """Return a private, modifiable copy of the shared parsed tree."""
+        return copy.deepcopy(self._parse(xml_file))
+
+    def _lint_rules(self, xml_file):
+        """Return the streaming lint rules (see lint.py) that apply to xml_file."""
+        return []
+
+    def _lint(self, xml_file):
+        """Run every lint rule for xml_file in one pass and keep the results.
+
+        validate_xml() lints parts before parsing them, so in a validate()
+        run the file is streamed with bounded memory. If the file was already
+        parsed, the shared tree is walked in place instead. Parse errors are
+        cached and re-raised.
+
+        Returns:
+            dict: rule name -> list of lint.Violation
+        """
+        xml_file = Path(xml_file)
+        if xml_file not in self._lint_results:
+            try:
+                source = self._parsed_trees.get(xml_file)
+                if source is None or isinstance(source, Exception):
+                    source = self._stream_source(xml_file)
+                self._lint_results[xml_file] = lint(
+                    source, self._lint_rules(xml_file)
+                )
+            except Exception as e:
+                self._lint_results[xml_file] = e
+
+        results = self._lint_results[xml_file]
+        if isinstance(results, Exception):
+            raise results
+        return results
+
+    def _stream_source(self, xml_file):
+        """Return a source for streaming xml_file with lxml.etree.iterparse."""
+        if self._is_pending(xml_file):
+            # Decompressed as it is read, never held whole in memory
+            return self.package.open(
+                Path(xml_file).relative_to(self.unpacked_dir).as_posix()
+            )
+        return str(xml_file)
+
+    def _is_pending(self, path):
+        """Check whether path is a lazy-workspace part not extracted yet."""
+        return self.package is not None and self.package.is_pending(
+            Path(path).relative_to(self.unpacked_dir).as_posix()
+        )
+
+    def _part_exists(self, path):
+        """Check whether path is a file in the package, extracted or not."""
+        path = Path(path)
+        return path.is_file() or (
+            path.is_relative_to(self.unpacked_dir) and self._is_pending(path)
+        )
+
+    def _read_part(self, path):
+        """Return the bytes of a part, from disk or from a lazy workspace's source."""
+        if self._is_pending(path):
+            return self.package.read(
+                Path(path).relative_to(self.unpacked_dir).as_posix()
+            )
+        return Path(path).read_bytes()
+
+    def _glob_parts(self, pattern):
+        """Glob for parts relative to unpacked_dir, including pending lazy parts."""
+        files = list(self.unpacked_dir.glob(pattern))
+        if self.package is not None:
+            files += [
+                self.unpacked_dir / name
+                for name in self.package.pending_parts()
+                if fnmatch.fnmatch(name, pattern)
+            ]
+        return files
+
+    def _get_package_graph(self):
+        """Return the package's relationship and content type index, built once."""
+        if self._package_graph is None:
+            self._package_graph = PackageGraph(
+                (
+                    f.relative_to(self.unpacked_dir).as_posix()
+                    for f in self._all_files()
+                ),
+                lambda part: self._parse(self.unpacked_dir / part).getroot(),
+            )
+        return self._package_graph
+
+    def _all_files(self):
+        """Return every file of the package, including pending lazy parts."""
+        files = [f for f in self.unpacked_dir.rglob("*") if f.is_file()]
+        if self.package is not None:
+            manifest = self.unpacked_dir / MANIFEST_NAME
+            files = [f for f in files if f != manifest]
+            files += [
+                self.unpacked_dir / name for name in self.package.pending_parts()
+            ]
+        return files
+
     def validate_xml(self):
         """Validate that all XML files are well-formed."""
         errors = []
 
+        # Parts that lint rules check are streamed through them first, so the
+        # rules run with bounded memory rather than over the shared tree
+        # parsed below; later checks read the cached results
+        linted = set(self._parts_to_check())
         for xml_file in self.xml_files:
             try:
+                if xml_file in linted and self._lint_rules(xml_file):
+                    self._lint(xml_file)
                 # Try to parse the XML file
-                lxml.etree.parse(str(xml_file))
+                self._parse(xml_file)
             except lxml.etree.XMLSyntaxError as e:
                 errors.append(
                     f"  {xml_file.relative_to(self.unpacked_dir)}: "
@@ -157,20 +510,10 @@ class BaseSchemaValidator:
         """Validate that namespace prefixes in Ignorable attributes are declared."""
         errors = []
 
-        for xml_file in self.xml_files:
+        for xml_file in self._parts_to_check():
             try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
-                declared = set(root.nsmap.keys()) - {None}  # Exclude default namespace
-
-                for attr_val in [
-                    v for k, v in root.attrib.items() if k.endswith("Ignorable")
-                ]:
-                    undeclared = set(attr_val.split()) - declared
-                    errors.extend(
-                        f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                        f"Namespace '{ns}' in Ignorable but not declared"
-                        for ns in undeclared
-                    )
+                root = self._parse(xml_file).getroot()
+                errors.extend(self._ignorable_namespace_errors(xml_file, root))
             except lxml.etree.XMLSyntaxError:
                 continue
 
@@ -183,6 +526,20 @@ class BaseSchemaValidator:
             print("PASSED - All namespace prefixes properly declared")
         return True
 
+    def _ignorable_namespace_errors(self, xml_file, root):
+        """Return errors for prefixes in root's mc:Ignorable that are not declared."""
+        errors = []
+        declared = set(root.nsmap.keys()) - {None}  # Exclude default namespace
+
+        for attr_val in [v for k, v in root.attrib.items() if k.endswith("Ignorable")]:
+            undeclared = set(attr_val.split()) - declared
+            errors.extend(
+                f"  {xml_file.relative_to(self.unpacked_dir)}: "
+                f"Namespace '{ns}' in Ignorable but not declared"
+                for ns in undeclared
+            )
+        return errors
+
     def validate_unique_ids(self):
         """Validate that specific IDs are unique according to OOXML requirements."""
         errors = []
@@ -190,7 +547,8 @@ class BaseSchemaValidator:
 
         for xml_file in self.xml_files:
             try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
+                # Copy-on-write: this check removes elements from the tree
+                root = self._parse_copy(xml_file).getroot()
                 file_ids = {}  # Track IDs that must be unique within this file
 
                 # Remove all mc:AlternateContent elements from the tree
@@ -279,94 +637,51 @@ class BaseSchemaValidator:
         Validate that all .rels files properly reference files and that all files are referenced.
         """
         errors = []
+        graph = self._get_package_graph()
 
         # Find all .rels files
-        rels_files = list(self.unpacked_dir.rglob("*.rels"))
+        rels_parts = sorted(p for p in graph.parts if p.endswith(".rels"))
 
-        if not rels_files:
+        if not rels_parts:
             if self.verbose:
                 print("PASSED - No .rels files found")
             return True
 
-        # Get all files in the unpacked directory (excluding reference files)
-        all_files = []
-        for file_path in self.unpacked_dir.rglob("*"):
-            if (
-                file_path.is_file()
-                and file_path.name != "[Content_Types].xml"
-                and not file_path.name.endswith(".rels")
-            ):  # This file is not referenced by .rels
-                all_files.append(file_path.resolve())
-
-        # Track all files that are referenced by any .rels file
-        all_referenced_files = set()
+        # Get all files in the package (excluding reference files)
+        all_files = {
+            part
+            for part in graph.parts
+            if posixpath.basename(part) != CONTENT_TYPES_PART
+            and not part.endswith(".rels")
+        }  # These files are not referenced by .rels
 
         if self.verbose:
             print(
-                f"Found {len(rels_files)} .rels files and {len(all_files)} target files"
+                f"Found {len(rels_parts)} .rels files and {len(all_files)} target files"
             )
 
         # Check each .rels file
-        for rels_file in rels_files:
-            try:
-                # Parse relationships file
-                rels_root = lxml.etree.parse(str(rels_file)).getroot()
-
-                # Get the directory where this .rels file is located
-                rels_dir = rels_file.parent
-
-                # Find all relationships and their targets
-                referenced_files = set()
-                broken_refs = []
+        for rels_part in rels_parts:
+            if rels_part in graph.rels_errors:
+                errors.append(
+                    f"  Error parsing {rels_part}: {graph.rels_errors[rels_part]}"
+                )
+                continue
 
-                for rel in rels_root.findall(
-                    ".//ns:Relationship",
-                    namespaces={"ns": self.PACKAGE_RELATIONSHIPS_NAMESPACE},
-                ):
-                    target = rel.get("Target")
-                    if target and not target.startswith(
-                        ("http", "mailto:")
-                    ):  # Skip external URLs
-                        # Resolve the target path relative to the .rels file location
-                        if rels_file.name == ".rels":
-                            # Root .rels file - targets are relative to unpacked_dir
-                            target_path = self.unpacked_dir / target
-                        else:
-                            # Other .rels files - targets are relative to their parent's parent
-                            # e.g., word/_rels/document.xml.rels -> targets relative to word/
-                            base_dir = rels_dir.parent
-                            target_path = base_dir / target
-
-                        # Normalize the path and check if it exists
-                        try:
-                            target_path = target_path.resolve()
-                            if target_path.exists() and target_path.is_file():
-                                referenced_files.add(target_path)
-                                all_referenced_files.add(target_path)
-                            else:
-                                broken_refs.append((target, rel.sourceline))
-                        except (OSError, ValueError):
-                            broken_refs.append((target, rel.sourceline))
-
-                # Report broken references
-                if broken_refs:
-                    rel_path = rels_file.relative_to(self.unpacked_dir)
-                    for broken_ref, line_num in broken_refs:
+            # Report broken references (external URLs are skipped)
+            for rel in graph.relationships[rels_part]:
+                if rel.target and not is_external_target(rel.target):
+                    if rel.part is None:
                         errors.append(
-                            f"  {rel_path}: Line {line_num}: Broken reference to {broken_ref}"
+                            f"  {rels_part}: Line {rel.line}: Broken reference to {rel.target}"
                         )
 
-            except Exception as e:
-                rel_path = rels_file.relative_to(self.unpacked_dir)
-                errors.append(f"  Error parsing {rel_path}: {e}")
-
         # Check for unreferenced files (files that exist but are not referenced anywhere)
-        unreferenced_files = set(all_files) - all_referenced_files
+        unreferenced_files = all_files - graph.referenced_parts()
 
         if unreferenced_files:
             for unref_file in sorted(unreferenced_files):
-                unref_rel_path = unref_file.relative_to(self.unpacked_dir)
-                errors.append(f"  Unreferenced file: {unref_rel_path}")
+                errors.append(f"  Unreferenced file: {unref_file}")
 
         if errors:
             print(f"FAILED - Found {len(errors)} relationship validation errors:")
@@ -393,38 +708,37 @@ class BaseSchemaValidator:
         import lxml.etree
 
         errors = []
+        graph = self._get_package_graph()
 
         # Process each XML file that might contain r:id references
-        for xml_file in self.xml_files:
+        for xml_file in self._parts_to_check():
             # Skip .rels files themselves
             if xml_file.suffix == ".rels":
                 continue
 
             # Determine the corresponding .rels file
             # For dir/file.xml, it's dir/_rels/file.xml.rels
-            rels_dir = xml_file.parent / "_rels"
-            rels_file = rels_dir / f"{xml_file.name}.rels"
+            part = xml_file.relative_to(self.unpacked_dir).as_posix()
+            rels_part = graph.rels_part_for(part)
 
             # Skip if there's no corresponding .rels file (that's okay)
-            if not rels_file.exists():
+            if rels_part not in graph.parts:
                 continue
 
             try:
-                # Parse the .rels file to get valid relationship IDs and their types
-                rels_root = lxml.etree.parse(str(rels_file)).getroot()
-                rid_to_type = {}
+                if rels_part in graph.rels_errors:
+                    raise graph.rels_errors[rels_part]
 
-                for rel in rels_root.findall(
-                    f".//{{{self.PACKAGE_RELATIONSHIPS_NAMESPACE}}}Relationship"
-                ):
-                    rid = rel.get("Id")
-                    rel_type = rel.get("Type", "")
+                # Valid relationship IDs and their types
+                rid_to_type = {}
+                for rel in graph.relationships[rels_part]:
+                    rid = rel.id
+                    rel_type = rel.type
                     if rid:
                         # Check for duplicate rIds
                         if rid in rid_to_type:
-                            rels_rel_path = rels_file.relative_to(self.unpacked_dir)
                             errors.append(
-                                f"  {rels_rel_path}: Line {rel.sourceline}: "
+                                f"  {rels_part}: Line {rel.line}: "
                                 f"Duplicate relationship ID '{rid}' (IDs must be unique)"
                             )
                         # Extract just the type name from the full URL
@@ -434,7 +748,7 @@ class BaseSchemaValidator:
                         rid_to_type[rid] = type_name
 
                 # Parse the XML file to find all r:id references
-                xml_root = lxml.etree.parse(str(xml_file)).getroot()
+                xml_root = self._parse(xml_file).getroot()
 
                 # Find all elements with r:id attributes
                 for elem in xml_root.iter():
@@ -524,44 +838,17 @@ class BaseSchemaValidator:
         errors = []
 
         # Find [Content_Types].xml file
-        content_types_file = self.unpacked_dir / "[Content_Types].xml"
-        if not content_types_file.exists():
+        graph = self._get_package_graph()
+        if CONTENT_TYPES_PART not in graph.parts:
             print("FAILED - [Content_Types].xml file not found")
             return False
 
         try:
-            # Parse and get all declared parts and extensions
-            root = lxml.etree.parse(str(content_types_file)).getroot()
-            declared_parts = set()
-            declared_extensions = set()
-
-            # Get Override declarations (specific files)
-            for override in root.findall(
-                f".//{{{self.CONTENT_TYPES_NAMESPACE}}}Override"
-            ):
-                part_name = override.get("PartName")
-                if part_name is not None:
-                    declared_parts.add(part_name.lstrip("/"))
-
-            # Get Default declarations (by extension)
-            for default in root.findall(
-                f".//{{{self.CONTENT_TYPES_NAMESPACE}}}Default"
-            ):
-                extension = default.get("Extension")
-                if extension is not None:
-                    declared_extensions.add(extension.lower())
-
-            # Root elements that require content type declaration
-            declarable_roots = {
-                "sld",
-                "sldLayout",
-                "sldMaster",
-                "presentation",  # PowerPoint
-                "document",  # Word
-                "workbook",
-                "worksheet",  # Excel
-                "theme",  # Common
-            }
+            # Declared parts (Override) and extensions (Default)
+            if graph.content_types_error is not None:
+                raise graph.content_types_error
+            declared_parts = graph.overrides
+            declared_extensions = graph.defaults
 
             # Common media file extensions that should be declared
             media_extensions = {
@@ -575,9 +862,8 @@ class BaseSchemaValidator:
                 "emf": "image/x-emf",
             }
 
-            # Get all files in the unpacked directory
-            all_files = list(self.unpacked_dir.rglob("*"))
-            all_files = [f for f in all_files if f.is_file()]
+            # Get all files in the package
+            all_files = [self.unpacked_dir / part for part in graph.parts]
 
             # Check all XML files for Override declarations
             for xml_file in self.xml_files:
@@ -593,10 +879,13 @@ class BaseSchemaValidator:
                     continue
 
                 try:
-                    root_tag = lxml.etree.parse(str(xml_file)).getroot().tag
+                    root_tag = self._parse(xml_file).getroot().tag
                     root_name = root_tag.split("}")[-1] if "}" in root_tag else root_tag
 
-                    if root_name in declarable_roots and path_str not in declared_parts:
+                    if (
+                        root_name in self.DECLARABLE_ROOTS
+                        and path_str not in declared_parts
+                    ):
                         errors.append(
                             f"  {path_str}: File with <{root_name}> root not declared in [Content_Types].xml"
                         )
@@ -673,7 +962,7 @@ class BaseSchemaValidator:
             if verbose:
                 relative_path = xml_file.relative_to(unpacked_dir)
                 print(f"FAILED - {relative_path}: {len(new_errors)} new error(s)")
-                for error in list(new_errors)[:3]:
+                for error in sorted(new_errors)[:3]:
                     truncated = error[:250] + "..." if len(error) > 250 else error
                     print(f"  - {truncated}")
             return False, new_errors
@@ -692,11 +981,11 @@ class BaseSchemaValidator:
         valid_count = 0
         skipped_count = 0
 
-        for xml_file in self.xml_files:
+        xml_files = self._xsd_parts()
+        for xml_file, (is_valid, new_file_errors) in zip(
+            xml_files, self._validate_files_against_xsd(xml_files)
+        ):
             relative_path = str(xml_file.relative_to(self.unpacked_dir))
-            is_valid, new_file_errors = self.validate_file_against_xsd(
-                xml_file, verbose=False
-            )
 
             if is_valid is None:
                 skipped_count += 1
@@ -712,14 +1001,14 @@ class BaseSchemaValidator:
 
             # Has new errors
             new_errors.append(f"  {relative_path}: {len(new_file_errors)} new error(s)")
-            for error in list(new_file_errors)[:3]:  # Show first 3 errors
+            for error in sorted(new_file_errors)[:3]:  # Show first 3 errors
                 new_errors.append(
                     f"    - {error[:250]}..." if len(error) > 250 else f"    - {error}"
                 )
 
         # Print summary
         if self.verbose:
-            print(f"Validated {len(self.xml_files)} files:")
+            print(f"Validated {len(xml_files)} files:")
             print(f"  - Valid: {valid_count}")
             print(f"  - Skipped (no schema): {skipped_count}")
             if original_error_count:
@@ -738,6 +1027,55 @@ class BaseSchemaValidator:
                 print("\nPASSED - No new XSD validation errors introduced")
             return True
 
+    def _xsd_parts(self):
+        """Return the parts validate_against_xsd checks (see _parts_to_check)."""
+        return self._parts_to_check()
+
+    def _validate_files_against_xsd(self, xml_files):
+        """Run validate_file_against_xsd over xml_files, in parallel if jobs > 1.
+
+        Parts are independent, so with jobs > 1 they are fanned out to a
+        process pool whose workers each hold their own compiled schemas.
+        Results are returned in the order of xml_files either way.
+
+        Returns:
+            list: (is_valid, new_errors_set) tuples, one per file
+        """
+        if self.jobs <= 1 or len(xml_files) < 2:
+            return [
+                self.validate_file_against_xsd(xml_file, verbose=False)
+                for xml_file in xml_files
+            ]
+
+        # Files without a schema are skipped without a round trip to a worker
+        results = [(None, set())] * len(xml_files)
+        pending = [
+            (index, xml_file)
+            for index, xml_file in enumerate(xml_files)
+            if self._get_schema_path(xml_file)
+        ]
+        chunksize = max(1, len(pending) // (self.jobs * 4))
+
+        with ProcessPoolExecutor(
+            max_workers=self.jobs,
+            initializer=_init_xsd_worker,
+            initargs=(
+                type(self),
+                self.unpacked_dir,
+                self.original_file,
+                self.cache_dir,
+            ),
+        ) as executor:
+            worker_results = executor.map(
+                _validate_file_in_worker,
+                [xml_file for _, xml_file in pending],
+                chunksize=chunksize,
+            )
+            for (index, _), result in zip(pending, worker_results):
+                results[index] = result
+
+        return results
+
     def _get_schema_path(self, xml_file):
         """Determine the appropriate schema path for an XML file."""
         # Check exact filename match
@@ -823,85 +1161,191 @@ class BaseSchemaValidator:
 
         return xml_doc
 
-    def _validate_single_file_xsd(self, xml_file, base_path):
-        """Validate a single XML file against XSD schema. Returns (is_valid, errors_set)."""
+    def _validate_single_file_xsd(self, xml_file, base_path, content=None):
+        """Validate a single XML file against XSD schema. Returns (is_valid, errors_set).
+
+        If content is given, it is validated in place of the file's bytes on disk.
+        """
         schema_path = self._get_schema_path(xml_file)
         if not schema_path:
             return None, None  # Skip file
 
         try:
-            # Load schema
-            with open(schema_path, "rb") as xsd_file:
-                parser = lxml.etree.XMLParser()
-                xsd_doc = lxml.etree.parse(
-                    xsd_file, parser=parser, base_url=str(schema_path)
+            # Clean ignorable namespaces if needed
+            relative_path = xml_file.relative_to(base_path)
+            clean_namespaces = bool(
+                relative_path.parts
+                and relative_path.parts[0] in self.MAIN_CONTENT_FOLDERS
+            )
+
+            cache_key = None
+            if self.xsd_cache:
+                key_content = (
+                    content if content is not None else self._read_part(xml_file)
                 )
-                schema = lxml.etree.XMLSchema(xsd_doc)
+                cache_key = self.xsd_cache.key(
+                    schema_path, key_content, clean_namespaces
+                )
+                cached = self.xsd_cache.get(cache_key)
+                if cached is not None:
+                    return cached
 
-            # Load and preprocess XML
-            with open(xml_file, "r") as f:
-                xml_doc = lxml.etree.parse(f)
+            # Load schema (compiled once per process)
+            schema = _load_schema(schema_path)
+
+            # Load XML: unpacked parts come from the shared parse store; the
+            # preprocessing below works on a copy and leaves it untouched
+            if content is None:
+                xml_doc = self._parse(xml_file)
+            else:
+                xml_doc = lxml.etree.parse(io.BytesIO(content))
 
             xml_doc, _ = self._remove_template_tags_from_text_nodes(xml_doc)
             xml_doc = self._preprocess_for_mc_ignorable(xml_doc)
 
-            # Clean ignorable namespaces if needed
-            relative_path = xml_file.relative_to(base_path)
-            if (
-                relative_path.parts
-                and relative_path.parts[0] in self.MAIN_CONTENT_FOLDERS
-            ):
+            if clean_namespaces:
                 xml_doc = self._clean_ignorable_namespaces(xml_doc)
 
             # Validate
             if schema.validate(xml_doc):
-                return True, set()
+                is_valid, errors = True, set()
             else:
                 errors = set()
                 for error in schema.error_log:
                     # Store normalized error message (without line numbers for comparison)
                     errors.add(error.message)
-                return False, errors
+                is_valid = False
+
+            if cache_key:
+                self.xsd_cache.put(cache_key, is_valid, errors)
+            return is_valid, errors
 
         except Exception as e:
             return False, {str(e)}
 
+    def _get_original_parts(self):
+        """Read the XML parts of the original package into memory.
+
+        The archive is opened once per validator run; later lookups are served
+        from the in-memory snapshot. Binary parts (media, embeddings) are never
+        validated and are not loaded.
+
+        Returns:
+            dict: Mapping of zip member name (e.g. "word/document.xml") to bytes
+        """
+        if self._original_parts is None:
+            with zipfile.ZipFile(self.original_file, "r") as zip_ref:
+                self._original_parts = {
+                    info.filename: zip_ref.read(info)
+                    for info in zip_ref.infolist()
+                    if info.filename.endswith((".xml", ".rels"))
+                }
+        return self._original_parts
+
+    def _get_original_part(self, relative_path):
+        """Return the bytes of a part in the original package, or None if absent."""
+        return self._get_original_parts().get(Path(relative_path).as_posix())
+
+    def _is_unchanged_part(self, xml_file):
+        """Check whether an unpacked part has the same content as in the original.
+
+        Byte-identical parts are detected without parsing. Otherwise both sides
+        are compared by canonical digest, so formatting-only differences (such
+        as the pretty-printing added by unpack.py) do not count as changes.
+        Original digests are kept in a per-run manifest keyed by part name.
+        """
+        if self._is_pending(xml_file):
+            return True  # Never extracted from a lazy workspace
+
+        relative_path = Path(xml_file).relative_to(self.unpacked_dir).as_posix()
+        original_content = self._get_original_part(relative_path)
+        if original_content is None:
+            return False  # Added part
+
+        current_content = Path(xml_file).read_bytes()
+        if current_content == original_content:
+            return True
+
+        if relative_path not in self._original_manifest:
+            self._original_manifest[relative_path] = _canonical_digest(
+                original_content
+            )
+        original_digest = self._original_manifest[relative_path]
+        return original_digest is not None and (
+            _canonical_digest(current_content) == original_digest
+        )
+
+    def _parts_to_check(self):
+        """Return the parts that per-part checks should examine.
+
+        Normally every XML part. In incremental mode, parts whose content is
+        unchanged from the original are left out, since any errors they have
+        already existed in the original. Changed and added parts are kept,
+        together with their relationship neighbours: the .rels file of a
+        changed part and the source part of a changed .rels file, so r:id
+        references are re-checked from both sides. Checks that need the whole package (ID uniqueness, file references,
+        content types) still look at every part.
+        """
+        if not self.incremental:
+            return self.xml_files
+
+        if self._incremental_parts is None:
+            changed = {
+                xml_file
+                for xml_file in self.xml_files
+                if not self._is_unchanged_part(xml_file)
+            }
+
+            neighbours = set()
+            for xml_file in changed:
+                if xml_file.suffix == ".rels":
+                    # dir/_rels/part.xml.rels describes dir/part.xml
+                    base_dir = xml_file.parent.parent
+                    neighbours.add(base_dir / xml_file.name[: -len(".rels")])
+                else:
+                    neighbours.add(xml_file.parent / "_rels" / f"{xml_file.name}.rels")
+
+            selected = changed | neighbours
+            self._incremental_parts = [f for f in self.xml_files if f in selected]
+
+            if self.verbose:
+                print(
+                    f"Incremental: checking {len(self._incremental_parts)} of "
+                    f"{len(self.xml_files)} parts ({len(changed)} changed or added)"
+                )
+
+        return self._incremental_parts
+
     def _get_original_file_errors(self, xml_file):
         """Get XSD validation errors from a single file in the original document.
 
+        Results are memoized per part, so each original part is validated at
+        most once per validator run.
+
         Args:
             xml_file: Path to the XML file in unpacked_dir to check
 
         Returns:
             set: Set of error messages from the original file
         """
-        import tempfile
-        import zipfile
-
         # Resolve both paths to handle symlinks (e.g., /var vs /private/var on macOS)
         xml_file = Path(xml_file).resolve()
         unpacked_dir = self.unpacked_dir.resolve()
         relative_path = xml_file.relative_to(unpacked_dir)
 
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-
-            # Extract original file
-            with zipfile.ZipFile(self.original_file, "r") as zip_ref:
-                zip_ref.extractall(temp_path)
-
-            # Find corresponding file in original
-            original_xml_file = temp_path / relative_path
-
-            if not original_xml_file.exists():
+        if relative_path not in self._original_errors:
+            content = self._get_original_part(relative_path)
+            if content is None:
                 # File didn't exist in original, so no original errors
-                return set()
+                errors = set()
+            else:
+                # Validate the specific file in original
+                is_valid, errors = self._validate_single_file_xsd(
+                    xml_file, unpacked_dir, content=content
+                )
+            self._original_errors[relative_path] = errors if errors else set()
 
-            # Validate the specific file in original
-            is_valid, errors = self._validate_single_file_xsd(
-                original_xml_file, temp_path
-            )
-            return errors if errors else set()
+        return self._original_errors[relative_path]
 
     def _remove_template_tags_from_text_nodes(self, xml_doc):
         """Remove template tags from XML text nodes and collect warnings.
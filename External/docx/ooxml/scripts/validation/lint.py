@@ -0,0 +1,358 @@
+"""
+Streaming lint engine for checks that need one forward pass over elements.
+
+Rules see each element they are interested in as it is opened or closed.
+Finished elements are cleared at boundary elements (such as paragraphs), so
+the partial tree holds one boundary element plus the stack of its open
+ancestors, which rules query for context (e.g. "inside a <w:del>"). Memory
+is therefore bounded by document depth and paragraph size rather than
+document size. Only the tags rules ask for are reported to Python.
+"""
+
+import re
+from typing import NamedTuple
+
+import lxml.etree
+
+WORD_2006_NAMESPACE = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+SPREADSHEETML_NAMESPACE = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+OFFICE_RELATIONSHIPS_NAMESPACE = (
+    "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+)
+XML_NAMESPACE = "http://www.w3.org/XML/1998/namespace"
+
+W_P = f"{{{WORD_2006_NAMESPACE}}}p"
+W_T = f"{{{WORD_2006_NAMESPACE}}}t"
+W_DEL = f"{{{WORD_2006_NAMESPACE}}}del"
+W_INS = f"{{{WORD_2006_NAMESPACE}}}ins"
+W_DEL_TEXT = f"{{{WORD_2006_NAMESPACE}}}delText"
+XML_SPACE = f"{{{XML_NAMESPACE}}}space"
+
+S_ROW = f"{{{SPREADSHEETML_NAMESPACE}}}row"
+S_C = f"{{{SPREADSHEETML_NAMESPACE}}}c"
+S_V = f"{{{SPREADSHEETML_NAMESPACE}}}v"
+S_COL = f"{{{SPREADSHEETML_NAMESPACE}}}col"
+R_ID = f"{{{OFFICE_RELATIONSHIPS_NAMESPACE}}}id"
+
+# Worksheet elements that can carry an r:id
+SHEET_RELATIONSHIP_ELEMENTS = frozenset(
+    f"{{{SPREADSHEETML_NAMESPACE}}}{name}"
+    for name in (
+        "hyperlink",
+        "drawing",
+        "legacyDrawing",
+        "legacyDrawingHF",
+        "drawingHF",
+        "picture",
+        "pageSetup",
+        "customPr",
+        "oleObject",
+        "objectPr",
+        "control",
+        "controlPr",
+        "tablePart",
+    )
+)
+
+
+class Violation(NamedTuple):
+    """A rule violation: the element's line and a description."""
+
+    line: int
+    message: str
+
+
+class LintRule:
+    """Base class for streaming lint rules.
+
+    Subclasses override start() and/or end(). start() sees an element's tag
+    and attributes; end() also sees its text. Open ancestors are always
+    available through elem.iterancestors(). Both return a message (or a list
+    of messages) for a violation, or None.
+
+    Attributes:
+        name: Key of the rule's violations in the lint() result
+        tags: Tags passed to start()/end(); None for every element
+        boundaries: Tags whose end allows everything before it to be dropped
+    """
+
+    name = None
+    tags = None
+    boundaries = frozenset()
+
+    def start(self, elem):
+        return None
+
+    def end(self, elem):
+        return None
+
+
+def _inside(elem, tag):
+    """Check whether elem has an open ancestor with the given tag."""
+    return next(elem.iterancestors(tag), None) is not None
+
+
+def _preview(text):
+    """Return a repr of text cut to 50 characters, as used in messages."""
+    return repr(text)[:50] + "..." if len(repr(text)) > 50 else repr(text)
+
+
+class WhitespacePreservationRule(LintRule):
+    """<w:t> with leading or trailing whitespace needs xml:space="preserve"."""
+
+    name = "whitespace"
+    tags = frozenset({W_T})
+    boundaries = frozenset({W_P})
+
+    def end(self, elem):
+        text = elem.text
+        if not text:
+            return None
+        if re.match(r"^\s.*", text) or re.match(r".*\s$", text):
+            if elem.get(XML_SPACE) != "preserve":
+                return (
+                    "w:t element with whitespace missing xml:space='preserve': "
+                    f"{_preview(text)}"
+                )
+        return None
+
+
+class TextInDeletionRule(LintRule):
+    """<w:t> must not appear inside <w:del> (deleted text uses <w:delText>)."""
+
+    name = "deletions"
+    tags = frozenset({W_T})
+    boundaries = frozenset({W_P})
+
+    def end(self, elem):
+        if elem.text and _inside(elem, W_DEL):
+            return f"<w:t> found within <w:del>: {_preview(elem.text)}"
+        return None
+
+
+class DelTextInInsertionRule(LintRule):
+    """<w:delText> inside <w:ins> is only allowed within a nested <w:del>."""
+
+    name = "insertions"
+    tags = frozenset({W_DEL_TEXT})
+    boundaries = frozenset({W_P})
+
+    def end(self, elem):
+        if _inside(elem, W_INS) and not _inside(elem, W_DEL):
+            return f"<w:delText> within <w:ins>: {_preview(elem.text or '')}"
+        return None
+
+
+class UUIDIdRule(LintRule):
+    """ID attributes that look like UUIDs must contain only hex digits."""
+
+    name = "uuid_ids"
+
+    # UUID pattern: 8-4-4-4-12 hex digits with optional braces/hyphens
+    UUID_PATTERN = re.compile(
+        r"^[\{\(]?[0-9A-Fa-f]{8}-?[0-9A-Fa-f]{4}-?[0-9A-Fa-f]{4}-?[0-9A-Fa-f]{4}-?[0-9A-Fa-f]{12}[\}\)]?$"
+    )
+
+    def start(self, elem):
+        messages = []
+        for attr, value in elem.attrib.items():
+            # Check if this is an ID attribute
+            attr_name = attr.split("}")[-1].lower()
+            if attr_name == "id" or attr_name.endswith("id"):
+                if looks_like_uuid(value) and not self.UUID_PATTERN.match(value):
+                    messages.append(
+                        f"ID '{value}' appears to be a UUID but contains invalid hex characters"
+                    )
+        return messages or None
+
+
+class ElementCountRule(LintRule):
+    """Count the elements with one tag; reports nothing."""
+
+    name = "count"
+
+    def __init__(self, tag):
+        self.tags = self.boundaries = frozenset({tag})
+        self.count = 0
+
+    def end(self, elem):
+        self.count += 1
+
+
+class SharedStringIndexRule(LintRule):
+    """Cells of type "s" must hold an index into the shared string table."""
+
+    name = "shared_strings"
+    tags = frozenset({S_C})
+    boundaries = frozenset({S_ROW})
+
+    def __init__(self, count):
+        self.count = count
+
+    def end(self, elem):
+        if elem.get("t") != "s":
+            return None
+        value = elem.findtext(S_V)
+        if value is None:
+            return None
+        try:
+            index = int(value)
+        except ValueError:
+            return (
+                f"Cell {elem.get('r', '?')}: shared string index '{value}' "
+                "is not a number"
+            )
+        if not 0 <= index < self.count:
+            return (
+                f"Cell {elem.get('r', '?')} references shared string {index}, "
+                f"but the table has {self.count} entries"
+            )
+        return None
+
+
+class StyleIndexRule(LintRule):
+    """Cell, row and column styles must index an existing <cellXfs> entry."""
+
+    name = "styles"
+    tags = frozenset({S_C, S_ROW, S_COL})
+    boundaries = frozenset({S_ROW})
+
+    def __init__(self, count):
+        self.count = count
+
+    def end(self, elem):
+        tag = elem.tag
+        value = elem.get("style" if tag == S_COL else "s")
+        if value is None:
+            return None
+        try:
+            if 0 <= int(value) < self.count:
+                return None
+        except ValueError:
+            pass
+        if tag == S_C:
+            where = f"Cell {elem.get('r', '?')}"
+        elif tag == S_ROW:
+            where = f"Row {elem.get('r', '?')}"
+        else:
+            where = f"Columns {elem.get('min', '?')}-{elem.get('max', '?')}"
+        return f"{where} uses style {value}, but <cellXfs> has {self.count} entries"
+
+
+class SheetRelationshipIdRule(LintRule):
+    """r:id attributes in a worksheet must name one of its relationships."""
+
+    name = "relationship_ids"
+    tags = SHEET_RELATIONSHIP_ELEMENTS
+    boundaries = frozenset({S_ROW})
+
+    def __init__(self, valid_ids):
+        self.valid_ids = valid_ids
+
+    def end(self, elem):
+        rid = elem.get(R_ID)
+        if rid and rid not in self.valid_ids:
+            return (
+                f"<{lxml.etree.QName(elem).localname}> references "
+                f"non-existent relationship '{rid}'"
+            )
+        return None
+
+
+def looks_like_uuid(value):
+    """Check if a value has the general structure of a UUID."""
+    # Remove common UUID delimiters
+    clean_value = value.strip("{}()").replace("-", "")
+    # Check if it's 32 hex-like characters (could include invalid hex chars)
+    return len(clean_value) == 32 and all(c.isalnum() for c in clean_value)
+
+
+def lint(source, rules):
+    """Run rules over an XML document in a single pass.
+
+    A file is streamed with iterparse and cleared at each boundary element
+    (every element if a rule needs them all), so memory stays bounded. An
+    already parsed tree is walked in place with iterwalk and left untouched.
+
+    Args:
+        source: File path, binary file object, or parsed lxml tree/element
+        rules: Iterable of LintRule instances
+
+    Returns:
+        dict: rule name -> list of Violation, in document order
+
+    Raises:
+        lxml.etree.XMLSyntaxError: If the document is not well-formed
+    """
+    rules = list(rules)
+    results = {rule.name: [] for rule in rules}
+
+    # Only report the tags some rule needs, unless one needs every element
+    if any(rule.tags is None for rule in rules):
+        reported = boundaries = None
+    else:
+        boundaries = set().union(*(rule.boundaries for rule in rules))
+        reported = sorted(set().union(*(rule.tags for rule in rules)) | boundaries)
+
+    start_hooks, end_hooks = _hooks(rules, "start"), _hooks(rules, "end")
+    # Start events are only worth their cost if some rule uses them
+    events = ("start", "end") if len(start_hooks) > 1 or start_hooks[None] else ("end",)
+
+    if isinstance(source, (lxml.etree._Element, lxml.etree._ElementTree)):
+        if events == ("end",):
+            # Elements of a built tree are complete when first seen, so plain
+            # iteration (in C, skipping boundary tags) can stand in for "end"
+            hooked = sorted(set(end_hooks) - {None}) if reported else ()
+            walk = (("end", elem) for elem in source.iter(*hooked))
+        else:
+            walk = lxml.etree.iterwalk(source, events=events, tag=reported)
+        clear = False
+    else:
+        walk = lxml.etree.iterparse(source, events=events, tag=reported)
+        clear = True
+
+    for event, elem in walk:
+        tag = elem.tag
+        by_tag = start_hooks if event == "start" else end_hooks
+
+        for name, hook in by_tag.get(tag) or by_tag[None]:
+            found = hook(elem)
+            if found:
+                for message in [found] if isinstance(found, str) else found:
+                    results[name].append(Violation(elem.sourceline, message))
+
+        if clear and event == "end" and (boundaries is None or tag in boundaries):
+            # Drop the finished subtree and already-processed siblings
+            elem.clear(keep_tail=True)
+            parent = elem.getparent()
+            if parent is not None:
+                while elem.getprevious() is not None:
+                    del parent[0]
+
+    return results
+
+
+def _hooks(rules, name):
+    """Map each tag to the (rule name, hook) pairs to call for it.
+
+    Key None holds the rules that want every element; they are also
+    included in each tag's list.
+    """
+    every = [
+        (rule.name, getattr(rule, name))
+        for rule in rules
+        if rule.tags is None and _overrides(rule, name)
+    ]
+    by_tag = {None: every}
+    for rule in rules:
+        if rule.tags is not None and _overrides(rule, name):
+            for tag in rule.tags:
+                by_tag.setdefault(tag, list(every)).append(
+                    (rule.name, getattr(rule, name))
+                )
+    return by_tag
+
+
+def _overrides(rule, name):
+    """Check whether a rule implements the start or end hook."""
+    return getattr(type(rule), name) is not getattr(LintRule, name)
@@ -0,0 +1,594 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for the Document library.
+
+Run with PYTHONPATH set to the docx skill root:
+    PYTHONPATH=/mnt/skills/docx python scripts/benchmark.py deletions [--count 5000]
+    PYTHONPATH=/mnt/skills/docx python scripts/benchmark.py edits [--count 2000]
+    PYTHONPATH=/mnt/skills/docx python scripts/benchmark.py editors [--size-mb 10]
+    PYTHONPATH=/mnt/skills/docx python scripts/benchmark.py reject [--count 5000]
+    PYTHONPATH=/mnt/skills/docx python scripts/benchmark.py session [--media-mb 200]
+    PYTHONPATH=/mnt/skills/docx python scripts/benchmark.py save [--count 20]
+    PYTHONPATH=/mnt/skills/docx python scripts/benchmark.py rpc [--steps 20]
+"""
+
+import argparse
+import multiprocessing
+import os
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from ooxml.scripts.pack import pack_document
+from ooxml.scripts.workspace import link_tree, sync_tree, write_atomic
+from scripts.document import LINKED_PARTS, Document, DocxXMLEditor
+from scripts.session import SessionClient
+from scripts.utilities import LxmlXMLEditor, XMLEditor
+
+EDITORS = {"minidom": XMLEditor, "lxml": LxmlXMLEditor}
+
+WORD_NAMESPACE = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Document library")
+    subparsers = parser.add_subparsers(dest="benchmark", required=True)
+
+    deletions_parser = subparsers.add_parser(
+        "deletions", help="Time suggest_deletion() over many runs"
+    )
+    deletions_parser.add_argument(
+        "--count",
+        type=int,
+        default=5000,
+        help="Number of suggested deletions (default: 5000)",
+    )
+
+    edits_parser = subparsers.add_parser(
+        "edits", help="Time one call per edit against a single apply_edits()"
+    )
+    edits_parser.add_argument(
+        "--count",
+        type=int,
+        default=2000,
+        help="Number of edits, half deletions and half insertions (default: 2000)",
+    )
+
+    editors_parser = subparsers.add_parser(
+        "editors", help="Memory and latency of the minidom and lxml editors"
+    )
+    editors_parser.add_argument(
+        "--size-mb",
+        type=float,
+        default=10,
+        help="Size of the synthetic document.xml in MB (default: 10)",
+    )
+
+    reject_parser = subparsers.add_parser(
+        "reject", help="Time revert_deletion() over a document of deletions"
+    )
+    reject_parser.add_argument(
+        "--count",
+        type=int,
+        default=5000,
+        help="Number of deletions to reject (default: 5000)",
+    )
+
+    session_parser = subparsers.add_parser(
+        "session", help="Time opening and saving a Document with embedded media"
+    )
+    session_parser.add_argument(
+        "--media-mb",
+        type=float,
+        default=200,
+        help="Total size of the embedded media in MB (default: 200)",
+    )
+
+    save_parser = subparsers.add_parser(
+        "save", help="Time saving a Document after small edits and after none"
+    )
+    save_parser.add_argument(
+        "--count",
+        type=int,
+        default=20,
+        help="Number of edit-and-save rounds (default: 20)",
+    )
+
+    rpc_parser = subparsers.add_parser(
+        "rpc", help="Time edit steps on a fresh Document against a session server"
+    )
+    rpc_parser.add_argument(
+        "--steps",
+        type=int,
+        default=20,
+        help="Number of edit steps, one suggested deletion each (default: 20)",
+    )
+
+    args = parser.parse_args()
+
+    match args.benchmark:
+        case "deletions":
+            benchmark_deletions(args.count)
+        case "edits":
+            benchmark_edits(args.count)
+        case "editors":
+            benchmark_editors(args.size_mb)
+        case "reject":
+            benchmark_reject(args.count)
+        case "session":
+            benchmark_session(args.media_mb)
+        case "save":
+            benchmark_save(args.count)
+        case "rpc":
+            benchmark_rpc(args.steps)
+
+
+def benchmark_deletions(count):
+    """Time suggesting the deletion of `count` runs, one per paragraph.
+
+    "before" allocates each change ID by rescanning every w:ins and w:del,
+    as DocxXMLEditor used to; "after" uses the editor's counter.
+    """
+    with tempfile.TemporaryDirectory() as temp_dir:
+        unpacked = Path(temp_dir) / "unpacked"
+        _write_unpacked_document(unpacked, count)
+
+        timings = {}
+        for label, allocate in (
+            ("before", _get_next_change_id_scan),
+            ("after", DocxXMLEditor._get_next_change_id),
+        ):
+            original = DocxXMLEditor._get_next_change_id
+            DocxXMLEditor._get_next_change_id = allocate
+            try:
+                doc = Document(unpacked)
+                editor = doc["word/document.xml"]
+                runs = list(editor.dom.getElementsByTagName("w:r"))
+                start = time.perf_counter()
+                for run in runs:
+                    editor.suggest_deletion(run)
+                timings[label] = time.perf_counter() - start
+            finally:
+                DocxXMLEditor._get_next_change_id = original
+
+            ids = [
+                elem.getAttribute("w:id")
+                for elem in editor.dom.getElementsByTagName("w:del")
+            ]
+            assert len(set(ids)) == count, f"{label}: duplicate change IDs"
+
+    print(f"{count} suggested deletions")
+    print(f"{'before':12} {timings['before']:8.3f} s")
+    print(f"{'after':12} {timings['after']:8.3f} s")
+    print(f"Speedup: {timings['before'] / timings['after']:.1f}x")
+
+
+def benchmark_edits(count):
+    """Time `count` selector-based edits applied one call at a time and as a batch.
+
+    Every other paragraph's run is deleted; the others get an insertion
+    after their run. Targets are found by their text, as a redlining
+    script would.
+    """
+    edits = []
+    for index in range(count):
+        selector = {"tag": "w:r", "contains": f"Paragraph {index} "}
+        if index % 2:
+            edits.append(
+                {
+                    "action": "insert_after",
+                    "elem": selector,
+                    "xml_content": "<w:ins><w:r><w:t>added</w:t></w:r></w:ins>",
+                }
+            )
+        else:
+            edits.append({"action": "suggest_deletion", "elem": selector})
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        unpacked = Path(temp_dir) / "unpacked"
+        _write_unpacked_document(unpacked, count)
+
+        doc = Document(unpacked)
+        editor = doc["word/document.xml"]
+        start = time.perf_counter()
+        for edit in edits:
+            arguments = dict(edit)
+            method = getattr(editor, arguments.pop("action"))
+            arguments["elem"] = editor.get_node(**arguments["elem"])
+            method(**arguments)
+        one_by_one = time.perf_counter() - start
+        expected = editor.dom.getElementsByTagName("w:body")[0].toxml()
+
+        doc = Document(unpacked)
+        editor = doc["word/document.xml"]
+        start = time.perf_counter()
+        doc.apply_edits(edits)
+        batch = time.perf_counter() - start
+        body = editor.dom.getElementsByTagName("w:body")[0]
+        assert len(body.toxml()) == len(expected), "batch result differs"
+
+    print(f"{count} edits")
+    print(f"{'one by one':12} {one_by_one:8.3f} s")
+    print(f"{'apply_edits':12} {batch:8.3f} s")
+    print(f"Speedup: {one_by_one / batch:.1f}x")
+
+
+def benchmark_editors(size_mb):
+    """Compare XMLEditor and LxmlXMLEditor on a synthetic document.xml.
+
+    Each editor runs in a fresh process so that its peak RSS is not hidden
+    by memory already held by an earlier run.
+    """
+    with tempfile.TemporaryDirectory() as temp_dir:
+        xml_file = Path(temp_dir) / "document.xml"
+        paragraphs = _write_document_xml(xml_file, int(size_mb * 1024 * 1024))
+
+        size = xml_file.stat().st_size
+        print(f"document.xml: {size / 1024 / 1024:.1f} MB, {paragraphs} paragraphs")
+        print(
+            f"{'editor':8} {'parse (s)':>10} {'100 lookups (s)':>16} "
+            f"{'save (s)':>9} {'peak RSS (MB)':>14}"
+        )
+
+        context = multiprocessing.get_context("spawn")
+        for name in EDITORS:
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+                parse_time, lookup_time, save_time, peak_rss = pool.submit(
+                    _time_editor, name, str(xml_file), paragraphs
+                ).result()
+            print(
+                f"{name:8} {parse_time:10.2f} {lookup_time:16.2f} "
+                f"{save_time:9.2f} {peak_rss / 1024:14.0f}"
+            )
+
+
+def benchmark_reject(count):
+    """Time rejecting `count` deletions by another author, one paragraph each.
+
+    "before" inserts each new w:ins as serialized XML, which is parsed again,
+    as revert_deletion used to; "after" inserts the built nodes directly.
+    """
+    with tempfile.TemporaryDirectory() as temp_dir:
+        unpacked = Path(temp_dir) / "unpacked"
+        _write_unpacked_document(unpacked, count, deleted=True)
+
+        timings = {}
+        for label, insert in (
+            ("before", _insert_nodes_after_reparsed),
+            ("after", DocxXMLEditor.insert_nodes_after),
+        ):
+            original = DocxXMLEditor.insert_nodes_after
+            DocxXMLEditor.insert_nodes_after = insert
+            try:
+                doc = Document(unpacked)
+                editor = doc["word/document.xml"]
+                body = editor.get_node(tag="w:body")
+                start = time.perf_counter()
+                editor.revert_deletion(body)
+                timings[label] = time.perf_counter() - start
+            finally:
+                DocxXMLEditor.insert_nodes_after = original
+            assert len(editor.dom.getElementsByTagName("w:ins")) == count
+
+    print(f"{count} deletions rejected")
+    print(f"{'before':12} {timings['before']:8.3f} s")
+    print(f"{'after':12} {timings['after']:8.3f} s")
+    print(f"Speedup: {timings['before'] / timings['after']:.1f}x")
+
+
+def benchmark_session(media_mb):
+    """Time the file work of opening and saving a Document.
+
+    "before" copies the unpacked directory into the workspace, packs it as
+    the validation baseline and copies it back, as Document used to;
+    "after" hard-links the XML parts of the workspace and the baseline,
+    copies the media, and saves back only the files that changed. Parsing
+    is the same for both
+    and is left out; "session" is a whole Document(...).save() for scale.
+    """
+    with tempfile.TemporaryDirectory() as temp_dir:
+        unpacked = Path(temp_dir) / "unpacked"
+        _write_unpacked_document(unpacked, 1000)
+        media_dir = unpacked / "word" / "media"
+        media_dir.mkdir()
+        chunk = 8 * 1024 * 1024
+        for index in range(max(1, int(media_mb * 1024 * 1024) // chunk)):
+            (media_dir / f"image{index + 1}.png").write_bytes(os.urandom(chunk))
+
+        timings = {}
+        for label, open_and_save in (
+            ("before", _open_and_save_copying),
+            ("after", _open_and_save_linking),
+        ):
+            workspace = Path(tempfile.mkdtemp(dir=temp_dir))
+            start = time.perf_counter()
+            open_and_save(unpacked, workspace)
+            timings[label] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        doc = Document(unpacked)
+        doc.save(validate=False)
+        timings["session"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        doc.original_docx
+        timings["baseline"] = time.perf_counter() - start
+
+    print(f"Session on a document with {media_mb:.0f} MB of media")
+    print(f"{'before':12} {timings['before']:8.3f} s")
+    print(f"{'after':12} {timings['after']:8.3f} s")
+    print(f"{'session':12} {timings['session']:8.3f} s")
+    print(f"{'baseline':12} {timings['baseline']:8.3f} s (packed on first validation)")
+    print(f"Speedup: {timings['before'] / timings['after']:.1f}x")
+
+
+def benchmark_save(count):
+    """Time Document.save() after a one-run edit, and again with no edit.
+
+    "before" serializes and writes every loaded part and copies the whole
+    tree back, as save() used to; "after" is save(), which only serializes
+    parts that were edited or handed out nodes (get_node, dom) and only
+    writes files that changed. Every round calls get_node, so document.xml
+    is still serialized on the unchanged save. Validation is left out.
+    """
+    with tempfile.TemporaryDirectory() as temp_dir:
+        unpacked = Path(temp_dir) / "unpacked"
+        _write_unpacked_document(unpacked, 20000)
+        doc = Document(unpacked)
+        # Comments make the typical set of loaded parts
+        paragraph = doc["word/document.xml"].get_node(
+            tag="w:p", contains="Paragraph 0 "
+        )
+        doc.add_comment(paragraph, paragraph, "Benchmark comment")
+        saved = Path(temp_dir) / "saved"
+        doc.save(saved, validate=False)
+
+        timings = {}
+        for label, save in (("before", _save_all), ("after", Document.save)):
+            editor = doc["word/document.xml"]
+            edited = idle = 0.0
+            for index in range(count):
+                # Paragraph 0 has the comment; each round edits a fresh paragraph
+                number = 1 + index + (count if label == "after" else 0)
+                run = editor.get_node(tag="w:r", contains=f"Paragraph {number} ")
+                editor.suggest_deletion(run)
+                start = time.perf_counter()
+                save(doc, saved, validate=False)
+                edited += time.perf_counter() - start
+
+                start = time.perf_counter()
+                save(doc, saved, validate=False)
+                idle += time.perf_counter() - start
+            timings[label] = (edited / count, idle / count)
+
+    print(f"{count} rounds of one suggested deletion and two saves")
+    print(f"{'':8} {'edited (ms)':>12} {'unchanged (ms)':>15}")
+    for label, (edited, idle) in timings.items():
+        print(f"{label:8} {edited * 1000:12.1f} {idle * 1000:15.1f}")
+
+
+def benchmark_rpc(steps):
+    """Time multi-step editing with and without the session server.
+
+    "before" opens a new Document for every step, edits and saves it, as
+    separate agent steps do; "after" sends each step's get_node and
+    suggest_deletion to a session server (scripts/session.py) holding the
+    Document open, and saves once at the end. Validation is left out.
+    """
+    with tempfile.TemporaryDirectory() as temp_dir:
+        unpacked = Path(temp_dir) / "unpacked"
+        _write_unpacked_document(unpacked, 20000)
+
+        start = time.perf_counter()
+        for step in range(steps):
+            doc = Document(unpacked)
+            editor = doc["word/document.xml"]
+            editor.suggest_deletion(
+                editor.get_node(tag="w:r", contains=f"Paragraph {step} ")
+            )
+            doc.save(validate=False)
+        before = (time.perf_counter() - start) / steps
+
+        socket_path = Path(temp_dir) / "session.sock"
+        server = subprocess.Popen(
+            [sys.executable, "-m", "scripts.session", "serve"]
+            + ["--socket", str(socket_path)],
+            cwd=Path(__file__).parent.parent,
+        )
+        try:
+            while not socket_path.exists():
+                time.sleep(0.01)
+            client = SessionClient(socket_path)
+            start = time.perf_counter()
+            session = client.call("open", unpacked_dir=str(unpacked))["session"]
+            opened = time.perf_counter() - start
+
+            start = time.perf_counter()
+            for step in range(steps, 2 * steps):
+                run = client.call(
+                    "get_node",
+                    session=session,
+                    tag="w:r",
+                    contains=f"Paragraph {step} ",
+                )
+                client.call("suggest_deletion", session=session, elem=run)
+            after = (time.perf_counter() - start) / steps
+
+            start = time.perf_counter()
+            client.call("save", session=session, validate=False)
+            saved = time.perf_counter() - start
+            client.close()
+        finally:
+            server.terminate()
+            server.wait()
+
+    print(f"{steps} edit steps on a document with 20000 paragraphs")
+    print(f"{'before':16} {before * 1000:10.1f} ms per step (open, edit, save)")
+    print(f"{'after':16} {after * 1000:10.1f} ms per step (two requests)")
+    print(f"{'session open':16} {opened * 1000:10.1f} ms once")
+    print(f"{'session save':16} {saved * 1000:10.1f} ms once")
+    print(f"Speedup per step: {before / after:.0f}x")
+
+
+def _save_all(doc, destination, validate=False):
+    """Previous Document.save(): write every loaded part, copy everything over."""
+    for editor in doc._editors.values():
+        write_atomic(editor.xml_path, editor.dom.toxml(encoding=editor.encoding))
+    # Copied file by file: copytree refuses files hard-linked to their copy
+    for path in doc.unpacked_path.rglob("*"):
+        if path.is_file():
+            target = destination / path.relative_to(doc.unpacked_path)
+            target.unlink(missing_ok=True)
+            shutil.copy2(path, target)
+
+
+def _open_and_save_copying(unpacked, workspace):
+    """Previous session file work: copy, pack the baseline, copy back."""
+    shutil.copytree(unpacked, workspace / "unpacked")
+    pack_document(unpacked, workspace / "original.docx", store_media=True)
+    shutil.copytree(workspace / "unpacked", unpacked, dirs_exist_ok=True)
+
+
+def _open_and_save_linking(unpacked, workspace):
+    """Current session file work: link the workspace and baseline, sync back."""
+    link_tree(unpacked, workspace / "unpacked", link=LINKED_PARTS)
+    link_tree(unpacked, workspace / "baseline", include=LINKED_PARTS)
+    sync_tree(workspace / "unpacked", unpacked)
+
+
+def _insert_nodes_after_reparsed(
+    editor, elem, nodes, _insert=DocxXMLEditor.insert_nodes_after
+):
+    """Previous node insertion: serialize the nodes and parse the XML again."""
+    xml_content = "".join(node.toxml() for node in nodes)
+    return _insert(editor, elem, editor._parse_fragment(xml_content))
+
+
+def _time_editor(name, xml_file, paragraphs):
+    """Parse, look up 100 paragraphs (by text and by line), edit and save.
+
+    Returns the three times and the peak RSS (KB).
+    """
+    start = time.perf_counter()
+    editor = EDITORS[name](xml_file)
+    parse_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    step = max(paragraphs // 50, 1)
+    for index in range(0, paragraphs, step)[:50]:
+        run = editor.get_node(tag="w:r", contains=f"Paragraph {index} ")
+        # Paragraph i starts on line i + 3 (see _write_document_xml)
+        editor.get_node(tag="w:p", line_number=index + 3)
+    editor.insert_after(run, "<w:r><w:t>added</w:t></w:r>")
+    lookup_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    editor.save()
+    save_time = time.perf_counter() - start
+
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return parse_time, lookup_time, save_time, peak_rss
+
+
+def _write_document_xml(path, target_size):
+    """Write a document.xml of about target_size bytes, one paragraph per line.
+
+    Returns:
+        int: Number of paragraphs written
+    """
+    paragraph = (
+        '<w:p w:rsidR="00A1B2C3"><w:pPr><w:pStyle w:val="Normal"/></w:pPr>'
+        '<w:r><w:rPr><w:b/></w:rPr><w:t xml:space="preserve">Paragraph {0} </w:t></w:r>'
+        "<w:r><w:t>with some body text</w:t></w:r></w:p>\n"
+    )
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            f'<w:document xmlns:w="{WORD_NAMESPACE}"><w:body>\n'
+        )
+        index = 0
+        while f.tell() < target_size:
+            f.write(paragraph.format(index))
+            index += 1
+        f.write("</w:body></w:document>")
+    return index
+
+
+def _get_next_change_id_scan(editor):
+    """Previous change ID allocation: one pass over all tracked changes per ID."""
+    max_id = -1
+    for tag in ("w:ins", "w:del"):
+        for elem in editor.dom.getElementsByTagName(tag):
+            change_id = elem.getAttribute("w:id")
+            if change_id:
+                try:
+                    max_id = max(max_id, int(change_id))
+                except ValueError:
+                    pass
+    return max_id + 1
+
+
+def _write_unpacked_document(directory, paragraphs, deleted=False):
+    """Write a minimal unpacked .docx with one run per paragraph.
+
+    With deleted=True each run is a deletion tracked by another author.
+    """
+    (directory / "_rels").mkdir(parents=True)
+    (directory / "word" / "_rels").mkdir(parents=True)
+    (directory / "[Content_Types].xml").write_text(
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/word/document.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+        '<Override PartName="/word/settings.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.settings+xml"/>'
+        "</Types>",
+        encoding="utf-8",
+    )
+    (directory / "_rels" / ".rels").write_text(
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="word/document.xml"/>'
+        "</Relationships>",
+        encoding="utf-8",
+    )
+    (directory / "word" / "_rels" / "document.xml.rels").write_text(
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/settings" Target="settings.xml"/>'
+        "</Relationships>",
+        encoding="utf-8",
+    )
+    (directory / "word" / "settings.xml").write_text(
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        f'<w:settings xmlns:w="{WORD_NAMESPACE}"><w:defaultTabStop w:val="720"/>'
+        "</w:settings>",
+        encoding="utf-8",
+    )
+    if deleted:
+        paragraph = (
+            '<w:p><w:del w:id="{0}" w:author="Reviewer" w:date="2024-01-01T00:00:00Z">'
+            '<w:r w:rsidDel="00A1B2C3"><w:rPr><w:rFonts w:ascii="Calibri" w:hAnsi="Calibri"/>'
+            '<w:b/><w:sz w:val="24"/></w:rPr>'
+            '<w:delText xml:space="preserve">Paragraph {0} </w:delText></w:r>'
+            "</w:del></w:p>\n"
+        )
+    else:
+        paragraph = (
+            '<w:p><w:r><w:t xml:space="preserve">Paragraph {0} </w:t></w:r></w:p>\n'
+        )
+    body = "".join(paragraph.format(index) for index in range(paragraphs))
+    (directory / "word" / "document.xml").write_text(
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        f'<w:document xmlns:w="{WORD_NAMESPACE}"><w:body>\n{body}</w:body></w:document>',
+        encoding="utf-8",
+    )
+
+
+if __name__ == "__main__":
+    main()
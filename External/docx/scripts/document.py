@@ -22,6 +22,12 @@ Usage:
     doc["word/document.xml"].revert_insertion(ins_node)  # Reject insertion
     doc["word/document.xml"].revert_deletion(del_node)  # Reject deletion
 
+    # Apply many edits at once (all or nothing)
+    doc.apply_edits([
+        {"action": "suggest_deletion", "elem": {"tag": "w:r", "contains": "old"}},
+        {"action": "add_comment", "start": node, "end": node, "text": "Why"},
+    ])
+
     # Save
     doc.save()
 """
@@ -30,6 +36,7 @@ import html
 import random
 import shutil
 import tempfile
+from contextlib import contextmanager
 from datetime import datetime, timezone
 from pathlib import Path
 
@@ -37,12 +44,37 @@ from defusedxml import minidom
 from ooxml.scripts.pack import pack_document
 from ooxml.scripts.validation.docx import DOCXSchemaValidator
 from ooxml.scripts.validation.redlining import RedliningValidator
+from ooxml.scripts.workspace import (
+    MANIFEST_NAME,
+    ensure_extracted,
+    link_tree,
+    sync_tree,
+)
 
-from .utilities import XMLEditor
+from .utilities import XMLEditor, _elements, _next_id
 
 # Path to template files
 TEMPLATE_DIR = Path(__file__).parent / "templates"
 
+# Files of a session's workspace that are hard-linked rather than copied: the
+# parts editors replace atomically, and the lazy workspace manifest
+LINKED_PARTS = ("*.xml", "*.rels", MANIFEST_NAME)
+
+# Methods that Document.apply_edits() accepts as actions, and their owner
+EDIT_ACTIONS = {
+    "suggest_deletion": "editor",
+    "revert_insertion": "editor",
+    "revert_deletion": "editor",
+    "replace_node": "editor",
+    "insert_after": "editor",
+    "insert_before": "editor",
+    "append_to": "editor",
+    "add_comment": "document",
+}
+
+# Edit arguments that name a node in word/document.xml
+NODE_ARGUMENTS = ("elem", "start", "end")
+
 
 class DocxXMLEditor(XMLEditor):
     """XMLEditor that automatically applies RSID, author, and date to new elements.
@@ -71,47 +103,86 @@ class DocxXMLEditor(XMLEditor):
         self.rsid = rsid
         self.author = author
         self.initials = initials
+        # Nodes awaiting attribute injection while inside _batch()
+        self._deferred = None
+
+    @contextmanager
+    def _batch(self):
+        """Defer attribute injection to a single pass when the block ends.
+
+        If the block raises, nothing is injected.
+        """
+        self._deferred = []
+        try:
+            yield
+            nodes = self._deferred
+        finally:
+            self._deferred = None
+        self._inject_attributes_to_nodes(nodes)
 
     def _get_next_change_id(self):
-        """Get the next available change ID by checking all tracked change elements."""
-        max_id = -1
+        """Allocate the next available change ID.
+
+        Tracked change elements are scanned once; after that the counter is
+        advanced by each allocation and by tracked changes inserted with
+        their own w:id.
+        """
+        if self._next_change_id is None:
+            self._next_change_id = _next_id(
+                elem.getAttribute("w:id")
+                for elem in self._tracked_changes([self._dom.documentElement])
+            )
+        change_id = self._next_change_id
+        self._next_change_id += 1
+        return change_id
+
+    @staticmethod
+    def _tracked_changes(nodes):
+        """Yield the w:ins and w:del elements among nodes and their descendants."""
         for tag in ("w:ins", "w:del"):
-            elements = self.dom.getElementsByTagName(tag)
-            for elem in elements:
-                change_id = elem.getAttribute("w:id")
-                if change_id:
-                    try:
-                        max_id = max(max_id, int(change_id))
-                    except ValueError:
-                        pass
-        return max_id + 1
+            yield from _elements(nodes, tag)
+
+    def _nodes_added(self, nodes, parent=None):
+        super()._nodes_added(nodes, parent)
+        if self._next_change_id is not None:
+            self._next_change_id = _next_id(
+                (elem.getAttribute("w:id") for elem in self._tracked_changes(nodes)),
+                start=self._next_change_id,
+            )
+
+    def _reset_counters(self):
+        super()._reset_counters()
+        self._next_change_id = None
 
     def _ensure_w16du_namespace(self):
         """Ensure w16du namespace is declared on the root element."""
-        root = self.dom.documentElement
+        root = self._dom.documentElement
         if not root.hasAttribute("xmlns:w16du"):  # type: ignore
             root.setAttribute(  # type: ignore
                 "xmlns:w16du",
                 "http://schemas.microsoft.com/office/word/2023/wordml/word16du",
             )
+            self._namespaces = None
 
     def _ensure_w16cex_namespace(self):
         """Ensure w16cex namespace is declared on the root element."""
-        root = self.dom.documentElement
+        root = self._dom.documentElement
         if not root.hasAttribute("xmlns:w16cex"):  # type: ignore
             root.setAttribute(  # type: ignore
                 "xmlns:w16cex",
                 "http://schemas.microsoft.com/office/word/2018/wordml/cex",
             )
+            self._namespaces = None
 
     def _ensure_w14_namespace(self):
         """Ensure w14 namespace is declared on the root element."""
-        root = self.dom.documentElement
+        root = self._dom.documentElement
         if not root.hasAttribute("xmlns:w14"):  # type: ignore
             root.setAttribute(  # type: ignore
                 "xmlns:w14",
                 "http://schemas.microsoft.com/office/word/2010/wordml",
             )
+            self._namespaces = None
 
     def _inject_attributes_to_nodes(self, nodes):
         """Inject RSID, author, and date attributes into DOM nodes where applicable.
@@ -124,10 +195,17 @@ class DocxXMLEditor(XMLEditor):
         - w:comment: gets w:author, w:date, w:initials
         - w16cex:commentExtensible: gets w16cex:dateUtc
 
+        Inside _batch() the nodes are only collected, and processed together
+        when the batch ends.
+
         Args:
             nodes: List of DOM nodes to process
         """
-        from datetime import datetime, timezone
+        # Every in-place edit (suggest_deletion, revert_insertion, ...) ends here
+        self._modified = True
+        if self._deferred is not None:
+            self._deferred.extend(nodes)
+            return
 
         timestamp = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
 
@@ -204,60 +282,50 @@ class DocxXMLEditor(XMLEditor):
                     if not elem.hasAttribute("xml:space"):
                         elem.setAttribute("xml:space", "preserve")
 
+        handlers = {
+            "w:p": add_rsid_to_p,
+            "w:r": add_rsid_to_r,
+            "w:t": add_xml_space_to_t,
+            "w:ins": add_tracked_change_attrs,
+            "w:del": add_tracked_change_attrs,
+            "w:comment": add_comment_attrs,
+            "w16cex:commentExtensible": add_comment_extensible_date,
+        }
+
+        # One walk over each node and its descendants
+        # (getElementsByTagName doesn't return the element itself)
         for node in nodes:
             if node.nodeType != node.ELEMENT_NODE:
                 continue
+            for elem in (node, *node.getElementsByTagName("*")):
+                handler = handlers.get(elem.tagName)
+                if handler is not None:
+                    handler(elem)
+
+        # Register the new attribute values with the get_node index
+        self._index.update(nodes)
 
-            # Handle the node itself
-            if node.tagName == "w:p":
-                add_rsid_to_p(node)
-            elif node.tagName == "w:r":
-                add_rsid_to_r(node)
-            elif node.tagName == "w:t":
-                add_xml_space_to_t(node)
-            elif node.tagName in ("w:ins", "w:del"):
-                add_tracked_change_attrs(node)
-            elif node.tagName == "w:comment":
-                add_comment_attrs(node)
-            elif node.tagName == "w16cex:commentExtensible":
-                add_comment_extensible_date(node)
-
-            # Process descendants (getElementsByTagName doesn't return the element itself)
-            for elem in node.getElementsByTagName("w:p"):
-                add_rsid_to_p(elem)
-            for elem in node.getElementsByTagName("w:r"):
-                add_rsid_to_r(elem)
-            for elem in node.getElementsByTagName("w:t"):
-                add_xml_space_to_t(elem)
-            for tag in ("w:ins", "w:del"):
-                for elem in node.getElementsByTagName(tag):
-                    add_tracked_change_attrs(elem)
-            for elem in node.getElementsByTagName("w:comment"):
-                add_comment_attrs(elem)
-            for elem in node.getElementsByTagName("w16cex:commentExtensible"):
-                add_comment_extensible_date(elem)
-
-    def replace_node(self, elem, new_content):
+    def replace_node_with_nodes(self, elem, nodes):
         """Replace node with automatic attribute injection."""
-        nodes = super().replace_node(elem, new_content)
+        nodes = super().replace_node_with_nodes(elem, nodes)
         self._inject_attributes_to_nodes(nodes)
         return nodes
 
-    def insert_after(self, elem, xml_content):
+    def insert_nodes_after(self, elem, nodes):
         """Insert after with automatic attribute injection."""
-        nodes = super().insert_after(elem, xml_content)
+        nodes = super().insert_nodes_after(elem, nodes)
         self._inject_attributes_to_nodes(nodes)
         return nodes
 
-    def insert_before(self, elem, xml_content):
+    def insert_nodes_before(self, elem, nodes):
         """Insert before with automatic attribute injection."""
-        nodes = super().insert_before(elem, xml_content)
+        nodes = super().insert_nodes_before(elem, nodes)
         self._inject_attributes_to_nodes(nodes)
         return nodes
 
-    def append_to(self, elem, xml_content):
+    def append_nodes_to(self, elem, nodes):
         """Append to with automatic attribute injection."""
-        nodes = super().append_to(elem, xml_content)
+        nodes = super().append_nodes_to(elem, nodes)
         self._inject_attributes_to_nodes(nodes)
         return nodes
 
@@ -306,7 +374,7 @@ class DocxXMLEditor(XMLEditor):
                 continue
 
             # Create deletion wrapper
-            del_wrapper = self.dom.createElement("w:del")
+            del_wrapper = self._dom.createElement("w:del")
 
             # Process each run
             for run in runs:
@@ -318,7 +386,7 @@ class DocxXMLEditor(XMLEditor):
                     run.setAttribute("w:rsidDel", self.rsid)
 
                 for t_elem in list(run.getElementsByTagName("w:t")):
-                    del_text = self.dom.createElement("w:delText")
+                    del_text = self._dom.createElement("w:delText")
                     # Copy ALL child nodes (not just firstChild) to handle entities
                     while t_elem.firstChild:
                         del_text.appendChild(t_elem.firstChild)
@@ -391,7 +459,7 @@ class DocxXMLEditor(XMLEditor):
                 continue
 
             # Create insertion wrapper
-            ins_elem = self.dom.createElement("w:ins")
+            ins_elem = self._dom.createElement("w:ins")
 
             for run in runs:
                 # Clone the run
@@ -399,7 +467,7 @@ class DocxXMLEditor(XMLEditor):
 
                 # Convert w:delText → w:t
                 for del_text in list(new_run.getElementsByTagName("w:delText")):
-                    t_elem = self.dom.createElement("w:t")
+                    t_elem = self._dom.createElement("w:t")
                     # Copy ALL child nodes (not just firstChild) to handle entities
                     while del_text.firstChild:
                         t_elem.appendChild(del_text.firstChild)
@@ -418,7 +486,7 @@ class DocxXMLEditor(XMLEditor):
                 ins_elem.appendChild(new_run)
 
             # Insert the new insertion after the deletion
-            nodes = self.insert_after(del_elem, ins_elem.toxml())
+            nodes = self.insert_nodes_after(del_elem, [ins_elem])
 
             # If processing a single w:del, track the created insertion
             if is_single_del and nodes:
@@ -502,7 +570,7 @@ class DocxXMLEditor(XMLEditor):
 
             # Convert w:t → w:delText
             for t_elem in list(elem.getElementsByTagName("w:t")):
-                del_text = self.dom.createElement("w:delText")
+                del_text = self._dom.createElement("w:delText")
                 # Copy ALL child nodes (not just firstChild) to handle entities
                 while t_elem.firstChild:
                     del_text.appendChild(t_elem.firstChild)
@@ -520,7 +588,7 @@ class DocxXMLEditor(XMLEditor):
                 elem.setAttribute("w:rsidDel", self.rsid)
 
             # Wrap in w:del
-            del_wrapper = self.dom.createElement("w:del")
+            del_wrapper = self._dom.createElement("w:del")
             parent = elem.parentNode
             parent.insertBefore(del_wrapper, elem)
             parent.removeChild(elem)
@@ -546,20 +614,20 @@ class DocxXMLEditor(XMLEditor):
                 rPr_list = pPr.getElementsByTagName("w:rPr")
 
                 if not rPr_list:
-                    rPr = self.dom.createElement("w:rPr")
+                    rPr = self._dom.createElement("w:rPr")
                     pPr.appendChild(rPr)
                 else:
                     rPr = rPr_list[0]
 
                 # Add <w:del/> marker
-                del_marker = self.dom.createElement("w:del")
+                del_marker = self._dom.createElement("w:del")
                 rPr.insertBefore(
                     del_marker, rPr.firstChild
                 ) if rPr.firstChild else rPr.appendChild(del_marker)
 
             # Convert w:t → w:delText in all runs
             for t_elem in list(elem.getElementsByTagName("w:t")):
-                del_text = self.dom.createElement("w:delText")
+                del_text = self._dom.createElement("w:delText")
                 # Copy ALL child nodes (not just firstChild) to handle entities
                 while t_elem.firstChild:
                     del_text.appendChild(t_elem.firstChild)
@@ -578,7 +646,7 @@ class DocxXMLEditor(XMLEditor):
                     run.setAttribute("w:rsidDel", self.rsid)
 
             # Wrap all non-pPr children in <w:del>
-            del_wrapper = self.dom.createElement("w:del")
+            del_wrapper = self._dom.createElement("w:del")
             for child in [c for c in elem.childNodes if c.nodeName != "w:pPr"]:
                 elem.removeChild(child)
                 del_wrapper.appendChild(child)
@@ -586,6 +654,8 @@ class DocxXMLEditor(XMLEditor):
 
             # Inject attributes to the deletion wrapper
             self._inject_attributes_to_nodes([del_wrapper])
+            # The w:pPr marker lies outside the wrapper
+            self._index.update([elem])
 
             return elem
 
@@ -593,6 +663,34 @@ class DocxXMLEditor(XMLEditor):
             raise ValueError(f"Element must be w:r or w:p, got {elem.nodeName}")
 
 
+def _edited_subtrees(kwargs):
+    """Return the elements whose subtrees an edit with these arguments changes.
+
+    Every edit action changes only the children of its node arguments'
+    parents. Subtrees inside another returned subtree are left out. The
+    nodes must be in the document (see Document._check_attached).
+    """
+    parents = []
+    for name in NODE_ARGUMENTS:
+        node = kwargs.get(name)
+        if node is None:
+            continue
+        parent = node.parentNode
+        if parent.nodeType != parent.ELEMENT_NODE:
+            parent = node  # The document element itself
+        if parent not in parents:
+            parents.append(parent)
+
+    subtrees = []
+    for parent in parents:
+        ancestor = parent.parentNode
+        while ancestor is not None and ancestor not in parents:
+            ancestor = ancestor.parentNode
+        if ancestor is None:
+            subtrees.append(parent)
+    return subtrees
+
+
 def _generate_hex_id() -> str:
     """Generate random 8-character hex ID for para/durable IDs.
 
@@ -636,14 +734,20 @@ class Document:
         if not self.original_path.exists() or not self.original_path.is_dir():
             raise ValueError(f"Directory not found: {unpacked_dir}")
 
-        # Create temporary directory with subdirectories for unpacked content and baseline
+        # Create temporary directory with subdirectories for unpacked content and baseline.
+        # XML parts are hard-linked to the original files (see link_tree), so opening
+        # a session copies little data; the editors only replace them, never rewrite
+        # them in place. Media and other files are copied, since callers may
+        # overwrite them in place (e.g. with shutil.copy).
         self.temp_dir = tempfile.mkdtemp(prefix="docx_")
         self.unpacked_path = Path(self.temp_dir) / "unpacked"
-        shutil.copytree(self.original_path, self.unpacked_path)
+        link_tree(self.original_path, self.unpacked_path, link=LINKED_PARTS)
 
-        # Pack original directory into temporary .docx for validation baseline (outside unpacked dir)
-        self.original_docx = Path(self.temp_dir) / "original.docx"
-        pack_document(self.original_path, self.original_docx, validate=False)
+        # Snapshot of the original XML parts for the validation baseline; it is
+        # only packed into original.docx when validation needs it
+        self._baseline_path = Path(self.temp_dir) / "baseline"
+        link_tree(self.original_path, self._baseline_path, include=LINKED_PARTS)
+        self._original_docx = None
 
         self.word_path = self.unpacked_path / "word"
 
@@ -664,6 +768,17 @@ class Document:
         self.comments_ids_path = self.word_path / "commentsIds.xml"
         self.comments_extensible_path = self.word_path / "commentsExtensible.xml"
 
+        # In a lazy workspace, extract the parts whose existence is checked
+        # directly so that parts present in the source are not recreated
+        for path in (
+            self.comments_path,
+            self.comments_extended_path,
+            self.comments_ids_path,
+            self.comments_extensible_path,
+            self.word_path / "people.xml",
+        ):
+            ensure_extracted(path)
+
         # Load existing comments and determine next ID (before setup modifies files)
         self.existing_comments = self._load_existing_comments()
         self.next_comment_id = self._get_next_comment_id()
@@ -701,7 +816,7 @@ class Document:
             comment = doc["word/comments.xml"].get_node(tag="w:comment", attrs={"w:id": "0"})
         """
         if xml_path not in self._editors:
-            file_path = self.unpacked_path / xml_path
+            file_path = ensure_extracted(self.unpacked_path / xml_path)
             if not file_path.exists():
                 raise ValueError(f"XML file not found: {xml_path}")
             # Use DocxXMLEditor with RSID, author, and initials for all editors
@@ -830,24 +945,135 @@ class Document:
         self.next_comment_id += 1
         return comment_id
 
+    def apply_edits(self, edits):
+        """
+        Apply a list of edits to word/document.xml as one transaction.
+
+        Every target node is looked up before anything changes. The edits are
+        then applied in order, and RSID, author and date attributes are added
+        in one pass at the end. Either all edits apply or none do: if one
+        fails, the document and comment parts are restored and the error is
+        raised. Nodes obtained before a failed call must be looked up again.
+
+        Each edit is a dict with an "action" (a method name from EDIT_ACTIONS)
+        and that method's arguments. Node arguments (elem, start, end) are
+        get_node() filters for word/document.xml, or DOM nodes.
+
+        Args:
+            edits: List of edit dicts
+
+        Returns:
+            list: What each edit's method returned, in order
+
+        Raises:
+            ValueError: If an action is unknown, a target is not found, a
+                target lies inside a node replaced by another edit, or a DOM
+                node target is no longer in the document
+
+        Example:
+            doc.apply_edits([
+                {"action": "suggest_deletion", "elem": {"tag": "w:r", "contains": "30 days"}},
+                {"action": "insert_after", "elem": {"tag": "w:r", "contains": "30 days"},
+                 "xml_content": '<w:ins><w:r><w:t>60 days</w:t></w:r></w:ins>'},
+                {"action": "add_comment", "start": {"tag": "w:p", "line_number": 42},
+                 "end": {"tag": "w:p", "line_number": 42}, "text": "Extended"},
+            ])
+        """
+        calls = [self._resolve_edit(number, edit) for number, edit in enumerate(edits)]
+        self._check_replaced_targets(calls)
+
+        # State to roll back to on failure. In document.xml only the subtrees
+        # each edit changes are copied, just before it runs.
+        root = self._document._dom.documentElement
+        root_attributes = dict(root.attributes.items())
+        journal = []
+        comment_parts = []
+        if any(edit["action"] == "add_comment" for edit in edits):
+            comment_parts = self._comment_parts()
+        loaded = set(self._editors)
+        snapshots = {
+            path: self._editors[path]._snapshot()
+            for path in comment_parts
+            if path in self._editors
+        }
+        created = [
+            self.unpacked_path / path
+            for path in comment_parts
+            if not (self.unpacked_path / path).exists()
+        ]
+        comment_state = (self.next_comment_id, dict(self.existing_comments))
+
+        results = []
+        try:
+            with self._document._batch():
+                for number, (method, kwargs) in enumerate(calls):
+                    self._check_attached(number, method, kwargs)
+                    for node in _edited_subtrees(kwargs):
+                        journal.append(self._document._snapshot(node))
+                    results.append(method(**kwargs))
+        except Exception:
+            for snapshot in reversed(journal):
+                self._document._restore(snapshot)
+            for name in list(root.attributes.keys()):
+                if name not in root_attributes:
+                    root.removeAttribute(name)
+            for name, value in root_attributes.items():
+                root.setAttribute(name, value)
+            self._document.invalidate_index()
+
+            for path in list(self._editors):
+                if path in snapshots:
+                    self._editors[path]._restore(snapshots[path])
+                elif path not in loaded:
+                    del self._editors[path]
+            for path in created:
+                path.unlink(missing_ok=True)
+            self.next_comment_id, self.existing_comments = comment_state
+            raise
+        return results
+
+    @property
+    def original_docx(self):
+        """Path of the original document packed as a .docx, the validation baseline.
+
+        Packed from the XML parts as they were when the session started, on
+        first access. Media is left out; validation never reads it.
+        """
+        if self._original_docx is None:
+            original_docx = Path(self.temp_dir) / "original.docx"
+            pack_document(self._baseline_path, original_docx, validate=False)
+            self._original_docx = original_docx
+        return self._original_docx
+
     def __del__(self):
         """Clean up temporary directory on deletion."""
         if hasattr(self, "temp_dir") and Path(self.temp_dir).exists():
             shutil.rmtree(self.temp_dir)
 
-    def validate(self) -> None:
+    def validate(self, jobs=1) -> None:
         """
         Validate the document against XSD schema and redlining rules.
 
+        Only parts changed since the session started (and their relationship
+        neighbours) are re-checked per part; unchanged parts cannot have
+        introduced new errors.
+
+        Args:
+            jobs: Number of worker processes for XSD validation (default: 1)
+
         Raises:
             ValueError: If validation fails.
         """
         # Create validators with current state
         schema_validator = DOCXSchemaValidator(
-            self.unpacked_path, self.original_docx, verbose=False
+            self.unpacked_path,
+            self.original_docx,
+            verbose=False,
+            jobs=jobs,
+            incremental=True,
         )
         redlining_validator = RedliningValidator(
-            self.unpacked_path, self.original_docx, verbose=False
+            self.unpacked_path, self.original_docx, verbose=False, author=self.author
         )
 
         # Run validations
@@ -871,7 +1097,7 @@ class Document:
             self._ensure_comment_relationships()
             self._ensure_comment_content_types()
 
-        # Save all modified XML files in temp directory
+        # Save the XML files that may have been modified (see XMLEditor.save)
         for editor in self._editors.values():
             editor.save()
 
@@ -879,27 +1105,103 @@ class Document:
         if validate:
             self.validate()
 
-        # Copy contents from temp directory to destination (or original directory)
+        # Copy changed files from temp directory to destination (or original directory);
+        # files that are still hard links to the destination's are skipped
         target_path = Path(destination) if destination else self.original_path
-        shutil.copytree(self.unpacked_path, target_path, dirs_exist_ok=True)
+        sync_tree(self.unpacked_path, target_path)
+
+    # ==================== Private: Batch Edits ====================
+
+    def _resolve_edit(self, number, edit):
+        """Turn an edit dict into a bound method and its arguments."""
+        edit = dict(edit)
+        action = edit.pop("action", None)
+        if action not in EDIT_ACTIONS:
+            raise ValueError(
+                f"Edit {number}: unknown action {action!r}. "
+                f"Expected one of: {', '.join(EDIT_ACTIONS)}"
+            )
+        owner = self if EDIT_ACTIONS[action] == "document" else self._document
+        for name in NODE_ARGUMENTS:
+            if isinstance(edit.get(name), dict):
+                try:
+                    edit[name] = self._document.get_node(**edit[name])
+                except ValueError as e:
+                    raise ValueError(f"Edit {number} ({action}): {e}") from e
+        return getattr(owner, action), edit
+
+    def _check_attached(self, number, method, kwargs):
+        """Reject an edit whose nodes are no longer in word/document.xml.
+
+        Nodes kept from before an earlier edit may have been removed by it,
+        e.g. by a rollback or by replacing one of their ancestors.
+        """
+        for name in NODE_ARGUMENTS:
+            node = kwargs.get(name)
+            if node is not None and not self._document._index.is_attached(node):
+                raise ValueError(
+                    f"Edit {number} ({method.__name__}): <{node.tagName}> given "
+                    f"as {name} is no longer in the document; look it up again"
+                )
+
+    @staticmethod
+    def _check_replaced_targets(calls):
+        """Reject edits whose target is removed by a replace_node edit."""
+        replaced = [
+            kwargs.get("elem")
+            for method, kwargs in calls
+            if method.__name__ == "replace_node"
+        ]
+        if not replaced:
+            return
+        if len(set(replaced)) < len(replaced):
+            raise ValueError("The same node is replaced by more than one edit")
+        replaced = set(replaced)
+
+        for number, (method, kwargs) in enumerate(calls):
+            for name in NODE_ARGUMENTS:
+                node = kwargs.get(name)
+                if node is None:
+                    continue
+                # A replace_node edit's own target is expected to be replaced
+                if method.__name__ == "replace_node" and name == "elem":
+                    node = node.parentNode
+                while node is not None:
+                    if node in replaced:
+                        raise ValueError(
+                            f"Edit {number} ({method.__name__}): target lies "
+                            f"inside <{node.tagName}> replaced by another edit"
+                        )
+                    node = node.parentNode
+
+    def _comment_parts(self):
+        """Return the names of the comment parts, relative to the package."""
+        return [
+            path.relative_to(self.unpacked_path).as_posix()
+            for path in (
+                self.comments_path,
+                self.comments_extended_path,
+                self.comments_ids_path,
+                self.comments_extensible_path,
+            )
+        ]
 
     # ==================== Private: Initialization ====================
 
     def _get_next_comment_id(self):
-        """Get the next available comment ID."""
+        """Get the next available comment ID.
+
+        Called once at load; add_comment() and reply_to_comment() advance
+        self.next_comment_id from there.
+        """
         if not self.comments_path.exists():
             return 0
 
         editor = self["word/comments.xml"]
-        max_id = -1
-        for comment_elem in editor.dom.getElementsByTagName("w:comment"):
-            comment_id = comment_elem.getAttribute("w:id")
-            if comment_id:
-                try:
-                    max_id = max(max_id, int(comment_id))
-                except ValueError:
-                    pass
-        return max_id + 1
+        return _next_id(
+            elem.getAttribute("w:id")
+            for elem in editor.dom.getElementsByTagName("w:comment")
+        )
 
     def _load_existing_comments(self):
         """Load existing comments from files to enable replies."""
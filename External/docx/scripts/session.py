@@ -0,0 +1,417 @@
+#!/usr/bin/env python3
+"""
+Long-running Document session server for multi-step editing.
+
+Opening a Document parses word/document.xml and sets up its workspace, which
+dominates the cost of a small edit. The session server keeps Documents open
+in one process, with their parsed DOMs and get_node indexes, and takes
+JSON-RPC 2.0 requests, one JSON object per line, over a Unix socket or over
+stdin/stdout. Each step of a multi-step edit is then one request.
+
+Nodes cannot travel over JSON, so they are returned as handles:
+{"handle": "n1", "tag": "w:r", "line": 42}. Anywhere a method takes a node
+it accepts a handle or a get_node() filter for word/document.xml. A JSON
+list [start, stop] as line_number means range(start, stop).
+
+Methods:
+    open(unpacked_dir, rsid=None, track_revisions=False, author="Claude",
+         initials="C")                    -> {"session": ..., "rsid": ...}
+    get_node(session, tag, attrs=None, line_number=None, contains=None,
+             part="word/document.xml")     -> node
+    to_xml(session, node, part="word/document.xml")  -> str
+    suggest_deletion, revert_insertion, revert_deletion, replace_node,
+    insert_after, insert_before, append_to, add_comment
+        (session, <arguments of the Document method>)
+                                           -> what the method returns
+    apply_edits(session, edits)            -> list of results
+    reply_to_comment(session, parent_comment_id, text)  -> int
+    save(session, destination=None, validate=True)      -> null
+    validate(session, jobs=1)              -> null
+    close(session)                         -> null
+
+Edits run through Document.apply_edits, so a failed edit leaves the document
+unchanged; handles taken before a failed edit must be looked up again. After
+each edit the handles of nodes no longer in the document are dropped, and a
+session keeps at most MAX_HANDLES handles, dropping the oldest first. Using a
+dropped handle is an error; look the node up again.
+Anything a method prints (validation reports) is returned in the error's
+data.output when it fails.
+
+Usage:
+    # Serve on a Unix socket (or over stdin/stdout without --socket)
+    PYTHONPATH=/mnt/skills/docx python -m scripts.session serve --socket /tmp/docx.sock
+
+    # One request from the shell
+    PYTHONPATH=/mnt/skills/docx python -m scripts.session call --socket /tmp/docx.sock \\
+        open '{"unpacked_dir": "unpacked"}'
+
+    # From Python
+    client = SessionClient("/tmp/docx.sock")
+    session = client.call("open", unpacked_dir="unpacked")["session"]
+    run = client.call("get_node", session=session, tag="w:r", contains="30 days")
+    client.call("suggest_deletion", session=session, elem=run)
+    client.call("save", session=session)
+"""
+
+import argparse
+import contextlib
+import inspect
+import io
+import json
+import socket
+import socketserver
+import sys
+import threading
+from pathlib import Path
+
+# JSON-RPC 2.0 error codes
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+SERVER_ERROR = -32000
+
+# Node handles kept per session; the oldest are dropped beyond this
+MAX_HANDLES = 10000
+
+
+class SessionError(Exception):
+    """Raised by SessionClient when the server returns an error."""
+
+    def __init__(self, message, code=SERVER_ERROR, data=None):
+        super().__init__(message)
+        self.code = code
+        self.data = data
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Document session server")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    serve_parser = subparsers.add_parser(
+        "serve", help="Serve requests on a Unix socket, or on stdin/stdout"
+    )
+    serve_parser.add_argument("--socket", help="Unix socket path to listen on")
+
+    call_parser = subparsers.add_parser(
+        "call", help="Send one request and print the result"
+    )
+    call_parser.add_argument(
+        "--socket", required=True, help="Unix socket of the server"
+    )
+    call_parser.add_argument("method", help="Method name, e.g. get_node")
+    call_parser.add_argument(
+        "params", nargs="?", default="{}", help="Parameters as a JSON object"
+    )
+
+    args = parser.parse_args()
+
+    match args.command:
+        case "serve":
+            server = SessionServer()
+            if args.socket:
+                server.serve_socket(args.socket)
+            else:
+                server.serve_stream(sys.stdin, sys.stdout)
+        case "call":
+            try:
+                result = SessionClient(args.socket).call(
+                    args.method, **json.loads(args.params)
+                )
+            except SessionError as e:
+                output = (e.data or {}).get("output")
+                sys.exit(f"Error: {e}" + (f"\n{output}" if output else ""))
+            print(json.dumps(result, indent=2))
+
+
+class SessionServer:
+    """Open Documents and the JSON-RPC methods that act on them.
+
+    Requests are handled one at a time: Documents are not thread-safe, so
+    concurrent connections take turns.
+    """
+
+    def __init__(self):
+        # Imported here so that clients, which only need this module's
+        # SessionClient, start without loading the Document library
+        from .document import EDIT_ACTIONS, NODE_ARGUMENTS, Document
+
+        self._document_class = Document
+        self._edit_actions = EDIT_ACTIONS
+        self._node_arguments = NODE_ARGUMENTS
+        self._sessions = {}
+        self._next_session = 1
+        self._lock = threading.Lock()
+
+    def serve_stream(self, reader, writer):
+        """Answer requests read line by line from reader until it closes."""
+        for line in reader:
+            if line.strip():
+                writer.write(json.dumps(self.handle(line)) + "\n")
+                writer.flush()
+
+    def serve_socket(self, path):
+        """Listen on the Unix socket at path until interrupted."""
+        path = Path(path)
+        path.unlink(missing_ok=True)
+        server = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                reader = io.TextIOWrapper(self.rfile, encoding="utf-8")
+                writer = io.TextIOWrapper(self.wfile, encoding="utf-8")
+                server.serve_stream(reader, writer)
+                # The handler closes the underlying files itself
+                reader.detach()
+                writer.detach()
+
+        with socketserver.ThreadingUnixStreamServer(str(path), Handler) as unix_server:
+            try:
+                unix_server.serve_forever()
+            except KeyboardInterrupt:
+                pass
+            finally:
+                path.unlink(missing_ok=True)
+
+    def handle(self, line):
+        """Answer one JSON-RPC request line; return the response object."""
+        try:
+            request = json.loads(line)
+        except json.JSONDecodeError as e:
+            return _error_response(None, PARSE_ERROR, f"Parse error: {e}")
+        if not isinstance(request, dict) or not isinstance(request.get("method"), str):
+            return _error_response(None, INVALID_REQUEST, "Invalid request")
+
+        request_id = request.get("id")
+        method = getattr(self, f"rpc_{request['method']}", None)
+        if method is None and request["method"] in self._edit_actions:
+            method = self._edit_method(request["method"])
+        if method is None:
+            return _error_response(
+                request_id, METHOD_NOT_FOUND, f"Unknown method: {request['method']}"
+            )
+        params = request.get("params", {})
+        if not isinstance(params, dict):
+            return _error_response(
+                request_id, INVALID_PARAMS, "params must be a JSON object"
+            )
+
+        try:
+            inspect.signature(method).bind(**params)
+        except TypeError as e:
+            return _error_response(request_id, INVALID_PARAMS, str(e))
+
+        # Documents print progress and validation reports; keep them off
+        # the protocol stream and return them with errors
+        output = io.StringIO()
+        try:
+            with self._lock, contextlib.redirect_stdout(output):
+                result = method(**params)
+        except Exception as e:
+            return _error_response(
+                request_id, SERVER_ERROR, str(e), {"output": output.getvalue()}
+            )
+        return {"jsonrpc": "2.0", "id": request_id, "result": result}
+
+    # ==================== RPC Methods ====================
+
+    def rpc_open(self, unpacked_dir, **options):
+        session_id = f"s{self._next_session}"
+        doc = self._document_class(unpacked_dir, **options)
+        self._next_session += 1
+        self._sessions[session_id] = _Session(doc)
+        return {"session": session_id, "rsid": doc.rsid}
+
+    def rpc_get_node(self, session, part="word/document.xml", **filters):
+        state = self._session(session)
+        node = state.doc[part].get_node(**_node_filter(filters))
+        return state.handle(node, part)
+
+    def rpc_to_xml(self, session, node, part="word/document.xml"):
+        return self._node(self._session(session), node, part).toxml()
+
+    def rpc_apply_edits(self, session, edits):
+        state = self._session(session)
+        edits = [self._edit(state, edit) for edit in edits]
+        try:
+            results = state.doc.apply_edits(edits)
+        finally:
+            state.prune()
+        return [state.result(result) for result in results]
+
+    def rpc_reply_to_comment(self, session, parent_comment_id, text):
+        return self._session(session).doc.reply_to_comment(parent_comment_id, text)
+
+    def rpc_save(self, session, destination=None, validate=True):
+        self._session(session).doc.save(destination, validate=validate)
+
+    def rpc_validate(self, session, jobs=1):
+        self._session(session).doc.validate(jobs=jobs)
+
+    def rpc_close(self, session):
+        self._session(session)
+        del self._sessions[session]
+
+    def _edit_method(self, action):
+        """Return the RPC method for one Document edit action."""
+
+        def edit(session, **arguments):
+            return self.rpc_apply_edits(session, [{"action": action, **arguments}])[0]
+
+        return edit
+
+    # ==================== Private: Helpers ====================
+
+    def _session(self, session):
+        if session not in self._sessions:
+            raise ValueError(f"Unknown session: {session}")
+        return self._sessions[session]
+
+    def _node(self, state, node, part="word/document.xml"):
+        """Turn a handle or get_node() filter into a DOM node."""
+        if isinstance(node, dict) and "handle" in node:
+            return state.node(node["handle"])
+        if isinstance(node, str):
+            return state.node(node)
+        return state.doc[part].get_node(**_node_filter(node))
+
+    def _edit(self, state, edit):
+        """Replace handles in an edit with nodes; leave filters to apply_edits."""
+        edit = dict(edit)
+        for name in self._node_arguments:
+            value = edit.get(name)
+            if isinstance(value, str) or (
+                isinstance(value, dict) and "handle" in value
+            ):
+                edit[name] = self._node(state, value)
+            elif isinstance(value, dict):
+                edit[name] = _node_filter(value)
+        return edit
+
+
+class _Session:
+    """An open Document and the node handles given out for it."""
+
+    def __init__(self, doc):
+        self.doc = doc
+        self._nodes = {}  # handle -> (part, node), oldest first
+        self._handles = {}  # (part, id(node)) -> handle
+        self._next_handle = 1
+
+    def handle(self, node, part="word/document.xml"):
+        """Return the JSON description of node, giving it a handle if new."""
+        key = (part, id(node))
+        if key not in self._handles:
+            handle = f"n{self._next_handle}"
+            self._next_handle += 1
+            self._nodes[handle] = (part, node)
+            self._handles[key] = handle
+            if len(self._nodes) > MAX_HANDLES:
+                self._drop(next(iter(self._nodes)))
+        position = getattr(node, "parse_position", (None,))
+        return {"handle": self._handles[key], "tag": node.tagName, "line": position[0]}
+
+    def node(self, handle):
+        if handle not in self._nodes:
+            raise ValueError(
+                f"Unknown node handle: {handle}. Handles are dropped when their "
+                f"node is removed or more than {MAX_HANDLES} are kept; look the "
+                "node up again"
+            )
+        node = self._nodes[handle][1]
+        if not _is_attached(node):
+            self._drop(handle)
+            raise ValueError(
+                f"Stale node handle: {handle} is no longer in the document; "
+                "look the node up again"
+            )
+        return node
+
+    def prune(self):
+        """Drop the handles of nodes that are no longer in their document."""
+        for handle, (part, node) in list(self._nodes.items()):
+            if not _is_attached(node):
+                self._drop(handle)
+
+    def _drop(self, handle):
+        part, node = self._nodes.pop(handle)
+        del self._handles[(part, id(node))]
+
+    def result(self, value):
+        """Make a Document method's return value JSON-serializable."""
+        if isinstance(value, list):
+            return [self.result(item) for item in value]
+        if hasattr(value, "nodeType"):
+            return self.handle(value)
+        return value
+
+
+class SessionClient:
+    """Client for a session server listening on a Unix socket.
+
+    The connection is opened on first use and kept for later calls.
+    """
+
+    def __init__(self, path):
+        self.path = str(path)
+        self._socket = None
+        self._file = None
+        self._next_id = 1
+
+    def call(self, method, **params):
+        """Call method on the server and return its result.
+
+        Raises:
+            SessionError: If the server returns an error
+        """
+        if self._socket is None:
+            self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self._socket.connect(self.path)
+            self._file = self._socket.makefile("rw", encoding="utf-8")
+
+        request = {
+            "jsonrpc": "2.0",
+            "id": self._next_id,
+            "method": method,
+            "params": params,
+        }
+        self._next_id += 1
+        self._file.write(json.dumps(request) + "\n")
+        self._file.flush()
+        response = json.loads(self._file.readline())
+        if "error" in response:
+            error = response["error"]
+            raise SessionError(error["message"], error["code"], error.get("data"))
+        return response["result"]
+
+    def close(self):
+        if self._socket is not None:
+            self._file.close()
+            self._socket.close()
+            self._socket = self._file = None
+
+
+def _node_filter(filters):
+    """Turn a JSON get_node() filter into get_node() arguments."""
+    filters = dict(filters)
+    if isinstance(filters.get("line_number"), list):
+        filters["line_number"] = range(*filters["line_number"])
+    return filters
+
+
+def _is_attached(node):
+    """Check whether node is still part of its document."""
+    while node.parentNode is not None:
+        node = node.parentNode
+    return node.nodeType == node.DOCUMENT_NODE
+
+
+def _error_response(request_id, code, message, data=None):
+    error = {"code": code, "message": message}
+    if data is not None:
+        error["data"] = data
+    return {"jsonrpc": "2.0", "id": request_id, "error": error}
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+XML formatting backends used by pack.py and unpack.py.
+
+A backend turns the XML bytes of one package part into either a
+pretty-printed form for editing (unpack) or a condensed form for the final
+Office file (pack). Text of "t" elements (w:t, a:t, ...) is never touched,
+so whitespace that belongs to document text survives a round trip.
+
+Example usage:
+    formatter = get_formatter()           # default backend (lxml)
+    formatter = get_formatter("minidom")  # previous minidom implementation
+
+    pretty = formatter.pretty(content)
+    condensed = formatter.condense(content)
+"""
+
+import defusedxml.minidom
+import lxml.etree
+
+DEFAULT_FORMATTER = "lxml"
+
+
+class MinidomFormatter:
+    """Formatting backend built on defusedxml.minidom."""
+
+    name = "minidom"
+
+    def pretty(self, content):
+        """Pretty-print XML bytes with two-space indentation, ASCII encoded."""
+        dom = defusedxml.minidom.parseString(content)
+        return dom.toprettyxml(indent="  ", encoding="ascii")
+
+    def condense(self, content):
+        """Strip whitespace-only text nodes and comments, UTF-8 encoded."""
+        dom = defusedxml.minidom.parseString(content)
+
+        # Process each element to remove whitespace and comments
+        for element in dom.getElementsByTagName("*"):
+            # Skip w:t elements and their processing
+            if element.tagName.endswith(":t"):
+                continue
+
+            # Remove whitespace-only text nodes and comment nodes
+            for child in list(element.childNodes):
+                if (
+                    child.nodeType == child.TEXT_NODE
+                    and child.nodeValue
+                    and child.nodeValue.strip() == ""
+                ) or child.nodeType == child.COMMENT_NODE:
+                    element.removeChild(child)
+
+        return dom.toxml(encoding="UTF-8")
+
+
+class LxmlFormatter:
+    """Formatting backend built on lxml.
+
+    lxml trees take a fraction of the memory of minidom trees and parsing and
+    serialization run in C, which matters for multi-MB parts such as
+    document.xml or sharedStrings.xml. The parser is configured like
+    defusedxml: no entity expansion and no network access.
+    """
+
+    name = "lxml"
+
+    def _parse(self, content):
+        parser = lxml.etree.XMLParser(
+            resolve_entities=False, no_network=True, huge_tree=True
+        )
+        return lxml.etree.fromstring(content, parser=parser).getroottree()
+
+    def pretty(self, content):
+        """Pretty-print XML bytes with two-space indentation, ASCII encoded.
+
+        lxml.etree.indent only rewrites whitespace between elements; the text
+        of leaf elements such as <w:t> is left exactly as it was.
+        """
+        tree = self._parse(content)
+        lxml.etree.indent(tree, space="  ")
+        body = lxml.etree.tostring(tree, encoding="ascii", xml_declaration=False)
+        return b'<?xml version="1.0" encoding="ascii"?>\n' + body + b"\n"
+
+    def condense(self, content):
+        """Strip whitespace-only text and comments, UTF-8 encoded."""
+        tree = self._parse(content)
+        root = tree.getroot()
+
+        # Remove comments, keeping any text that follows them
+        for comment in list(root.iter(lxml.etree.Comment)):
+            _remove_preserving_tail(comment)
+
+        for element in root.iter(tag=lxml.etree.Element):
+            # Skip <*:t> elements: their whitespace is document content
+            if element.tag == "t" or element.tag.endswith("}t"):
+                continue
+
+            # Whitespace-only text of this element and tails of its children
+            if element.text and not element.text.strip():
+                element.text = None
+            for child in element:
+                if child.tail and not child.tail.strip():
+                    child.tail = None
+
+        body = lxml.etree.tostring(tree, encoding="UTF-8", xml_declaration=False)
+        return b'<?xml version="1.0" encoding="UTF-8"?>' + body
+
+
+def _remove_preserving_tail(node):
+    """Remove an lxml node, moving its tail text to the preceding node."""
+    parent = node.getparent()
+    if node.tail:
+        previous = node.getprevious()
+        if previous is not None:
+            previous.tail = (previous.tail or "") + node.tail
+        else:
+            parent.text = (parent.text or "") + node.tail
+    parent.remove(node)
+
+
+FORMATTERS = {
+    LxmlFormatter.name: LxmlFormatter,
+    MinidomFormatter.name: MinidomFormatter,
+}
+
+
+def get_formatter(name=None):
+    """Return an instance of the named formatting backend (default: lxml).
+
+    Raises:
+        ValueError: If no backend with that name exists
+    """
+    name = name or DEFAULT_FORMATTER
+    if name not in FORMATTERS:
+        raise ValueError(
+            f"Unknown XML formatter '{name}' (choose from {', '.join(FORMATTERS)})"
+        )
+    return FORMATTERS[name]()
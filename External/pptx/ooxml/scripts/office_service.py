@@ -0,0 +1,434 @@
+#!/usr/bin/env python3
+"""
+Long-lived headless LibreOffice service for conversions and recalculation.
+
+Starting LibreOffice takes several seconds, so instead of running
+`soffice --convert-to` for every job, one headless instance is started on a
+local UNO socket with its own profile and left running. Later calls, from
+this or any other process, connect to the same instance. The instance is
+health-checked before use and restarted if it has crashed or hangs.
+
+Talking to LibreOffice requires its Python UNO bindings (`import uno`, e.g.
+the python3-uno package). Without them, convert_document() falls back to a
+one-shot `soffice --headless --convert-to` process per call.
+
+Example usage:
+    python office_service.py start     # optional: pre-start the instance
+    python office_service.py status
+    python office_service.py stop
+
+    output = convert_document("deck.pptx", "out", "pdf", timeout=60)
+    recalculate("model.xlsx", timeout=30)
+"""
+
+import argparse
+import fcntl
+import json
+import os
+import shutil
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+try:
+    import uno
+    from com.sun.star.beans import PropertyValue
+except ImportError:
+    uno = None
+
+# Seconds to wait for a freshly started instance to accept connections
+STARTUP_TIMEOUT = 30
+
+# PDF export filters by document type (the CLI picks these from "pdf")
+PDF_FILTERS = {
+    "com.sun.star.presentation.PresentationDocument": "impress_pdf_Export",
+    "com.sun.star.sheet.SpreadsheetDocument": "calc_pdf_Export",
+    "com.sun.star.drawing.DrawingDocument": "draw_pdf_Export",
+    "com.sun.star.text.TextDocument": "writer_pdf_Export",
+}
+
+
+class OfficeServiceError(Exception):
+    """Raised when LibreOffice fails to run a job."""
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Manage the shared headless LibreOffice instance"
+    )
+    parser.add_argument("command", choices=["start", "stop", "status"])
+    args = parser.parse_args()
+
+    if uno is None:
+        sys.exit("Error: LibreOffice Python bindings (uno) are not installed")
+
+    service = OfficeService()
+    match args.command:
+        case "start":
+            service.ensure_running()
+            print(f"LibreOffice running (pid {service.pid}, port {service.port})")
+        case "stop":
+            service.stop()
+            print("LibreOffice stopped")
+        case "status":
+            if service.is_healthy():
+                print(f"LibreOffice running (pid {service.pid}, port {service.port})")
+            else:
+                print("LibreOffice not running")
+                sys.exit(1)
+
+
+class OfficeService:
+    """Handle to the shared headless LibreOffice instance.
+
+    The instance's pid, start time and port are kept in a state file under
+    state_dir so that separate processes (pack.py, thumbnail.py, recalc.py,
+    ...) reuse one instance. A file lock serializes starting and stopping
+    it. The start time guards against pid reuse: a process with the stored
+    pid that started at another time (e.g. after a reboot) is not ours and
+    is never signalled.
+    """
+
+    def __init__(self, state_dir=None):
+        if uno is None:
+            raise OfficeServiceError("LibreOffice Python bindings (uno) not found")
+        self.state_dir = Path(
+            state_dir
+            or Path(tempfile.gettempdir()) / f"office-service-{os.getuid()}"
+        )
+        self.state_dir.mkdir(parents=True, exist_ok=True)
+        self.state_file = self.state_dir / "service.json"
+        self.lock_file = self.state_dir / "service.lock"
+        self.profile_dir = self.state_dir / "profile"
+        self.pid = None
+        self.port = None
+        self.started = None
+        self._load_state()
+
+    def _load_state(self):
+        try:
+            state = json.loads(self.state_file.read_text())
+            self.pid, self.port = state["pid"], state["port"]
+            self.started = state["started"]
+        except (OSError, ValueError, KeyError):
+            self.pid = self.port = self.started = None
+
+    def _lock(self):
+        lock = open(self.lock_file, "w")
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        return lock
+
+    def _connect(self):
+        """Return the instance's Desktop, or raise if it does not answer."""
+        local_context = uno.getComponentContext()
+        resolver = local_context.ServiceManager.createInstanceWithContext(
+            "com.sun.star.bridge.UnoUrlResolver", local_context
+        )
+        context = resolver.resolve(
+            f"uno:socket,host=127.0.0.1,port={self.port};urp;"
+            "StarOffice.ComponentContext"
+        )
+        return context.ServiceManager.createInstanceWithContext(
+            "com.sun.star.frame.Desktop", context
+        )
+
+    def _process_alive(self):
+        """Check that the recorded process is still the instance we started."""
+        if not self.pid or self.started is None:
+            return False
+        return _process_start_time(self.pid) == self.started
+
+    def is_healthy(self):
+        """Check that the instance is running and answers over UNO."""
+        self._load_state()
+        if not self._process_alive():
+            return False
+        try:
+            self._connect()
+            return True
+        except Exception:
+            return False
+
+    def ensure_running(self):
+        """Start the instance unless a healthy one is already running."""
+        if self.is_healthy():
+            return
+        with self._lock():
+            # Another process may have started it while we waited
+            if self.is_healthy():
+                return
+            self._kill()
+            self._start()
+
+    def _start(self):
+        soffice = shutil.which("soffice")
+        if soffice is None:
+            raise FileNotFoundError("soffice not found")
+
+        # Let the OS pick a free port
+        with socket.socket() as s:
+            s.bind(("127.0.0.1", 0))
+            port = s.getsockname()[1]
+
+        process = subprocess.Popen(
+            [
+                soffice,
+                "--headless",
+                "--invisible",
+                "--nologo",
+                "--nodefault",
+                "--norestore",
+                "--nolockcheck",
+                f"-env:UserInstallation={self.profile_dir.absolute().as_uri()}",
+                f"--accept=socket,host=127.0.0.1,port={port};urp;"
+                "StarOffice.ComponentContext",
+            ],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            # Outlive the process that started it
+            start_new_session=True,
+        )
+        self.pid, self.port = process.pid, port
+        self.started = _process_start_time(process.pid)
+
+        deadline = time.monotonic() + STARTUP_TIMEOUT
+        while time.monotonic() < deadline:
+            if process.poll() is not None:
+                raise OfficeServiceError(
+                    f"LibreOffice exited during startup (code {process.returncode})"
+                )
+            try:
+                self._connect()
+                break
+            except Exception:
+                time.sleep(0.25)
+        else:
+            self._kill()
+            raise OfficeServiceError("LibreOffice did not start in time")
+
+        self.state_file.write_text(
+            json.dumps({"pid": self.pid, "port": self.port, "started": self.started})
+        )
+
+    def _kill(self):
+        if self._process_alive():
+            try:
+                os.killpg(self.pid, signal.SIGKILL)
+            except (ProcessLookupError, PermissionError):
+                pass
+        self.state_file.unlink(missing_ok=True)
+        self.pid = self.port = self.started = None
+
+    def stop(self):
+        """Shut the instance down."""
+        with self._lock():
+            self._load_state()
+            if self._process_alive():
+                try:
+                    self._connect().terminate()
+                except Exception:
+                    pass
+            self._kill()
+
+    def restart(self):
+        """Replace the instance with a fresh one."""
+        with self._lock():
+            self._kill()
+            self._start()
+
+    def run(self, job, timeout=None):
+        """Run job(desktop) on the instance and return its result.
+
+        A job that hangs past `timeout` seconds kills the instance. A job that
+        fails because the instance died is retried once on a fresh one.
+
+        Raises:
+            TimeoutError: If the job did not finish within `timeout`
+            OfficeServiceError: If the job failed
+        """
+        for attempt in range(2):
+            self.ensure_running()
+            try:
+                return self._run_with_timeout(job, timeout)
+            except TimeoutError:
+                self.restart()
+                raise
+            except OfficeServiceError:
+                raise
+            except Exception as e:
+                # Connection errors after a crash surface as UNO exceptions
+                if attempt == 0 and not self.is_healthy():
+                    self.restart()
+                    continue
+                raise OfficeServiceError(str(e)) from e
+
+    def _run_with_timeout(self, job, timeout):
+        result = {}
+
+        def target():
+            try:
+                result["value"] = job(self._connect())
+            except BaseException as e:
+                result["error"] = e
+
+        thread = threading.Thread(target=target, daemon=True)
+        thread.start()
+        thread.join(timeout)
+        if thread.is_alive():
+            raise TimeoutError(f"LibreOffice job timed out after {timeout}s")
+        if "error" in result:
+            raise result["error"]
+        return result["value"]
+
+    def convert(self, input_path, outdir, convert_to, timeout=None):
+        """Convert a document like `soffice --convert-to`; return the output path.
+
+        Args:
+            input_path: Document to convert
+            outdir: Directory for the output, named <input stem>.<extension>
+            convert_to: "<extension>[:<filter name>]", e.g. "pdf" or "html:HTML"
+        """
+        extension, _, filter_name = convert_to.partition(":")
+        input_path = Path(input_path).absolute()
+        output_path = Path(outdir).absolute() / f"{input_path.stem}.{extension}"
+
+        def job(desktop):
+            document = _load(desktop, input_path)
+            try:
+                name = filter_name or _default_filter(document, extension)
+                document.storeToURL(
+                    output_path.as_uri(), (_property("FilterName", name),)
+                )
+            finally:
+                document.close(True)
+
+        self.run(job, timeout)
+        if not output_path.exists():
+            raise OfficeServiceError(f"Conversion of {input_path.name} failed")
+        return output_path
+
+    def recalculate(self, path, timeout=None):
+        """Recalculate all formulas of a spreadsheet and save it in place."""
+        path = Path(path).absolute()
+
+        def job(desktop):
+            document = _load(desktop, path)
+            try:
+                document.calculateAll()
+                document.store()
+            finally:
+                document.close(True)
+
+        self.run(job, timeout)
+
+
+def _process_start_time(pid):
+    """Return when process `pid` started, as an opaque string, or None if gone.
+
+    Read from /proc on Linux (clock ticks since boot) and from ps elsewhere.
+    """
+    try:
+        # starttime is field 22; fields after the ")" of the name start at 3
+        stat = Path(f"/proc/{pid}/stat").read_text()
+        return stat.rpartition(")")[2].split()[19]
+    except OSError:
+        if Path("/proc/self/stat").exists():
+            return None  # /proc works, so the process is gone
+    try:
+        result = subprocess.run(
+            ["ps", "-o", "lstart=", "-p", str(pid)], capture_output=True, text=True
+        )
+    except OSError:
+        return None
+    return result.stdout.strip() or None
+
+
+def _property(name, value):
+    prop = PropertyValue()
+    prop.Name, prop.Value = name, value
+    return prop
+
+
+def _load(desktop, path):
+    document = desktop.loadComponentFromURL(
+        path.as_uri(), "_blank", 0, (_property("Hidden", True),)
+    )
+    if document is None:
+        raise OfficeServiceError(f"LibreOffice could not open {path.name}")
+    return document
+
+
+def _default_filter(document, extension):
+    if extension == "pdf":
+        for service, filter_name in PDF_FILTERS.items():
+            if document.supportsService(service):
+                return filter_name
+    raise OfficeServiceError(f"No default export filter for '{extension}'")
+
+
+def service_available():
+    """Check whether the shared instance can be used (uno and soffice present)."""
+    return uno is not None and shutil.which("soffice") is not None
+
+
+def convert_document(input_path, outdir, convert_to, timeout=None):
+    """Convert a document with LibreOffice and return the output path.
+
+    Uses the shared instance when available and a one-shot soffice process
+    otherwise.
+
+    Raises:
+        FileNotFoundError: If soffice is not installed
+        TimeoutError: If the conversion did not finish within `timeout`
+        OfficeServiceError: If the conversion failed
+    """
+    if service_available():
+        return OfficeService().convert(input_path, outdir, convert_to, timeout)
+
+    input_path = Path(input_path)
+    extension = convert_to.partition(":")[0]
+    output_path = Path(outdir) / f"{input_path.stem}.{extension}"
+    try:
+        result = subprocess.run(
+            [
+                "soffice",
+                "--headless",
+                "--convert-to",
+                convert_to,
+                "--outdir",
+                str(outdir),
+                str(input_path),
+            ],
+            capture_output=True,
+            timeout=timeout,
+            text=True,
+        )
+    except subprocess.TimeoutExpired as e:
+        raise TimeoutError(f"soffice timed out after {timeout}s") from e
+    if result.returncode != 0 or not output_path.exists():
+        raise OfficeServiceError(
+            result.stderr.strip() or f"Conversion of {input_path.name} failed"
+        )
+    return output_path
+
+
+def recalculate(path, timeout=None):
+    """Recalculate and save a spreadsheet on the shared instance.
+
+    Raises:
+        OfficeServiceError: If the service is unavailable or the job failed
+        TimeoutError: If recalculation did not finish within `timeout`
+    """
+    if not service_available():
+        raise OfficeServiceError("LibreOffice service not available")
+    OfficeService().recalculate(path, timeout)
+
+
+if __name__ == "__main__":
+    main()
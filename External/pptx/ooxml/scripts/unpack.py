@@ -1,29 +1,174 @@
 #!/usr/bin/env python3
-"""Unpack and format XML contents of Office files (.docx, .pptx, .xlsx)"""
+"""
+Unpack and format XML contents of Office files (.docx, .pptx, .xlsx)
 
+Example usage:
+    python unpack.py <office_file> <output_dir> [-j JOBS] [--skip-format PATTERN]
+    python unpack.py <office_file> <output_dir> --lazy
+"""
+
+import argparse
+import fnmatch
 import random
+import shutil
 import sys
-import defusedxml.minidom
 import zipfile
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
-# Get command line arguments
-assert len(sys.argv) == 3, "Usage: python unpack.py <office_file> <output_dir>"
-input_file, output_dir = sys.argv[1], sys.argv[2]
-
-# Extract and format
-output_path = Path(output_dir)
-output_path.mkdir(parents=True, exist_ok=True)
-zipfile.ZipFile(input_file).extractall(output_path)
-
-# Pretty print all XML files
-xml_files = list(output_path.rglob("*.xml")) + list(output_path.rglob("*.rels"))
-for xml_file in xml_files:
-    content = xml_file.read_text(encoding="utf-8")
-    dom = defusedxml.minidom.parseString(content)
-    xml_file.write_bytes(dom.toprettyxml(indent="  ", encoding="ascii"))
-
-# For .docx files, suggest an RSID for tracked changes
-if input_file.endswith(".docx"):
-    suggested_rsid = "".join(random.choices("0123456789ABCDEF", k=8))
-    print(f"Suggested RSID for edit session: {suggested_rsid}")
+try:
+    from .formatting import FORMATTERS, get_formatter
+    from .workspace import LazyPackage, member_path
+except ImportError:  # Run as a script from this directory
+    from formatting import FORMATTERS, get_formatter
+    from workspace import LazyPackage, member_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Unpack an Office file")
+    parser.add_argument("office_file", help="Office file (.docx/.pptx/.xlsx)")
+    parser.add_argument("output_dir", help="Directory to unpack into")
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of worker processes for extraction and formatting (default: 1)",
+    )
+    parser.add_argument(
+        "--skip-format",
+        action="append",
+        default=[],
+        metavar="PATTERN",
+        help="Glob of parts to extract without pretty-printing, "
+        "e.g. 'customXml/*' or '*/embeddings/*' (repeatable)",
+    )
+    parser.add_argument(
+        "--formatter",
+        choices=sorted(FORMATTERS),
+        help="XML formatting backend (default: lxml)",
+    )
+    parser.add_argument(
+        "--lazy",
+        action="store_true",
+        help="Extract parts only when first opened (see workspace.py)",
+    )
+    args = parser.parse_args()
+
+    try:
+        unpack_document(
+            args.office_file,
+            args.output_dir,
+            jobs=args.jobs,
+            skip_format=args.skip_format,
+            formatter=args.formatter,
+            lazy=args.lazy,
+        )
+    except (ValueError, zipfile.BadZipFile) as e:
+        sys.exit(f"Error: {e}")
+
+    # Suggest RSID for DOCX files
+    if args.office_file.endswith(".docx"):
+        suggested_rsid = "".join(random.choices("0123456789ABCDEF", k=8))
+        print(f"Suggested RSID for edit session: {suggested_rsid}")
+
+
+def unpack_document(
+    input_file, output_dir, jobs=1, skip_format=(), formatter=None, lazy=False
+):
+    """Extract an Office file and pretty-print its XML parts.
+
+    Members are split into batches of roughly equal uncompressed size; each
+    batch is extracted and formatted by one worker, so large parts such as
+    document.xml or a 400-slide deck spread across processes.
+
+    Args:
+        input_file: Path to Office file (.docx/.pptx/.xlsx)
+        output_dir: Directory to unpack into (created if missing)
+        jobs: Number of worker processes; 1 unpacks in this process (default: 1)
+        skip_format: Glob patterns (matched against the part name, e.g.
+            "customXml/*") of XML parts to extract without pretty-printing
+        formatter: Name of the XML formatting backend (default: lxml)
+        lazy: If True, only write a workspace manifest; parts are extracted
+            and formatted when first opened (default: False)
+
+    Returns:
+        list: Names of the parts that were pretty-printed
+    """
+    input_file = Path(input_file)
+    output_path = Path(output_dir)
+    # Fail early on an unknown backend rather than inside a worker
+    get_formatter(formatter)
+
+    if lazy:
+        LazyPackage.create(input_file, output_path, formatter, skip_format)
+        return []
+
+    with zipfile.ZipFile(input_file) as zf:
+        members = [info for info in zf.infolist() if not info.is_dir()]
+
+    formatted = [
+        info.filename
+        for info in members
+        if info.filename.endswith((".xml", ".rels"))
+        and not any(fnmatch.fnmatch(info.filename, p) for p in skip_format)
+    ]
+
+    output_path.mkdir(parents=True, exist_ok=True)
+    batches = _split_members(members, max(1, jobs))
+    formatted_names = set(formatted)
+    work = [
+        (
+            str(input_file),
+            str(output_path),
+            [info.filename for info in batch],
+            [info.filename for info in batch if info.filename in formatted_names],
+            formatter,
+        )
+        for batch in batches
+    ]
+
+    if len(work) <= 1:
+        for args in work:
+            _unpack_members(*args)
+    else:
+        with ProcessPoolExecutor(max_workers=len(work)) as pool:
+            # Consume the results so worker exceptions propagate
+            list(pool.map(_unpack_members, *zip(*work)))
+
+    return formatted
+
+
+def _split_members(members, jobs):
+    """Split zip members into up to `jobs` batches of similar uncompressed size."""
+    batches = [[] for _ in range(min(jobs, len(members)))]
+    sizes = [0] * len(batches)
+    for info in sorted(members, key=lambda i: i.file_size, reverse=True):
+        smallest = sizes.index(min(sizes))
+        batches[smallest].append(info)
+        sizes[smallest] += info.file_size
+    return batches
+
+
+def _unpack_members(input_file, output_dir, names, format_names, formatter):
+    """Extract `names` from the archive and pretty-print those in `format_names`.
+
+    Workers unpack into the same tree at once, so each creates the
+    directories it needs with exist_ok rather than through ZipFile.extract,
+    which fails if another worker creates one first.
+    """
+    xml_formatter = get_formatter(formatter)
+    format_names = set(format_names)
+    with zipfile.ZipFile(input_file) as zf:
+        for name in names:
+            path = member_path(output_dir, name)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            if name in format_names:
+                path.write_bytes(xml_formatter.pretty(zf.read(name)))
+            else:
+                with zf.open(name) as source, open(path, "wb") as target:
+                    shutil.copyfileobj(source, target)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+In-memory index of an Office package's parts, relationships and content types.
+"""
+
+import posixpath
+from typing import NamedTuple, Optional
+
+PACKAGE_RELATIONSHIPS_NAMESPACE = (
+    "http://schemas.openxmlformats.org/package/2006/relationships"
+)
+CONTENT_TYPES_NAMESPACE = "http://schemas.openxmlformats.org/package/2006/content-types"
+CONTENT_TYPES_PART = "[Content_Types].xml"
+
+
+class Relationship(NamedTuple):
+    """One <Relationship> of a .rels part."""
+
+    id: Optional[str]
+    type: str
+    target: Optional[str]
+    # Part name the target resolves to; None for external or missing targets
+    part: Optional[str]
+    line: int
+
+
+class PackageGraph:
+    """Parts, relationships and content types of a package, built once.
+
+    Part names are POSIX paths relative to the package root (e.g.
+    "word/document.xml"). Targets are resolved with string operations, so
+    looking up whether a relationship points at an existing part needs no
+    filesystem access.
+
+    Attributes:
+        parts: Set of all part names in the package
+        relationships: .rels part name -> list of Relationship
+        rels_errors: .rels part name -> exception raised while parsing it
+        overrides: Part names with an <Override> in [Content_Types].xml
+        defaults: Lowercase extensions with a <Default> in [Content_Types].xml
+        content_types_error: Exception raised while parsing [Content_Types].xml
+    """
+
+    def __init__(self, parts, parse):
+        """
+        Args:
+            parts: Iterable of part names
+            parse: Callable taking a part name and returning its root element
+        """
+        self.parts = set(parts)
+        self.relationships = {}
+        self.rels_errors = {}
+        self.overrides = set()
+        self.defaults = set()
+        self.content_types_error = None
+
+        for rels_part in sorted(p for p in self.parts if p.endswith(".rels")):
+            try:
+                root = parse(rels_part)
+            except Exception as e:
+                self.rels_errors[rels_part] = e
+                continue
+            self.relationships[rels_part] = [
+                self._relationship(rels_part, rel)
+                for rel in root.iter(
+                    f"{{{PACKAGE_RELATIONSHIPS_NAMESPACE}}}Relationship"
+                )
+            ]
+
+        if CONTENT_TYPES_PART in self.parts:
+            try:
+                root = parse(CONTENT_TYPES_PART)
+                for override in root.iter(f"{{{CONTENT_TYPES_NAMESPACE}}}Override"):
+                    part_name = override.get("PartName")
+                    if part_name is not None:
+                        self.overrides.add(part_name.lstrip("/"))
+                for default in root.iter(f"{{{CONTENT_TYPES_NAMESPACE}}}Default"):
+                    extension = default.get("Extension")
+                    if extension is not None:
+                        self.defaults.add(extension.lower())
+            except Exception as e:
+                self.content_types_error = e
+
+    def _relationship(self, rels_part, rel):
+        target = rel.get("Target")
+        part = None
+        if target and not is_external_target(target):
+            # Absolute targets ("/xl/workbook.xml") start at the package root
+            resolved = posixpath.normpath(
+                posixpath.join(self.base_dir(rels_part), target)
+            ).lstrip("/")
+            if resolved in self.parts:
+                part = resolved
+        return Relationship(
+            rel.get("Id"), rel.get("Type", ""), target, part, rel.sourceline
+        )
+
+    @staticmethod
+    def rels_part_for(part):
+        """Return the name of the .rels part holding `part`'s relationships."""
+        directory, name = posixpath.split(part)
+        return posixpath.join(directory, "_rels", f"{name}.rels")
+
+    @staticmethod
+    def base_dir(rels_part):
+        """Return the directory that targets in `rels_part` are relative to.
+
+        The root _rels/.rels is relative to the package root; dir/_rels/x.rels
+        is relative to dir.
+        """
+        return posixpath.dirname(posixpath.dirname(rels_part))
+
+    def relationships_of(self, part):
+        """Return `part`'s relationships, or None if it has no .rels part."""
+        return self.relationships.get(self.rels_part_for(part))
+
+    def referenced_parts(self):
+        """Return the set of parts targeted by at least one relationship."""
+        return {
+            rel.part
+            for rels in self.relationships.values()
+            for rel in rels
+            if rel.part is not None
+        }
+
+
+def is_external_target(target):
+    """Check whether a relationship target points outside the package."""
+    return target.startswith(("http", "mailto:"))
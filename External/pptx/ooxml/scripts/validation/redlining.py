@@ -2,19 +2,37 @@
 Validator for tracked changes in Word documents.
 """
 
-import subprocess
-import tempfile
+import difflib
+import hashlib
+import xml.etree.ElementTree as ET
 import zipfile
 from pathlib import Path
 
+try:
+    from ..workspace import LazyPackage
+except ImportError:  # validation imported as a top-level package by validate.py
+    from workspace import LazyPackage
+
+# Paragraph fingerprints of original documents, keyed by file identity and
+# author, so repeated validations against the same original never re-read it
+_ORIGINAL_FINGERPRINTS = {}
+
 
 class RedliningValidator:
-    """Validator for tracked changes in Word documents."""
+    """Validator for tracked changes in Word documents.
 
-    def __init__(self, unpacked_dir, original_docx, verbose=False):
+    Both documents are reduced to one fingerprint (hash) per non-empty
+    paragraph after the author's tracked changes are removed. Matching
+    fingerprint lists mean the text is unchanged; otherwise only the
+    paragraphs that differ are diffed, character by character.
+    """
+
+    def __init__(self, unpacked_dir, original_docx, verbose=False, author="Claude"):
         self.unpacked_dir = Path(unpacked_dir)
         self.original_docx = Path(original_docx)
         self.verbose = verbose
+        # Author whose tracked changes are being validated
+        self.author = author
         self.namespaces = {
             "w": "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
         }
@@ -23,98 +41,109 @@ class RedliningValidator:
         """Main validation method that returns True if valid, False otherwise."""
         # Verify unpacked directory exists and has correct structure
         modified_file = self.unpacked_dir / "word" / "document.xml"
+        package = LazyPackage.load(self.unpacked_dir)
+        if package is not None and package.is_pending("word/document.xml"):
+            # Never extracted from a lazy workspace, so it cannot have changed
+            if self.verbose:
+                print("PASSED - document.xml has not been modified.")
+            return True
         if not modified_file.exists():
             print(f"FAILED - Modified document.xml not found at {modified_file}")
             return False
 
-        # First, check if there are any tracked changes by Claude to validate
         try:
-            import xml.etree.ElementTree as ET
-
-            tree = ET.parse(modified_file)
-            root = tree.getroot()
-
-            # Check for w:del or w:ins tags authored by Claude
-            del_elements = root.findall(".//w:del", self.namespaces)
-            ins_elements = root.findall(".//w:ins", self.namespaces)
-
-            # Filter to only include changes by Claude
-            claude_del_elements = [
-                elem
-                for elem in del_elements
-                if elem.get(f"{{{self.namespaces['w']}}}author") == "Claude"
-            ]
-            claude_ins_elements = [
-                elem
-                for elem in ins_elements
-                if elem.get(f"{{{self.namespaces['w']}}}author") == "Claude"
-            ]
-
-            # Redlining validation is only needed if tracked changes by Claude have been used.
-            if not claude_del_elements and not claude_ins_elements:
-                if self.verbose:
-                    print("PASSED - No tracked changes by Claude found.")
-                return True
-
-        except Exception:
-            # If we can't parse the XML, continue with full validation
-            pass
-
-        # Create temporary directory for unpacking original docx
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-
-            # Unpack original docx
-            try:
-                with zipfile.ZipFile(self.original_docx, "r") as zip_ref:
-                    zip_ref.extractall(temp_path)
-            except Exception as e:
-                print(f"FAILED - Error unpacking original docx: {e}")
-                return False
-
-            original_file = temp_path / "word" / "document.xml"
-            if not original_file.exists():
-                print(
-                    f"FAILED - Original document.xml not found in {self.original_docx}"
-                )
-                return False
-
-            # Parse both XML files using xml.etree.ElementTree for redlining validation
-            try:
-                import xml.etree.ElementTree as ET
-
-                modified_tree = ET.parse(modified_file)
-                modified_root = modified_tree.getroot()
-                original_tree = ET.parse(original_file)
-                original_root = original_tree.getroot()
-            except ET.ParseError as e:
-                print(f"FAILED - Error parsing XML files: {e}")
-                return False
-
-            # Remove Claude's tracked changes from both documents
-            self._remove_claude_tracked_changes(original_root)
-            self._remove_claude_tracked_changes(modified_root)
-
-            # Extract and compare text content
-            modified_text = self._extract_text_content(modified_root)
-            original_text = self._extract_text_content(original_root)
-
-            if modified_text != original_text:
-                # Show detailed character-level differences for each paragraph
-                error_message = self._generate_detailed_diff(
-                    original_text, modified_text
-                )
-                print(error_message)
-                return False
+            modified_root = ET.parse(modified_file).getroot()
+        except ET.ParseError as e:
+            print(f"FAILED - Error parsing XML files: {e}")
+            return False
 
+        # Redlining validation is only needed if the author's tracked changes have been used.
+        if not self._has_tracked_changes(modified_root):
             if self.verbose:
-                print("PASSED - All changes by Claude are properly tracked")
+                print(f"PASSED - No tracked changes by {self.author} found.")
             return True
 
-    def _generate_detailed_diff(self, original_text, modified_text):
-        """Generate detailed word-level differences using git word diff."""
+        try:
+            original_fingerprints = self._get_original_fingerprints()
+        except KeyError:
+            print(f"FAILED - Original document.xml not found in {self.original_docx}")
+            return False
+        except ET.ParseError as e:
+            print(f"FAILED - Error parsing XML files: {e}")
+            return False
+        except Exception as e:
+            print(f"FAILED - Error reading original docx: {e}")
+            return False
+
+        # Remove the author's tracked changes and compare paragraph by paragraph
+        self._remove_tracked_changes(modified_root)
+        modified_paragraphs = self._extract_paragraphs(modified_root)
+
+        if self._fingerprint(modified_paragraphs) != original_fingerprints:
+            # Only now is the original's text needed, to show the differences
+            original_paragraphs = self._extract_paragraphs(
+                self._load_original_root(remove_tracked_changes=True)
+            )
+            error_message = self._generate_detailed_diff(
+                original_paragraphs, modified_paragraphs
+            )
+            print(error_message)
+            return False
+
+        if self.verbose:
+            print(f"PASSED - All changes by {self.author} are properly tracked")
+        return True
+
+    def _has_tracked_changes(self, root):
+        """Check whether root contains any w:ins or w:del by the author."""
+        author_attr = f"{{{self.namespaces['w']}}}author"
+        return any(
+            elem.get(author_attr) == self.author
+            for tag in ("ins", "del")
+            for elem in root.iter(f"{{{self.namespaces['w']}}}{tag}")
+        )
+
+    def _load_original_root(self, remove_tracked_changes=False):
+        """Parse the original's word/document.xml straight from the .docx.
+
+        Raises:
+            KeyError: If the original has no word/document.xml
+        """
+        with zipfile.ZipFile(self.original_docx, "r") as zip_ref:
+            root = ET.fromstring(zip_ref.read("word/document.xml"))
+        if remove_tracked_changes:
+            self._remove_tracked_changes(root)
+        return root
+
+    def _get_original_fingerprints(self):
+        """Return the original's paragraph fingerprints, computed once per file."""
+        stat = self.original_docx.stat()
+        key = (
+            str(self.original_docx.resolve()),
+            stat.st_mtime_ns,
+            stat.st_size,
+            self.author,
+        )
+        if key not in _ORIGINAL_FINGERPRINTS:
+            _ORIGINAL_FINGERPRINTS[key] = self._fingerprint(
+                self._extract_paragraphs(
+                    self._load_original_root(remove_tracked_changes=True)
+                )
+            )
+        return _ORIGINAL_FINGERPRINTS[key]
+
+    @staticmethod
+    def _fingerprint(paragraphs):
+        """Reduce paragraph texts to a list of short digests."""
+        return [
+            hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+            for text in paragraphs
+        ]
+
+    def _generate_detailed_diff(self, original_paragraphs, modified_paragraphs):
+        """Generate character-level differences for the paragraphs that changed."""
         error_parts = [
-            "FAILED - Document text doesn't match after removing Claude's tracked changes",
+            f"FAILED - Document text doesn't match after removing {self.author}'s tracked changes",
             "",
             "Likely causes:",
             "  1. Modified text inside another author's <w:ins> or <w:del> tags",
@@ -127,132 +156,95 @@ class RedliningValidator:
             "",
         ]
 
-        # Show git word diff
-        git_diff = self._get_git_word_diff(original_text, modified_text)
-        if git_diff:
-            error_parts.extend(["Differences:", "============", git_diff])
-        else:
-            error_parts.append("Unable to generate word diff (git not available)")
+        diff_lines = self._get_paragraph_diff(original_paragraphs, modified_paragraphs)
+        error_parts.extend(["Differences:", "============", *diff_lines])
 
         return "\n".join(error_parts)
 
-    def _get_git_word_diff(self, original_text, modified_text):
-        """Generate word diff using git with character-level precision."""
-        try:
-            with tempfile.TemporaryDirectory() as temp_dir:
-                temp_path = Path(temp_dir)
-
-                # Create two files
-                original_file = temp_path / "original.txt"
-                modified_file = temp_path / "modified.txt"
-
-                original_file.write_text(original_text, encoding="utf-8")
-                modified_file.write_text(modified_text, encoding="utf-8")
-
-                # Try character-level diff first for precise differences
-                result = subprocess.run(
-                    [
-                        "git",
-                        "diff",
-                        "--word-diff=plain",
-                        "--word-diff-regex=.",  # Character-by-character diff
-                        "-U0",  # Zero lines of context - show only changed lines
-                        "--no-index",
-                        str(original_file),
-                        str(modified_file),
-                    ],
-                    capture_output=True,
-                    text=True,
-                )
-
-                if result.stdout.strip():
-                    # Clean up the output - remove git diff header lines
-                    lines = result.stdout.split("\n")
-                    # Skip the header lines (diff --git, index, +++, ---, @@)
-                    content_lines = []
-                    in_content = False
-                    for line in lines:
-                        if line.startswith("@@"):
-                            in_content = True
-                            continue
-                        if in_content and line.strip():
-                            content_lines.append(line)
-
-                    if content_lines:
-                        return "\n".join(content_lines)
-
-                # Fallback to word-level diff if character-level is too verbose
-                result = subprocess.run(
-                    [
-                        "git",
-                        "diff",
-                        "--word-diff=plain",
-                        "-U0",  # Zero lines of context
-                        "--no-index",
-                        str(original_file),
-                        str(modified_file),
-                    ],
-                    capture_output=True,
-                    text=True,
-                )
+    def _get_paragraph_diff(self, original_paragraphs, modified_paragraphs):
+        """Diff two paragraph lists, one output line per changed paragraph.
 
-                if result.stdout.strip():
-                    lines = result.stdout.split("\n")
-                    content_lines = []
-                    in_content = False
-                    for line in lines:
-                        if line.startswith("@@"):
-                            in_content = True
-                            continue
-                        if in_content and line.strip():
-                            content_lines.append(line)
-                    return "\n".join(content_lines)
-
-        except (subprocess.CalledProcessError, FileNotFoundError, Exception):
-            # Git not available or other error, return None to use fallback
-            pass
-
-        return None
-
-    def _remove_claude_tracked_changes(self, root):
-        """Remove tracked changes authored by Claude from the XML root."""
+        Paragraphs are aligned by fingerprint, so unchanged paragraphs cost
+        nothing. Changed text is marked like `git diff --word-diff=plain`:
+        [-removed-] and {+added+}.
+        """
+        matcher = difflib.SequenceMatcher(
+            None,
+            self._fingerprint(original_paragraphs),
+            self._fingerprint(modified_paragraphs),
+            autojunk=False,
+        )
+
+        lines = []
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+            if tag == "equal":
+                continue
+            old, new = original_paragraphs[i1:i2], modified_paragraphs[j1:j2]
+            # Pair up replaced paragraphs; leftovers were removed or added whole
+            for k in range(max(len(old), len(new))):
+                if k >= len(new):
+                    lines.append(f"[-{old[k]}-]")
+                elif k >= len(old):
+                    lines.append(f"{{+{new[k]}+}}")
+                else:
+                    lines.append(self._get_character_diff(old[k], new[k]))
+        return lines
+
+    @staticmethod
+    def _get_character_diff(original_text, modified_text):
+        """Mark the characters that differ between two paragraph texts."""
+        matcher = difflib.SequenceMatcher(
+            None, original_text, modified_text, autojunk=False
+        )
+        parts = []
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+            if tag == "equal":
+                parts.append(original_text[i1:i2])
+                continue
+            if i2 > i1:
+                parts.append(f"[-{original_text[i1:i2]}-]")
+            if j2 > j1:
+                parts.append(f"{{+{modified_text[j1:j2]}+}}")
+        return "".join(parts)
+
+    def _remove_tracked_changes(self, root):
+        """Remove the author's tracked changes from the XML root in one pass.
+
+        The author's w:ins elements are dropped and their w:del elements are
+        unwrapped, with w:delText turned back into w:t. Each parent's
+        children are rebuilt once, so the transform is linear in the size
+        of the tree.
+        """
         ins_tag = f"{{{self.namespaces['w']}}}ins"
         del_tag = f"{{{self.namespaces['w']}}}del"
         author_attr = f"{{{self.namespaces['w']}}}author"
-
-        # Remove w:ins elements
-        for parent in root.iter():
-            to_remove = []
-            for child in parent:
-                if child.tag == ins_tag and child.get(author_attr) == "Claude":
-                    to_remove.append(child)
-            for elem in to_remove:
-                parent.remove(elem)
-
-        # Unwrap content in w:del elements where author is "Claude"
         deltext_tag = f"{{{self.namespaces['w']}}}delText"
         t_tag = f"{{{self.namespaces['w']}}}t"
 
-        for parent in root.iter():
-            to_process = []
-            for child in parent:
-                if child.tag == del_tag and child.get(author_attr) == "Claude":
-                    to_process.append((child, list(parent).index(child)))
-
-            # Process in reverse order to maintain indices
-            for del_elem, del_index in reversed(to_process):
-                # Convert w:delText to w:t before moving
-                for elem in del_elem.iter():
-                    if elem.tag == deltext_tag:
+        parents = [root]
+        while parents:
+            parent = parents.pop()
+            children = []
+            # Unwrapped w:del content is fed back in, so nested changes are handled too
+            pending = list(reversed(parent))
+            changed = False
+            while pending:
+                child = pending.pop()
+                if child.tag == ins_tag and child.get(author_attr) == self.author:
+                    changed = True
+                elif child.tag == del_tag and child.get(author_attr) == self.author:
+                    changed = True
+                    for elem in child.iter(deltext_tag):
                         elem.tag = t_tag
+                    pending.extend(reversed(child))
+                else:
+                    children.append(child)
+            if changed:
+                parent[:] = children
+            parents.extend(children)
 
-                # Move all children of w:del to its parent before removing w:del
-                for child in reversed(list(del_elem)):
-                    parent.insert(del_index, child)
-                parent.remove(del_elem)
-
-    def _extract_text_content(self, root):
-        """Extract text content from Word XML, preserving paragraph structure.
+    def _extract_paragraphs(self, root):
+        """Extract the text of each paragraph from Word XML.
 
         Empty paragraphs are skipped to avoid false positives when tracked
         insertions add only structural elements without text content.
@@ -272,7 +264,7 @@ class RedliningValidator:
             if paragraph_text:
                 paragraphs.append(paragraph_text)
 
-        return "\n".join(paragraphs)
+        return paragraphs
 
 
 if __name__ == "__main__":
@@ -0,0 +1,452 @@
+"""
+Validator for Excel workbook XML files against XSD schemas.
+"""
+
+import fnmatch
+import re
+
+import lxml.etree
+
+from .base import BaseSchemaValidator
+from .lint import (
+    ElementCountRule,
+    SharedStringIndexRule,
+    SheetRelationshipIdRule,
+    StyleIndexRule,
+    lint,
+)
+from .package_graph import CONTENT_TYPES_PART
+
+# Errors shown per part and check; a broken generator can produce millions
+MAX_REPORTED_PER_PART = 20
+
+
+class XLSXSchemaValidator(BaseSchemaValidator):
+    """Validator for Excel workbook XML files against XSD schemas.
+
+    Worksheets and the shared string table can hold millions of cells, so
+    they are never parsed into trees. They are streamed instead (see
+    lint.py), once per part, and the tree-based checks of the base class
+    only look at the remaining parts. XSD validation of streamed parts is
+    opt-in (sheet_xsd), as it needs the whole part in memory. The unique ID
+    check skips them: none of the elements it covers occur in worksheets or
+    the shared string table.
+    """
+
+    # Excel spreadsheet namespace
+    SPREADSHEETML_NAMESPACE = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+
+    # Parts that are streamed rather than parsed
+    STREAMED_PARTS = ("xl/worksheets/*.xml", "xl/sharedStrings.xml")
+
+    SHARED_STRINGS_PART = "xl/sharedStrings.xml"
+    STYLES_PART = "xl/styles.xml"
+    WORKBOOK_PART = "xl/workbook.xml"
+
+    # Sheet-qualified references in formulas: 'My Sheet'!A1, Sheet1!A1,
+    # Sheet1:Sheet3!A1 (3D). Unquoted names never contain "$" and never
+    # follow a word character, "]", "!" or "$", which leaves out external
+    # references such as [1]Sheet1!A1 and the cells of Data!$A$1:Data!$B$2.
+    # A cell reference before ":" is a range operand (A1:Data!B2), not the
+    # first sheet of a 3D reference, since such sheet names must be quoted.
+    SHEET_REFERENCE_PATTERN = re.compile(
+        r"'((?:[^']|'')+)'!"
+        r"|(?<![\w.\]'!$])((?:(?!\$?[A-Za-z]{1,3}\$?\d+:)"
+        r"[^\s'!\"(),;:=+\-*/&^<>{}\[\]$]+:)?"
+        r"[^\s'!\"(),;:=+\-*/&^<>{}\[\]$]+)!"
+    )
+    STRING_LITERAL_PATTERN = re.compile(r'"(?:[^"]|"")*"')
+
+    def __init__(self, unpacked_dir, original_file, sheet_xsd=False, **kwargs):
+        super().__init__(unpacked_dir, original_file, **kwargs)
+
+        # Also validate streamed parts against XSD (parses each into a tree)
+        self.sheet_xsd = sheet_xsd
+
+        self.streamed_parts = [f for f in self.xml_files if self._is_streamed(f)]
+        self.xml_files = [f for f in self.xml_files if not self._is_streamed(f)]
+
+        # Entry counts read on first use; an exception if the part is broken
+        self._shared_string_count = None
+        self._style_count = None
+
+    def validate(self):
+        """Run all validation checks and return True if all pass."""
+        # Test 0: XML well-formedness
+        if not self.validate_xml():
+            return False
+
+        # Test 1: Namespace declarations
+        all_valid = True
+        if not self.validate_namespaces():
+            all_valid = False
+
+        # Test 2: Unique IDs
+        if not self.validate_unique_ids():
+            all_valid = False
+
+        # Test 3: Relationship and file reference validation
+        if not self.validate_file_references():
+            all_valid = False
+
+        # Test 4: Content type declarations
+        if not self.validate_content_types():
+            all_valid = False
+
+        # Test 5: XSD schema validation
+        if not self.validate_against_xsd():
+            all_valid = False
+
+        # Test 6: Relationship ID reference validation
+        if not self.validate_all_relationship_ids():
+            all_valid = False
+        if not self.validate_sheet_relationship_ids():
+            all_valid = False
+
+        # Test 7: Shared string indices
+        if not self.validate_shared_string_indices():
+            all_valid = False
+
+        # Test 8: Style indices
+        if not self.validate_style_indices():
+            all_valid = False
+
+        # Test 9: Defined names
+        if not self.validate_defined_names():
+            all_valid = False
+
+        return all_valid
+
+    def _part_name(self, xml_file):
+        return xml_file.relative_to(self.unpacked_dir).as_posix()
+
+    def _is_streamed(self, xml_file):
+        part = self._part_name(xml_file)
+        return not part.endswith(".rels") and any(
+            fnmatch.fnmatch(part, pattern) for pattern in self.STREAMED_PARTS
+        )
+
+    def _streamed_parts_to_check(self):
+        """Return the streamed parts that checks examine.
+
+        In incremental mode, parts still pending in a lazy workspace are
+        skipped; other parts are not compared with the original, since that
+        would load them whole.
+        """
+        return [
+            f
+            for f in self.streamed_parts
+            if not (self.incremental and self._is_pending(f))
+        ]
+
+    def _worksheets(self):
+        """Return the streamed worksheet parts that per-part checks examine."""
+        return [
+            f
+            for f in self._streamed_parts_to_check()
+            if self._part_name(f) != self.SHARED_STRINGS_PART
+        ]
+
+    def _xsd_parts(self):
+        """Non-streamed parts, plus the streamed ones if sheet_xsd is set."""
+        parts = super()._xsd_parts()
+        if self.sheet_xsd:
+            parts = parts + self._streamed_parts_to_check()
+        return parts
+
+    def get_shared_string_count(self):
+        """Return the number of <si> entries in the shared string table.
+
+        The table is streamed once; a missing table counts as empty.
+
+        Raises:
+            lxml.etree.XMLSyntaxError: If sharedStrings.xml is not well-formed
+        """
+        if self._shared_string_count is None:
+            part = self.unpacked_dir / self.SHARED_STRINGS_PART
+            try:
+                if self._part_exists(part):
+                    rule = ElementCountRule(f"{{{self.SPREADSHEETML_NAMESPACE}}}si")
+                    lint(self._stream_source(part), [rule])
+                    self._shared_string_count = rule.count
+                else:
+                    self._shared_string_count = 0
+            except Exception as e:
+                self._shared_string_count = e
+
+        if isinstance(self._shared_string_count, Exception):
+            raise self._shared_string_count
+        return self._shared_string_count
+
+    def get_style_count(self):
+        """Return the number of cell formats (<cellXfs> entries) in styles.xml.
+
+        A missing styles part allows only the default style 0.
+        """
+        if self._style_count is None:
+            part = self.unpacked_dir / self.STYLES_PART
+            try:
+                if self._part_exists(part):
+                    cell_xfs = self._parse(part).find(
+                        f"{{{self.SPREADSHEETML_NAMESPACE}}}cellXfs"
+                    )
+                    self._style_count = 0 if cell_xfs is None else len(
+                        cell_xfs.findall(f"{{{self.SPREADSHEETML_NAMESPACE}}}xf")
+                    )
+                else:
+                    self._style_count = 1
+            except Exception as e:
+                self._style_count = e
+
+        if isinstance(self._style_count, Exception):
+            raise self._style_count
+        return self._style_count
+
+    def _lint_rules(self, xml_file):
+        """Shared string, style and r:id rules, run together on each worksheet.
+
+        A rule is left out if the part it checks against is itself broken;
+        that part's own errors are reported elsewhere.
+        """
+        if xml_file not in self.streamed_parts:
+            return []
+        if self._part_name(xml_file) == self.SHARED_STRINGS_PART:
+            return []
+
+        rules = []
+        try:
+            rules.append(SharedStringIndexRule(self.get_shared_string_count()))
+        except Exception:
+            pass
+        try:
+            rules.append(StyleIndexRule(self.get_style_count()))
+        except Exception:
+            pass
+
+        # As in validate_all_relationship_ids, parts without a .rels are skipped
+        relationships = self._get_package_graph().relationships_of(
+            self._part_name(xml_file)
+        )
+        if relationships is not None:
+            rules.append(
+                SheetRelationshipIdRule({rel.id for rel in relationships if rel.id})
+            )
+        return rules
+
+    def _stream_root(self, xml_file):
+        """Return the root element of a streamed part without reading the rest."""
+        for _, root in lxml.etree.iterparse(
+            self._stream_source(xml_file), events=("start",)
+        ):
+            return root
+
+    def validate_xml(self):
+        """Validate that all XML files, streamed or not, are well-formed."""
+        all_valid = super().validate_xml()
+
+        errors = []
+        for xml_file in self._streamed_parts_to_check():
+            try:
+                if self._part_name(xml_file) == self.SHARED_STRINGS_PART:
+                    self.get_shared_string_count()
+                else:
+                    self._lint(xml_file)
+            except lxml.etree.XMLSyntaxError as e:
+                errors.append(
+                    f"  {xml_file.relative_to(self.unpacked_dir)}: "
+                    f"Line {e.lineno}: {e.msg}"
+                )
+            except Exception as e:
+                errors.append(
+                    f"  {xml_file.relative_to(self.unpacked_dir)}: "
+                    f"Unexpected error: {str(e)}"
+                )
+
+        if errors:
+            print(f"FAILED - Found {len(errors)} XML violations in worksheets:")
+            for error in errors:
+                print(error)
+            return False
+        return all_valid
+
+    def validate_namespaces(self):
+        """Validate Ignorable namespace prefixes, reading only streamed parts' roots."""
+        all_valid = super().validate_namespaces()
+
+        errors = []
+        for xml_file in self._worksheets():
+            try:
+                root = self._stream_root(xml_file)
+                errors.extend(self._ignorable_namespace_errors(xml_file, root))
+            except lxml.etree.XMLSyntaxError:
+                continue
+
+        if errors:
+            print(f"FAILED - {len(errors)} namespace issues in worksheets:")
+            for error in errors:
+                print(error)
+            return False
+        return all_valid
+
+    def validate_content_types(self):
+        """Validate content type declarations, reading only streamed parts' roots."""
+        all_valid = super().validate_content_types()
+
+        # A missing or broken [Content_Types].xml was reported by the base class
+        graph = self._get_package_graph()
+        if (
+            CONTENT_TYPES_PART not in graph.parts
+            or graph.content_types_error is not None
+        ):
+            return all_valid
+
+        errors = []
+        for xml_file in self.streamed_parts:
+            part = self._part_name(xml_file)
+            try:
+                root_name = lxml.etree.QName(self._stream_root(xml_file)).localname
+            except Exception:
+                continue  # Reported by validate_xml
+
+            if root_name in self.DECLARABLE_ROOTS and part not in graph.overrides:
+                errors.append(
+                    f"  {part}: File with <{root_name}> root not declared in [Content_Types].xml"
+                )
+
+        if errors:
+            print(f"FAILED - Found {len(errors)} content type declaration errors:")
+            for error in errors:
+                print(error)
+            return False
+        return all_valid
+
+    def _validate_lint_results(self, name, description, hint=None):
+        """Report the violations of one worksheet lint rule; return True if none."""
+        errors = []
+        total = 0
+
+        for xml_file in self._worksheets():
+            try:
+                violations = self._lint(xml_file).get(name, [])
+            except Exception as e:
+                errors.append(
+                    f"  {xml_file.relative_to(self.unpacked_dir)}: Error: {e}"
+                )
+                total += 1
+                continue
+
+            total += len(violations)
+            for line, message in violations[:MAX_REPORTED_PER_PART]:
+                errors.append(
+                    f"  {xml_file.relative_to(self.unpacked_dir)}: "
+                    f"Line {line}: {message}"
+                )
+            if len(violations) > MAX_REPORTED_PER_PART:
+                errors.append(
+                    f"  {xml_file.relative_to(self.unpacked_dir)}: ... and "
+                    f"{len(violations) - MAX_REPORTED_PER_PART} more"
+                )
+
+        if errors:
+            print(f"FAILED - Found {total} {description} errors:")
+            for error in errors:
+                print(error)
+            if hint:
+                print(hint)
+            return False
+        else:
+            if self.verbose:
+                print(f"PASSED - All {description} references are valid")
+            return True
+
+    def validate_sheet_relationship_ids(self):
+        """Validate that r:id attributes in worksheets reference existing relationships."""
+        return self._validate_lint_results(
+            "relationship_ids",
+            "worksheet relationship ID",
+            "\nThese ID mismatches will cause the document to appear corrupt!",
+        )
+
+    def validate_shared_string_indices(self):
+        """Validate that shared string cells index into sharedStrings.xml."""
+        return self._validate_lint_results("shared_strings", "shared string index")
+
+    def validate_style_indices(self):
+        """Validate that cell, row and column styles index into <cellXfs>."""
+        return self._validate_lint_results("styles", "style index")
+
+    def validate_defined_names(self):
+        """Validate that defined names refer to existing sheets."""
+        errors = []
+        workbook = self.unpacked_dir / self.WORKBOOK_PART
+
+        if not self._part_exists(workbook):
+            if self.verbose:
+                print("PASSED - No workbook part found")
+            return True
+
+        try:
+            root = self._parse(workbook).getroot()
+            sheet_names = [
+                sheet.get("name", "")
+                for sheet in root.iter(f"{{{self.SPREADSHEETML_NAMESPACE}}}sheet")
+            ]
+            known = {name.lower() for name in sheet_names}
+
+            for defined_name in root.iter(
+                f"{{{self.SPREADSHEETML_NAMESPACE}}}definedName"
+            ):
+                name = defined_name.get("name", "")
+                prefix = (
+                    f"  {self.WORKBOOK_PART}: Line {defined_name.sourceline}: "
+                    f"Defined name '{name}'"
+                )
+
+                local_sheet_id = defined_name.get("localSheetId")
+                if local_sheet_id is not None and not (
+                    local_sheet_id.isdigit() and int(local_sheet_id) < len(sheet_names)
+                ):
+                    errors.append(
+                        f"{prefix} has localSheetId={local_sheet_id}, "
+                        f"but the workbook has {len(sheet_names)} sheets"
+                    )
+
+                formula = self.STRING_LITERAL_PATTERN.sub(
+                    '""', defined_name.text or ""
+                )
+                if "#REF!" in formula:
+                    errors.append(f"{prefix} contains a broken reference (#REF!)")
+
+                for sheet in self._referenced_sheets(formula):
+                    if sheet.lower() not in known:
+                        errors.append(f"{prefix} refers to unknown sheet '{sheet}'")
+
+        except Exception as e:
+            errors.append(f"  {self.WORKBOOK_PART}: Error: {e}")
+
+        if errors:
+            print(f"FAILED - Found {len(errors)} defined name errors:")
+            for error in errors:
+                print(error)
+            return False
+        else:
+            if self.verbose:
+                print("PASSED - All defined names refer to existing sheets")
+            return True
+
+    def _referenced_sheets(self, formula):
+        """Yield the names of sheets referenced in a formula (string literals removed)."""
+        for match in self.SHEET_REFERENCE_PATTERN.finditer(formula):
+            quoted, unquoted = match.groups()
+            if quoted is not None:
+                names = quoted.replace("''", "'").split(":")
+            else:
+                names = unquoted.split(":")
+            for name in names:
+                # External workbooks ([1]Sheet1) and errors (#REF!) are skipped
+                if name and not name.startswith(("[", "#")):
+                    yield name
+
+
+if __name__ == "__main__":
+    raise RuntimeError("This module should not be run directly.")
@@ -0,0 +1,365 @@
+"""
+Lazy unpacked workspaces for Office files (.docx, .pptx, .xlsx).
+
+A lazy workspace is an unpacked directory that starts out empty apart from a
+manifest naming the source Office file. Parts are listed from the source's
+zip central directory and extracted (and pretty-printed) only when first
+opened, so editing one part of a large package does not pay for unpacking
+every other part. Parts that were never extracted are copied byte-for-byte
+from the source by pack.py.
+
+The source file must stay in place and unchanged while the workspace is in
+use.
+
+The module also has copy-on-write helpers for working copies of unpacked
+directories: link_tree mirrors a directory with hard links instead of
+copies, write_atomic replaces a file without touching other links to it,
+and sync_tree copies back only the files that were replaced.
+
+Example usage:
+    package = LazyPackage.create("deck.pptx", "unpacked")
+    path = package.extract("ppt/slides/slide1.xml")
+
+    # From code that only has a path inside some unpacked directory
+    ensure_extracted("unpacked/ppt/slides/slide2.xml")
+"""
+
+import fnmatch
+import json
+import os
+import shutil
+import stat
+import tempfile
+import zipfile
+from pathlib import Path
+
+try:
+    from .formatting import get_formatter
+except ImportError:  # Run as a script from this directory
+    from formatting import get_formatter
+
+# Manifest file at the root of a lazy workspace; never packed
+MANIFEST_NAME = ".lazy-package.json"
+
+
+class LazyPackage:
+    """An unpacked directory whose parts are extracted on first access.
+
+    The manifest records the source file, formatting options and the parts
+    that have been extracted (or removed). Every other part of the source is
+    pending: it is not on disk and is still identical to the source.
+    """
+
+    def __init__(self, root):
+        self.root = Path(root).absolute()
+        manifest = json.loads((self.root / MANIFEST_NAME).read_text())
+        self.source = Path(manifest["source"])
+        self.formatter = manifest.get("formatter")
+        self.skip_format = manifest.get("skip_format", [])
+        self._materialized = set(manifest.get("materialized", []))
+        self._infos = None
+        self._zip = None
+
+    @classmethod
+    def create(cls, source, root, formatter=None, skip_format=()):
+        """Start a lazy workspace for `source` in `root` and return it."""
+        source = Path(source).absolute()
+        root = Path(root)
+        # Read the central directory now so a bad source fails immediately
+        with zipfile.ZipFile(source):
+            pass
+        root.mkdir(parents=True, exist_ok=True)
+        _write_json(
+            root / MANIFEST_NAME,
+            {
+                "source": str(source),
+                "formatter": formatter,
+                "skip_format": list(skip_format),
+                "materialized": [],
+            },
+        )
+        return cls(root)
+
+    @classmethod
+    def load(cls, root):
+        """Return the lazy workspace rooted at `root`, or None if it is not one."""
+        if (Path(root) / MANIFEST_NAME).is_file():
+            return cls(root)
+        return None
+
+    @classmethod
+    def find(cls, path):
+        """Return the lazy workspace containing `path`, or None.
+
+        `path` does not need to exist; its directories may still be pending.
+        """
+        for parent in Path(path).absolute().parents:
+            if (parent / MANIFEST_NAME).is_file():
+                return cls(parent)
+        return None
+
+    def _zip_file(self):
+        # Kept open: reopening re-reads the central directory on every part
+        if self._zip is None:
+            self._zip = zipfile.ZipFile(self.source)
+        return self._zip
+
+    def _zip_infos(self):
+        if self._infos is None:
+            self._infos = {
+                info.filename: info
+                for info in self._zip_file().infolist()
+                if not info.is_dir()
+            }
+        return self._infos
+
+    def close(self):
+        """Close the source file; it is reopened if needed."""
+        if self._zip is not None:
+            self._zip.close()
+            self._zip = None
+
+    def part_names(self):
+        """Return the names of all parts in the source package."""
+        return list(self._zip_infos())
+
+    def pending_parts(self):
+        """Return the names of parts that have not been extracted yet."""
+        return [name for name in self._zip_infos() if self.is_pending(name)]
+
+    def is_pending(self, name):
+        """Check whether part `name` is still only in the source package.
+
+        A file written at the part's path by other means takes precedence
+        over the source, as if the part had been extracted and edited.
+        """
+        return (
+            name in self._zip_infos()
+            and name not in self._materialized
+            and not self.path(name).exists()
+        )
+
+    def path(self, name):
+        """Return where part `name` lives in the workspace, always under root.
+
+        Names are sanitized as ZipFile.extract does (see member_path), so a
+        source member such as "../x.xml" cannot reach outside the workspace.
+        """
+        return member_path(self.root, name)
+
+    def relative_name(self, path):
+        """Return the part name of `path`, a file inside this workspace."""
+        return Path(path).absolute().relative_to(self.root).as_posix()
+
+    def zip_info(self, name):
+        """Return the source ZipInfo of part `name`."""
+        return self._zip_infos()[name]
+
+    def read(self, name):
+        """Return the bytes of part `name` as stored in the source package."""
+        return self._zip_file().read(name)
+
+    def open(self, name):
+        """Return a binary file object streaming part `name` from the source package."""
+        return self._zip_file().open(name)
+
+    def extract(self, name):
+        """Extract and format part `name` if it is still pending; return its path."""
+        path = self.path(name)
+        if self.is_pending(name):
+            content = self.read(name)
+            if name.endswith((".xml", ".rels")) and not _matches(
+                name, self.skip_format
+            ):
+                content = get_formatter(self.formatter).pretty(content)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(content)
+            self._mark_materialized(name)
+        return path
+
+    def extract_all(self):
+        """Extract every pending part, turning this into a regular unpacked dir."""
+        for name in self.pending_parts():
+            self.extract(name)
+
+    def remove(self, name):
+        """Delete part `name` from the workspace, whether extracted or pending."""
+        self.path(name).unlink(missing_ok=True)
+        self._mark_materialized(name)
+
+    def _mark_materialized(self, name):
+        self._materialized.add(name)
+        manifest_path = self.root / MANIFEST_NAME
+        manifest = json.loads(manifest_path.read_text())
+        manifest["materialized"] = sorted(
+            set(manifest.get("materialized", [])) | self._materialized
+        )
+        _write_json(manifest_path, manifest)
+
+
+def ensure_extracted(path):
+    """Extract `path` from its lazy workspace if it is a pending part.
+
+    Paths outside a lazy workspace, or already on disk, are left alone.
+
+    Returns:
+        Path: `path`, so calls can be chained
+    """
+    path = Path(path)
+    if not path.exists():
+        package = LazyPackage.find(path)
+        if package is not None:
+            name = package.relative_name(path)
+            if package.is_pending(name):
+                package.extract(name)
+    return path
+
+
+def link_tree(source, destination, include=None, link=None):
+    """Mirror the files of `source` into `destination` using hard links.
+
+    Files that cannot be linked (for example across file systems) are
+    copied instead. A linked file shares its data with `source`, so it must
+    only be replaced (see write_atomic), never rewritten in place.
+
+    Args:
+        source: Directory to mirror
+        destination: Directory to create; it must not exist yet
+        include: Optional glob patterns; only file names matching one of
+            them are mirrored
+        link: Optional glob patterns; only file names matching one of them
+            are linked, and every other file is copied. Use this for files
+            that code outside your control may rewrite in place, such as
+            media written with shutil.copy.
+
+    Returns:
+        int: Number of files that were copied rather than linked
+    """
+    source = Path(source)
+    destination = Path(destination)
+    destination.mkdir(parents=True)
+    copied = 0
+    for path in source.rglob("*"):
+        if not path.is_file() or (include and not _matches(path.name, include)):
+            continue
+        target = destination / path.relative_to(source)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        if link is None or _matches(path.name, link):
+            copied += not _link_or_copy(path, target)
+        else:
+            shutil.copy2(path, target)
+            copied += 1
+    return copied
+
+
+def sync_tree(source, destination):
+    """Bring `destination` up to date with the files of `source`.
+
+    Files that are already the same file (hard links to one another), or
+    that have the same size and modification time (as rsync assumes; see
+    link_tree's copies), are skipped. Every other file is linked or copied
+    into place atomically. Files only present in `destination` are kept, as
+    with shutil.copytree(dirs_exist_ok=True).
+
+    Returns:
+        int: Number of files written
+    """
+    source = Path(source)
+    destination = Path(destination)
+    written = 0
+    for path in source.rglob("*"):
+        if not path.is_file():
+            continue
+        target = destination / path.relative_to(source)
+        if target.exists() and _same_file(path, target):
+            continue
+        target.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = _temp_path(target)
+        try:
+            _link_or_copy(path, temp_path)
+            os.replace(temp_path, target)
+        finally:
+            temp_path.unlink(missing_ok=True)
+        written += 1
+    return written
+
+
+def write_atomic(path, content):
+    """Replace the file at `path` with `content` (bytes) in one step.
+
+    The new data goes to a temporary file that is then renamed over
+    `path`, so readers never see a partial file and other hard links to
+    the old file (see link_tree) keep their content. The file mode of an
+    existing file is kept.
+    """
+    path = Path(path)
+    fd, temp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(content)
+        if path.exists():
+            os.chmod(temp_path, stat.S_IMODE(path.stat().st_mode))
+        os.replace(temp_path, path)
+    except BaseException:
+        Path(temp_path).unlink(missing_ok=True)
+        raise
+
+
+def member_path(root, name):
+    """Return where zip member `name` is extracted under `root`.
+
+    The name is sanitized as ZipFile.extract does: empty, "." and ".."
+    components and any drive letter are dropped, so the path always lies
+    inside `root`.
+
+    Raises:
+        ValueError: If nothing of the name is left after sanitizing
+    """
+    name = name.replace("/", os.path.sep)
+    if os.path.altsep:
+        name = name.replace(os.path.altsep, os.path.sep)
+    name = os.path.splitdrive(name)[1]
+    parts = [
+        part for part in name.split(os.path.sep) if part not in ("", ".", "..")
+    ]
+    if not parts:
+        raise ValueError(f"Invalid part name: {name!r}")
+    return Path(root).joinpath(*parts)
+
+
+def _same_file(a, b):
+    """Check whether a and b are one file, or copies with equal size and mtime."""
+    if os.path.samefile(a, b):
+        return True
+    a_stat, b_stat = a.stat(), b.stat()
+    return (a_stat.st_size, a_stat.st_mtime_ns) == (
+        b_stat.st_size,
+        b_stat.st_mtime_ns,
+    )
+
+
+def _link_or_copy(source, target):
+    """Hard-link `source` at `target`, or copy it; return True if linked."""
+    try:
+        os.link(source, target)
+        return True
+    except OSError:
+        shutil.copy2(source, target)
+        return False
+
+
+def _temp_path(path):
+    """Return an unused path next to `path` for staging its replacement."""
+    return path.with_name(f".{path.name}.{os.urandom(4).hex()}.tmp")
+
+
+def _matches(name, patterns):
+    return any(fnmatch.fnmatch(name, pattern) for pattern in patterns)
+
+
+def _write_json(path, data):
+    """Write JSON atomically so a concurrent reader never sees a partial file."""
+    fd, temp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    with os.fdopen(fd, "w") as f:
+        json.dump(data, f, indent=2)
+    os.replace(temp_path, path)
@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for the PowerPoint scripts.
+
+Usage:
+    python benchmark.py inventory [--slides 100]
+    python benchmark.py wrapping [--slides 100]
+"""
+
+import argparse
+import platform
+import tempfile
+import time
+from pathlib import Path
+
+import inventory
+from inventory import ShapeData, extract_text_inventory
+from PIL import Image, ImageDraw, ImageFont
+from pptx import Presentation
+from pptx.util import Inches, Pt
+
+# Fonts used by the synthetic deck: one usually installed on Linux, two not
+FONT_NAMES = ["DejaVu Sans", "Arial", "Calibri"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the PowerPoint scripts")
+    subparsers = parser.add_subparsers(dest="benchmark", required=True)
+
+    inventory_parser = subparsers.add_parser(
+        "inventory", help="Time extract_text_inventory() on a text-heavy deck"
+    )
+    inventory_parser.add_argument(
+        "--slides",
+        type=int,
+        default=100,
+        help="Number of slides in the synthetic deck (default: 100)",
+    )
+
+    wrapping_parser = subparsers.add_parser(
+        "wrapping", help="Time frame overflow estimation on dense bullet slides"
+    )
+    wrapping_parser.add_argument(
+        "--slides",
+        type=int,
+        default=100,
+        help="Number of slides in the synthetic deck (default: 100)",
+    )
+
+    args = parser.parse_args()
+
+    match args.benchmark:
+        case "inventory":
+            benchmark_inventory(args.slides)
+        case "wrapping":
+            benchmark_wrapping(args.slides)
+
+
+def benchmark_inventory(slides):
+    """Time extracting the inventory of a deck with many paragraphs per slide.
+
+    "before" looks each paragraph's font up on disk and loads it afresh, as
+    inventory.py used to; "after" uses the font index and the loaded-font
+    cache. The index is built inside the "after" timing. Font lookup and
+    loading are also timed on their own, once per paragraph, since their
+    share of the total depends on how many fonts are installed.
+    """
+    with tempfile.TemporaryDirectory() as temp_dir:
+        deck = Path(temp_dir) / "deck.pptx"
+        _write_deck(deck, slides)
+
+        timings, lookups = {}, {}
+        for label in ("before", "after"):
+            if label == "before":
+                get_font_path, load_font = _get_font_path_scan, _load_font_uncached
+            else:
+                inventory.FontIndex._installed = None
+                inventory._load_font.cache_clear()
+                get_font_path, load_font = ShapeData.get_font_path, inventory._load_font
+
+            original = ShapeData.get_font_path, inventory._load_font
+            ShapeData.get_font_path = staticmethod(get_font_path)
+            inventory._load_font = load_font
+            try:
+                start = time.perf_counter()
+                result = extract_text_inventory(deck)
+                timings[label] = time.perf_counter() - start
+
+                start = time.perf_counter()
+                for index in range(slides * 20):
+                    font_name = FONT_NAMES[index % len(FONT_NAMES)]
+                    load_font(get_font_path(font_name), 14 + 2 * (index % 3))
+                lookups[label] = time.perf_counter() - start
+            finally:
+                ShapeData.get_font_path = staticmethod(original[0])
+                inventory._load_font = original[1]
+
+    shapes = sum(len(shapes) for shapes in result.values())
+    print(f"Inventory of {slides} slides, {shapes} text shapes")
+    print(f"{'':8} {'inventory (s)':>14} {'font lookups (s)':>17}")
+    for label in ("before", "after"):
+        print(f"{label:8} {timings[label]:14.3f} {lookups[label]:17.3f}")
+    print(
+        f"Speedup: {timings['before'] / timings['after']:.1f}x inventory, "
+        f"{lookups['before'] / lookups['after']:.0f}x font lookups"
+    )
+
+
+def benchmark_wrapping(slides):
+    """Time the inventory of dense bullet slides, where wrapping dominates.
+
+    "before" wraps each line by measuring the growing line after every
+    word, as inventory.py used to; "after" adds up the cached word widths
+    of a TextMeasurer. The overflow found for every shape is compared.
+    """
+    with tempfile.TemporaryDirectory() as temp_dir:
+        deck = Path(temp_dir) / "deck.pptx"
+        _write_bullet_deck(deck, slides)
+
+        timings, overflows = {}, {}
+        for label in ("before", "after"):
+            inventory._load_font.cache_clear()
+            inventory._text_measurer.cache_clear()
+            original = ShapeData._estimate_frame_overflow
+            if label == "before":
+                ShapeData._estimate_frame_overflow = _estimate_frame_overflow_measuring
+            try:
+                start = time.perf_counter()
+                result = extract_text_inventory(deck)
+                timings[label] = time.perf_counter() - start
+            finally:
+                ShapeData._estimate_frame_overflow = original
+            overflows[label] = [
+                shape.frame_overflow_bottom
+                for shapes in result.values()
+                for shape in shapes.values()
+            ]
+
+    differences = [
+        (before, after)
+        for before, after in zip(overflows["before"], overflows["after"])
+        if before != after
+    ]
+    print(f"Inventory of {slides} dense bullet slides")
+    print(f"{'before':12} {timings['before']:8.3f} s")
+    print(f"{'after':12} {timings['after']:8.3f} s")
+    print(f"Speedup: {timings['before'] / timings['after']:.1f}x")
+    print(
+        f"Shapes with a different overflow: {len(differences)} "
+        f"of {len(overflows['after'])}"
+    )
+    for before, after in differences[:5]:
+        print(f"  before {before} after {after}")
+
+
+def _write_bullet_deck(path, slides):
+    """Write a deck with one body placeholder of twelve long bullets per slide."""
+    presentation = Presentation()
+    layout = presentation.slide_layouts[1]  # Title and Content
+    sentence = (
+        "Revenue grew in every region while operating costs stayed flat, "
+        "which lifted margins above the plan for the third quarter in a row "
+        "and funded the new product line without additional borrowing"
+    )
+    for slide_number in range(slides):
+        slide = presentation.slides.add_slide(layout)
+        slide.shapes.title.text = f"Quarterly review {slide_number}"
+        text_frame = slide.placeholders[1].text_frame
+        for index in range(12):
+            paragraph = (
+                text_frame.paragraphs[0] if index == 0 else text_frame.add_paragraph()
+            )
+            paragraph.level = index % 3
+            run = paragraph.add_run()
+            run.text = f"{index + 1}. {sentence} ({slide_number}.{index})"
+            run.font.name = FONT_NAMES[index % len(FONT_NAMES)]
+            run.font.size = Pt(14 + 2 * (index % 3))
+    presentation.save(path)
+
+
+def _estimate_frame_overflow_measuring(self):
+    """The frame overflow estimate inventory.py used before, kept for comparison."""
+    if not self.shape or not hasattr(self.shape, "text_frame"):
+        return
+    text_frame = self.shape.text_frame
+    if not text_frame or not text_frame.paragraphs:
+        return
+    usable_width_px, usable_height_px = self._get_usable_dimensions(text_frame)
+    if usable_width_px <= 0 or usable_height_px <= 0:
+        return
+
+    draw = ImageDraw.Draw(Image.new("RGB", (1, 1)))
+    default_font_size = self._get_default_font_size()
+    total_height_px = 0
+    for para_idx, paragraph in enumerate(text_frame.paragraphs):
+        if not paragraph.text.strip():
+            continue
+        para_data = inventory.ParagraphData(paragraph)
+        font_size = int(para_data.font_size or default_font_size)
+        font = inventory._load_font(
+            self.get_font_path(para_data.font_name or "Arial"), font_size
+        )
+        all_wrapped_lines = []
+        for line in paragraph.text.split("\n"):
+            all_wrapped_lines.extend(
+                _wrap_text_line_measuring(line, usable_width_px, draw, font)
+            )
+        if all_wrapped_lines:
+            if para_data.line_spacing:
+                line_height_px = para_data.line_spacing * 96 / 72
+            else:
+                line_height_px = font_size * 96 / 72
+            if para_idx > 0 and para_data.space_before:
+                total_height_px += para_data.space_before * 96 / 72
+            total_height_px += len(all_wrapped_lines) * line_height_px
+            if para_data.space_after:
+                total_height_px += para_data.space_after * 96 / 72
+
+    if total_height_px > usable_height_px:
+        overflow_inches = round((total_height_px - usable_height_px) / 96.0, 2)
+        if overflow_inches > 0.05:
+            self.frame_overflow_bottom = overflow_inches
+
+
+def _wrap_text_line_measuring(line, max_width_px, draw, font):
+    """Word wrapping that re-measures the growing line after every word."""
+    if not line:
+        return [""]
+    if draw.textlength(line, font=font) <= max_width_px:
+        return [line]
+    wrapped = []
+    current_line = ""
+    for word in line.split(" "):
+        test_line = current_line + (" " if current_line else "") + word
+        if draw.textlength(test_line, font=font) <= max_width_px:
+            current_line = test_line
+        else:
+            if current_line:
+                wrapped.append(current_line)
+            current_line = word
+    if current_line:
+        wrapped.append(current_line)
+    return wrapped
+
+
+def _write_deck(path, slides):
+    """Write a deck with four text boxes of five paragraphs on every slide."""
+    presentation = Presentation()
+    layout = presentation.slide_layouts[6]  # Blank
+    for slide_number in range(slides):
+        slide = presentation.slides.add_slide(layout)
+        for box in range(4):
+            shape = slide.shapes.add_textbox(
+                Inches(0.5 + 4.5 * (box % 2)),
+                Inches(0.5 + 3.5 * (box // 2)),
+                Inches(4),
+                Inches(3),
+            )
+            text_frame = shape.text_frame
+            text_frame.word_wrap = True
+            for index in range(5):
+                paragraph = (
+                    text_frame.paragraphs[0]
+                    if index == 0
+                    else text_frame.add_paragraph()
+                )
+                run = paragraph.add_run()
+                run.text = (
+                    f"Slide {slide_number} box {box} paragraph {index}: "
+                    "quarterly results and the outlook for next year"
+                )
+                run.font.name = FONT_NAMES[(box + index) % len(FONT_NAMES)]
+                run.font.size = Pt(14 + 2 * (index % 3))
+    presentation.save(path)
+
+
+def _get_font_path_scan(font_name):
+    """The font lookup inventory.py used before, kept for comparison."""
+    font_variations = [
+        font_name,
+        font_name.lower(),
+        font_name.replace(" ", ""),
+        font_name.replace(" ", "-"),
+    ]
+    if platform.system() == "Darwin":
+        font_dirs = ["/System/Library/Fonts/", "/Library/Fonts/", "~/Library/Fonts/"]
+        extensions = [".ttf", ".otf", ".ttc", ".dfont"]
+    else:
+        font_dirs = [
+            "/usr/share/fonts/truetype/",
+            "/usr/local/share/fonts/",
+            "~/.fonts/",
+        ]
+        extensions = [".ttf", ".otf"]
+
+    for font_dir in font_dirs:
+        font_dir_path = Path(font_dir).expanduser()
+        if not font_dir_path.exists():
+            continue
+        for variant in font_variations:
+            for ext in extensions:
+                font_path = font_dir_path / f"{variant}{ext}"
+                if font_path.exists():
+                    return str(font_path)
+        try:
+            for file_path in font_dir_path.iterdir():
+                if file_path.is_file():
+                    file_name_lower = file_path.name.lower()
+                    font_name_lower = font_name.lower().replace(" ", "")
+                    if font_name_lower in file_name_lower and any(
+                        file_name_lower.endswith(ext) for ext in extensions
+                    ):
+                        return str(file_path)
+        except (OSError, PermissionError):
+            continue
+    return None
+
+
+def _load_font_uncached(font_path, size):
+    """Font loading as inventory.py did it before, once per paragraph."""
+    if font_path:
+        try:
+            return ImageFont.truetype(font_path, size=size)
+        except Exception:
+            pass
+    return ImageFont.load_default()
+
+
+if __name__ == "__main__":
+    main()
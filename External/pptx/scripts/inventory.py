@@ -13,6 +13,8 @@ This module provides functionality to:
 Classes:
     ParagraphData: Represents a text paragraph with formatting
     ShapeData: Represents a shape with position and text content
+    FontIndex: Installed font files, looked up by family name
+    TextMeasurer: Cached text widths and line wrapping for one font and size
 
 Main Functions:
     extract_text_inventory: Extract all text from a presentation
@@ -24,13 +26,16 @@ Usage:
 
 import argparse
 import json
+import os
 import platform
+import re
 import sys
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple, Union
 
-from PIL import Image, ImageDraw, ImageFont
+from PIL import ImageFont
 from pptx import Presentation
 from pptx.enum.text import PP_ALIGN
 from pptx.shapes.base import BaseShape
@@ -46,6 +51,15 @@ InventoryData = Dict[
 ]  # Dict of slide_id -> {shape_id -> ShapeData}
 InventoryDict = Dict[str, Dict[str, ShapeDict]]  # JSON-serializable inventory
 
+# Loaded fonts kept by _load_font, one per (font file, size)
+FONT_CACHE_SIZE = 128
+
+# Style words that end font file names (Arial-BoldItalic, DejaVuSans_Bold, ...)
+_FONT_STYLE_SUFFIX = re.compile(
+    r"(regular|book|roman|medium|bold|italic|oblique|light|thin|black|"
+    r"heavy|semibold|demibold|extrabold)+$"
+)
+
 
 def main():
     """Main entry point for command-line usage."""
@@ -280,67 +294,15 @@ class ShapeData:
     def get_font_path(font_name: str) -> Optional[str]:
         """Get the font file path for a given font name.
 
+        Looked up in the installed fonts index, which is built on first use.
+
         Args:
             font_name: Name of the font (e.g., 'Arial', 'Calibri')
 
         Returns:
             Path to the font file, or None if not found
         """
-        system = platform.system()
-
-        # Common font file variations to try
-        font_variations = [
-            font_name,
-            font_name.lower(),
-            font_name.replace(" ", ""),
-            font_name.replace(" ", "-"),
-        ]
-
-        # Define font directories and extensions by platform
-        if system == "Darwin":  # macOS
-            font_dirs = [
-                "/System/Library/Fonts/",
-                "/Library/Fonts/",
-                "~/Library/Fonts/",
-            ]
-            extensions = [".ttf", ".otf", ".ttc", ".dfont"]
-        else:  # Linux
-            font_dirs = [
-                "/usr/share/fonts/truetype/",
-                "/usr/local/share/fonts/",
-                "~/.fonts/",
-            ]
-            extensions = [".ttf", ".otf"]
-
-        # Try to find the font file
-        from pathlib import Path
-
-        for font_dir in font_dirs:
-            font_dir_path = Path(font_dir).expanduser()
-            if not font_dir_path.exists():
-                continue
-
-            # First try exact matches
-            for variant in font_variations:
-                for ext in extensions:
-                    font_path = font_dir_path / f"{variant}{ext}"
-                    if font_path.exists():
-                        return str(font_path)
-
-            # Then try fuzzy matching - find files containing the font name
-            try:
-                for file_path in font_dir_path.iterdir():
-                    if file_path.is_file():
-                        file_name_lower = file_path.name.lower()
-                        font_name_lower = font_name.lower().replace(" ", "")
-                        if font_name_lower in file_name_lower and any(
-                            file_name_lower.endswith(ext) for ext in extensions
-                        ):
-                            return str(file_path)
-            except (OSError, PermissionError):
-                continue
-
-        return None
+        return FontIndex.installed().find(font_name)
 
     @staticmethod
     def get_slide_dimensions(slide: Any) -> tuple[Optional[int], Optional[int]]:
@@ -531,34 +493,6 @@ class ShapeData:
             self.inches_to_pixels(usable_height),
         )
 
-    def _wrap_text_line(self, line: str, max_width_px: int, draw, font) -> List[str]:
-        """Wrap a single line of text to fit within max_width_px."""
-        if not line:
-            return [""]
-
-        # Use textlength for efficient width calculation
-        if draw.textlength(line, font=font) <= max_width_px:
-            return [line]
-
-        # Need to wrap - split into words
-        wrapped = []
-        words = line.split(" ")
-        current_line = ""
-
-        for word in words:
-            test_line = current_line + (" " if current_line else "") + word
-            if draw.textlength(test_line, font=font) <= max_width_px:
-                current_line = test_line
-            else:
-                if current_line:
-                    wrapped.append(current_line)
-                current_line = word
-
-        if current_line:
-            wrapped.append(current_line)
-
-        return wrapped
-
     def _estimate_frame_overflow(self) -> None:
         """Estimate if text overflows the shape bounds using PIL text measurement."""
         if not self.shape or not hasattr(self.shape, "text_frame"):
@@ -573,10 +507,6 @@ class ShapeData:
         if usable_width_px <= 0 or usable_height_px <= 0:
             return
 
-        # Set up PIL for text measurement
-        dummy_img = Image.new("RGB", (1, 1))
-        draw = ImageDraw.Draw(dummy_img)
-
         # Get default font size from placeholder or use conservative estimate
         default_font_size = self._get_default_font_size()
 
@@ -589,27 +519,18 @@ class ShapeData:
 
             para_data = ParagraphData(paragraph)
 
-            # Load font for this paragraph
+            # Measure with this paragraph's font
             font_name = para_data.font_name or "Arial"
             font_size = int(para_data.font_size or default_font_size)
-
-            font = None
-            font_path = self.get_font_path(font_name)
-            if font_path:
-                try:
-                    font = ImageFont.truetype(font_path, size=font_size)
-                except Exception:
-                    font = ImageFont.load_default()
-            else:
-                font = ImageFont.load_default()
+            measurer = _text_measurer(self.get_font_path(font_name), font_size)
 
             # Wrap all lines in this paragraph
-            all_wrapped_lines = []
-            for line in paragraph.text.split("\n"):
-                wrapped = self._wrap_text_line(line, usable_width_px, draw, font)
-                all_wrapped_lines.extend(wrapped)
+            line_count = sum(
+                measurer.count_lines(line, usable_width_px)
+                for line in paragraph.text.split("\n")
+            )
 
-            if all_wrapped_lines:
+            if line_count:
                 # Calculate line height
                 if para_data.line_spacing:
                     # Custom line spacing explicitly set
@@ -623,7 +544,7 @@ class ShapeData:
                     total_height_px += para_data.space_before * 96 / 72
 
                 # Add paragraph text height
-                total_height_px += len(all_wrapped_lines) * line_height_px
+                total_height_px += line_count * line_height_px
 
                 # Add space_after
                 if para_data.space_after:
@@ -911,6 +832,171 @@ def detect_overlaps(shapes: List[ShapeData]) -> None:
                 shape2.overlapping_shapes[shape1.shape_id] = overlap_area
 
 
+class FontIndex:
+    """Font files in the system font directories, keyed by family name.
+
+    The directories are scanned recursively once; lookups never touch the
+    file system. Family names are normalized like fontconfig's: case,
+    spaces, hyphens and underscores are ignored, and so are style words at
+    the end of a file name, so "Liberation Sans" finds
+    LiberationSans-Regular.ttf. Earlier directories take precedence.
+    """
+
+    _installed = None
+
+    def __init__(self, font_dirs: List[str], extensions: List[str]):
+        # Per directory: file stem -> path, family key -> path, [(name, path)]
+        self._dirs = []
+        self._found: Dict[str, Optional[str]] = {}
+        for font_dir in font_dirs:
+            stems, families, files = {}, {}, []
+            for root, dirs, names in os.walk(Path(font_dir).expanduser()):
+                dirs.sort()
+                for name in sorted(names):
+                    stem, ext = os.path.splitext(name)
+                    if ext.lower() not in extensions:
+                        continue
+                    path = os.path.join(root, name)
+                    stems.setdefault(stem, path)
+                    files.append((name.lower(), path))
+                    key = _normalize_font_name(stem)
+                    family = _FONT_STYLE_SUFFIX.sub("", key) or key
+                    # Prefer the plain style (Regular) for a family
+                    if (
+                        family not in families
+                        or key == family
+                        or key.endswith("regular")
+                    ):
+                        families[family] = path
+            self._dirs.append((stems, families, files))
+
+    @classmethod
+    def installed(cls) -> "FontIndex":
+        """Return the index of this platform's font directories, built once."""
+        if cls._installed is None:
+            if platform.system() == "Darwin":  # macOS
+                cls._installed = cls(
+                    ["/System/Library/Fonts/", "/Library/Fonts/", "~/Library/Fonts/"],
+                    [".ttf", ".otf", ".ttc", ".dfont"],
+                )
+            else:  # Linux
+                cls._installed = cls(
+                    [
+                        "/usr/share/fonts/",
+                        "/usr/local/share/fonts/",
+                        "~/.local/share/fonts/",
+                        "~/.fonts/",
+                    ],
+                    [".ttf", ".otf"],
+                )
+        return cls._installed
+
+    def find(self, font_name: str) -> Optional[str]:
+        """Return the path of the font file for font_name, or None if not found.
+
+        A file named exactly after the font (e.g. Arial.ttf, arial.ttf) wins,
+        then one of the same family, then any whose name contains the font
+        name.
+        """
+        if font_name not in self._found:
+            self._found[font_name] = self._find(font_name)
+        return self._found[font_name]
+
+    def _find(self, font_name: str) -> Optional[str]:
+        variations = [
+            font_name,
+            font_name.lower(),
+            font_name.replace(" ", ""),
+            font_name.replace(" ", "-"),
+        ]
+        key = _normalize_font_name(font_name)
+        contained = font_name.lower().replace(" ", "")
+        for stems, families, files in self._dirs:
+            for variant in variations:
+                if variant in stems:
+                    return stems[variant]
+            if key in families:
+                return families[key]
+            for name, path in files:
+                if contained in name:
+                    return path
+        return None
+
+
+class TextMeasurer:
+    """Text widths and word wrapping for one font at one size.
+
+    The width of every word and of a space is measured once and kept, so
+    wrapping a line adds up cached widths instead of measuring the growing
+    line again after every word. Kerning between a word and the following
+    space is ignored; it is negligible at these sizes.
+    """
+
+    def __init__(self, font):
+        self.font = font
+        self._widths: Dict[str, float] = {}
+        self._space = font.getlength(" ")
+
+    def width(self, word: str) -> float:
+        """Return the advance width of word in pixels."""
+        if word not in self._widths:
+            self._widths[word] = self.font.getlength(word)
+        return self._widths[word]
+
+    def count_lines(self, line: str, max_width_px: float) -> int:
+        """Return how many lines line wraps to within max_width_px.
+
+        Words are placed greedily, breaking only at spaces; a word wider
+        than the line gets a line of its own.
+        """
+        if not line:
+            return 1
+
+        words = line.split(" ")
+        widths = [self.width(word) for word in words]
+        if sum(widths) + self._space * (len(words) - 1) <= max_width_px:
+            return 1
+
+        lines = 0
+        current_width = 0.0
+        current_empty = True
+        for word, width in zip(words, widths):
+            test_width = current_width + (0 if current_empty else self._space) + width
+            if test_width <= max_width_px:
+                current_width = test_width
+                current_empty = current_empty and not word
+            else:
+                if not current_empty:
+                    lines += 1
+                current_width = width
+                current_empty = not word
+        if not current_empty:
+            lines += 1
+        return lines
+
+
+@lru_cache(maxsize=FONT_CACHE_SIZE)
+def _text_measurer(font_path: Optional[str], size: int) -> TextMeasurer:
+    """Return the shared TextMeasurer for a font file and size."""
+    return TextMeasurer(_load_font(font_path, size))
+
+
+def _normalize_font_name(name: str) -> str:
+    """Reduce a font or font file name to lowercase letters and digits."""
+    return re.sub(r"[\s_-]+", "", name.lower())
+
+
+@lru_cache(maxsize=FONT_CACHE_SIZE)
+def _load_font(font_path: Optional[str], size: int):
+    """Load a font at a size, or PIL's default font if that fails."""
+    if font_path:
+        try:
+            return ImageFont.truetype(font_path, size=size)
+        except Exception:
+            pass
+    return ImageFont.load_default()
+
+
 def extract_text_inventory(
     pptx_path: Path, prs: Optional[Any] = None, issues_only: bool = False
 ) -> InventoryData:
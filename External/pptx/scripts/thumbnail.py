@@ -50,6 +50,10 @@ from inventory import extract_text_inventory
 from PIL import Image, ImageDraw, ImageFont
 from pptx import Presentation
 
+# Shared LibreOffice service lives with the OOXML scripts of this skill
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "ooxml" / "scripts"))
+from office_service import OfficeServiceError, convert_document  # noqa: E402
+
 # Constants
 THUMBNAIL_WIDTH = 300  # Fixed thumbnail width in pixels
 CONVERSION_DPI = 100  # DPI for PDF to image conversion
@@ -212,25 +216,12 @@ def convert_to_images(pptx_path, temp_dir, dpi):
     if hidden_slides:
         print(f"Hidden slides: {sorted(hidden_slides)}")
 
-    pdf_path = temp_dir / f"{pptx_path.stem}.pdf"
-
-    # Convert to PDF
+    # Convert to PDF (on the shared LibreOffice instance when available)
     print("Converting to PDF...")
-    result = subprocess.run(
-        [
-            "soffice",
-            "--headless",
-            "--convert-to",
-            "pdf",
-            "--outdir",
-            str(temp_dir),
-            str(pptx_path),
-        ],
-        capture_output=True,
-        text=True,
-    )
-    if result.returncode != 0 or not pdf_path.exists():
-        raise RuntimeError("PDF conversion failed")
+    try:
+        pdf_path = convert_document(pptx_path, temp_dir, "pdf")
+    except (OfficeServiceError, FileNotFoundError, TimeoutError) as e:
+        raise RuntimeError("PDF conversion failed") from e
 
     # Convert PDF to images
     print(f"Converting to images at {dpi} DPI...")
@@ -12,6 +12,26 @@ import platform
 from pathlib import Path
 from openpyxl import load_workbook
 
+# The shared LibreOffice service lives with the OOXML scripts, which this
+# skill does not carry; use the copy of a docx or pptx skill installed next
+# to it, or fall back to a one-shot soffice per recalculation
+for skill in ('docx', 'pptx'):
+    scripts_dir = Path(__file__).resolve().parent.parent / skill / 'ooxml' / 'scripts'
+    if (scripts_dir / 'office_service.py').is_file():
+        sys.path.insert(0, str(scripts_dir))
+        break
+try:
+    from office_service import OfficeServiceError, recalculate, service_available
+except ImportError:
+    class OfficeServiceError(Exception):
+        pass
+
+    def service_available():
+        return False
+
+    def recalculate(path, timeout=None):
+        raise OfficeServiceError('LibreOffice service not available')
+
 
 def setup_libreoffice_macro():
     """Setup LibreOffice macro for recalculation if not already configured"""
@@ -50,22 +70,8 @@ def setup_libreoffice_macro():
         return False
 
 
-def recalc(filename, timeout=30):
-    """
-    Recalculate formulas in Excel file and report any errors
-    
-    Args:
-        filename: Path to Excel file
-        timeout: Maximum time to wait for recalculation (seconds)
-    
-    Returns:
-        dict with error locations and counts
-    """
-    if not Path(filename).exists():
-        return {'error': f'File {filename} does not exist'}
-    
-    abs_path = str(Path(filename).absolute())
-    
+def recalc_with_macro(abs_path, timeout):
+    """Recalculate with a one-shot soffice process; return an error dict or None"""
     if not setup_libreoffice_macro():
         return {'error': 'Failed to setup LibreOffice macro'}
     
@@ -98,6 +104,39 @@ def recalc(filename, timeout=30):
         else:
             return {'error': error_msg}
     
+    return None
+
+
+def recalc(filename, timeout=30):
+    """
+    Recalculate formulas in Excel file and report any errors
+    
+    Args:
+        filename: Path to Excel file
+        timeout: Maximum time to wait for recalculation (seconds)
+    
+    Returns:
+        dict with error locations and counts
+    """
+    if not Path(filename).exists():
+        return {'error': f'File {filename} does not exist'}
+    
+    abs_path = str(Path(filename).absolute())
+    
+    # Recalculate on the shared LibreOffice instance when its Python bindings
+    # are available, otherwise with a one-shot soffice running a Basic macro
+    if service_available():
+        try:
+            recalculate(abs_path, timeout)
+        except TimeoutError:
+            pass  # As with the macro timeout: check what was saved
+        except OfficeServiceError as e:
+            return {'error': str(e)}
+    else:
+        error = recalc_with_macro(abs_path, timeout)
+        if error:
+            return error
+    
     # Check for Excel errors in the recalculated file - scan ALL cells
     try:
         wb = load_workbook(filename, data_only=True)